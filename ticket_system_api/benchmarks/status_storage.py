@@ -0,0 +1,85 @@
+"""
+Compares size of tickets table and its indexes with status and priority
+stored as text and as small integer codes.
+
+Runs on plain sqlite3, without Django, e.g.
+
+    python benchmarks/status_storage.py --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+
+STATUSES = ['OPEN', 'IN_PROGRESS', 'CLOSED']
+PRIORITIES = ['LOW', 'MODERATE', 'URGENT']
+SCHEMAS = {
+    'text': ('varchar(20)', 'varchar(255)', lambda status, priority: (
+        STATUSES[status], PRIORITIES[priority])),
+    'code': ('smallint unsigned', 'smallint unsigned',
+             lambda status, priority: (status + 1, priority + 1)),
+}
+
+
+def build(path, variant, rows, seed):
+    """Creates tickets table of given variant, returns sizes of its objects."""
+
+    status_type, priority_type, encode = SCHEMAS[variant]
+    connection = sqlite3.connect(path)
+    connection.execute(
+        'CREATE TABLE core_ticket ('
+        'id integer PRIMARY KEY AUTOINCREMENT, '
+        f'status {status_type} NOT NULL, '
+        f'priority {priority_type} NOT NULL, '
+        'title varchar(255) NOT NULL)'
+    )
+    connection.execute(
+        'CREATE INDEX ticket_status_idx ON core_ticket (status, id)')
+    connection.execute(
+        'CREATE INDEX ticket_priority_idx ON core_ticket (priority, id)')
+
+    generator = random.Random(seed)
+    connection.executemany(
+        'INSERT INTO core_ticket (status, priority, title) VALUES (?, ?, ?)',
+        (
+            (*encode(generator.randrange(3), generator.randrange(3)),
+             f'Ticket {number}')
+            for number in range(rows)
+        ),
+    )
+    connection.commit()
+    connection.execute('VACUUM')
+
+    sizes = dict(connection.execute(
+        'SELECT name, SUM(pgsize) FROM dbstat GROUP BY name'))
+    connection.close()
+
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for variant in SCHEMAS:
+            results[variant] = build(
+                os.path.join(directory, f'{variant}.sqlite3'), variant,
+                options.rows, options.seed)
+
+    names = ['core_ticket', 'ticket_status_idx', 'ticket_priority_idx']
+    print(f'{options.rows} tickets')
+    print(f'{"object":<22}{"text MiB":>12}{"code MiB":>12}{"saved":>9}')
+    for name in names:
+        text, code = results['text'][name], results['code'][name]
+        print(f'{name:<22}{text / 2 ** 20:>12.1f}{code / 2 ** 20:>12.1f}'
+              f'{1 - code / text:>9.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,9 +2,16 @@
 Customization of admin page.
 """
 
+from django.conf import settings
 from django.contrib import admin
 from core import models
+from core.counting import estimate_count
+from core.signals import tickets_bulk_changed
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 # Register your models here.
 
@@ -45,6 +52,81 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ['is_active', 'is_staff', 'is_superuser']
 
 
+class EstimatedCountPaginator(Paginator):
+    """Paginator using estimated count for unfiltered changelists of big
+    tables, filtered ones are counted exactly."""
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where:
+            estimate = estimate_count(self.object_list)
+            if (estimate or 0) > settings.ADMIN_EXACT_COUNT_LIMIT:
+                return estimate
+
+        return super().count
+
+
+def set_status(modeladmin, request, queryset, status):
+    """Changes status of selected tickets with single UPDATE."""
+
+    queryset = queryset.exclude(status=status)
+    previous = list(queryset.values_list('id', 'status'))
+    ticket_ids = [ticket_id for ticket_id, _ in previous]
+    now = timezone.now()
+    updated = queryset.update(
+        status=status, updated_at=now, last_activity_at=now)
+    models.Activity.objects.bulk_create([
+        models.Activity.changed(
+            ticket_id, 'STATUS_CHANGED', previous_status, status, now)
+        for ticket_id, previous_status in previous
+    ], batch_size=1000)
+    transaction.on_commit(lambda: tickets_bulk_changed.send(
+        sender=models.Ticket, ticket_ids=ticket_ids))
+    modeladmin.message_user(
+        request, _('%(count)d tickets changed.') % {'count': updated})
+
+
+@admin.action(description=_('Mark selected tickets as open'))
+def mark_open(modeladmin, request, queryset):
+    set_status(modeladmin, request, queryset, 'OPEN')
+
+
+@admin.action(description=_('Mark selected tickets as in progress'))
+def mark_in_progress(modeladmin, request, queryset):
+    set_status(modeladmin, request, queryset, 'IN_PROGRESS')
+
+
+@admin.action(description=_('Mark selected tickets as closed'))
+def mark_closed(modeladmin, request, queryset):
+    set_status(modeladmin, request, queryset, 'CLOSED')
+
+
+class TicketAdmin(admin.ModelAdmin):
+    """Defines admin page for tickets."""
+    ordering = ['-id']
+    list_display = ['id', 'title', 'status', 'priority',
+                    'created_by', 'assigned_to', 'created_at']
+    list_select_related = ['created_by', 'assigned_to']
+    list_filter = ['status', 'priority']
+    search_fields = ['=id']
+    raw_id_fields = ['created_by', 'assigned_to']
+    actions = [mark_open, mark_in_progress, mark_closed]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class CommentAdmin(admin.ModelAdmin):
+    """Defines admin page for comments."""
+    ordering = ['-id']
+    list_display = ['id', '__str__', 'author', 'created_date']
+    list_select_related = ['author']
+    search_fields = ['=ticket__id']
+    raw_id_fields = ['author', 'ticket']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
 admin.site.register(models.User, UserAdmin)
-admin.site.register(models.Ticket)
-admin.site.register(models.Comment)
+admin.site.register(models.Ticket, TicketAdmin)
+admin.site.register(models.Comment, CommentAdmin)
@@ -0,0 +1,50 @@
+"""
+Estimating number of rows without scanning whole tables.
+"""
+
+import json
+
+from django.db import connections
+from django.db.models import Max, Min
+
+
+def estimate_count(queryset):
+    """Estimates number of rows of queryset, returns None when impossible.
+
+    PostgreSQL estimates come from planner statistics. Elsewhere only
+    unfiltered querysets are estimated from range of primary keys, which
+    overestimates when rows were deleted."""
+
+    queryset = queryset.order_by()
+    query = queryset.query
+    if query.combinator:
+        return None
+
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            if not query.where:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+                if row and row[0] > 0:
+                    return row[0]
+            else:
+                sql, params = query.sql_with_params()
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]['Plan']['Plan Rows'])
+
+    if query.where:
+        return None
+
+    bounds = queryset.model._default_manager.using(queryset.db).aggregate(
+        first=Min('pk'), last=Max('pk'))
+    if bounds['last'] is None:
+        return 0
+
+    return bounds['last'] - bounds['first'] + 1
@@ -2,15 +2,39 @@
 Custom permisions for views and objects.
 """
 
+from django.db.models import BooleanField, Case, Q, Value, When
 from rest_framework import permissions
 
 
 class IsOwnerOrAdminOrReadOnly(permissions.BasePermission):
+    owner_fields = ('author', 'created_by')
+
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        return ((getattr(obj, 'author', None) == request.user) or (getattr(obj, 'created_by', None) == request.user)) or (request.user.is_superuser)
+        user_id = request.user.id
+        is_owner = user_id is not None and any(
+            getattr(obj, f'{field}_id', None) == user_id
+            for field in self.owner_fields
+        )
+
+        return is_owner or request.user.is_superuser
+
+    @staticmethod
+    def get_can_edit_expression(user, owner_field):
+        """Builds SQL expression checking if user may edit objects."""
+
+        if not user.is_authenticated:
+            return Value(False)
+        if user.is_superuser:
+            return Value(True)
+
+        return Case(
+            When(Q(**{f'{owner_field}_id': user.id}), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
 
 
 class IsAdminOrForbidden(permissions.BasePermission):
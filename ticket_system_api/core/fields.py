@@ -0,0 +1,63 @@
+"""
+Custom model fields.
+"""
+
+from django.core import exceptions
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class CodedChoiceField(models.PositiveSmallIntegerField):
+    """Choice field stored in database as small integer code.
+
+    Python code, queries and serializers keep using string values from
+    choices, `codes` maps every value to integer stored in column. Rows are
+    sorted by codes, so they should follow natural order of values."""
+
+    description = 'Choice stored as small integer code'
+
+    def __init__(self, *args, codes=None, **kwargs):
+        self.codes = dict(codes or {})
+        self.values = {code: value for value, code in self.codes.items()}
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        # Range validators of integer fields don't apply to string values.
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self.values[value]
+
+    def to_python(self, value):
+        if value is None or value in self.codes:
+            return value
+        if value in self.values:
+            return self.values[value]
+        raise exceptions.ValidationError(
+            self.error_messages['invalid_choice'],
+            code='invalid_choice',
+            params={'value': value},
+        )
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None:
+            return value
+        try:
+            return self.codes[value]
+        except (KeyError, TypeError) as error:
+            raise ValueError(
+                f"Field '{self.name}' expected one of {list(self.codes)} "
+                f"but got {value!r}."
+            ) from error
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
@@ -0,0 +1,106 @@
+"""
+Command moving old closed tickets into archive tables.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import (
+    Ticket,
+    Comment,
+    ArchivedTicket,
+    ArchivedComment,
+    ArchiveStats,
+)
+
+
+class Command(BaseCommand):
+    """Archives closed tickets together with their comments.
+
+    Every batch is moved in its own transaction, so interrupted run can be
+    resumed by running command again."""
+
+    help = 'Moves CLOSED tickets not updated for given number of days to archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, required=True, metavar='DAYS',
+            help='Archive tickets closed more than DAYS days ago.')
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of tickets moved in single transaction.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than'])
+        archived = 0
+
+        while True:
+            moved = self.archive_batch(cutoff, options['batch_size'])
+            if not moved:
+                break
+            archived += moved
+            self.stdout.write(f'Archived {archived} tickets...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Finished, {archived} tickets archived.'))
+
+    @transaction.atomic
+    def archive_batch(self, cutoff, batch_size):
+        """Moves single batch of tickets, returns number of moved tickets."""
+
+        tickets = list(
+            Ticket.objects.filter(status='CLOSED', updated_at__lt=cutoff)
+            .order_by('id')[:batch_size]
+        )
+        if not tickets:
+            return 0
+
+        ticket_ids = [ticket.id for ticket in tickets]
+        comments = Comment.objects.filter(ticket_id__in=ticket_ids)
+
+        ArchivedTicket.objects.bulk_create([
+            ArchivedTicket(
+                id=ticket.id,
+                created_by_id=ticket.created_by_id,
+                assigned_to_id=ticket.assigned_to_id,
+                status=ticket.status,
+                title=ticket.title,
+                description=ticket.description,
+                created_at=ticket.created_at,
+                updated_at=ticket.updated_at,
+                priority=ticket.priority,
+                comment_count=ticket.comment_count,
+                last_activity_at=ticket.last_activity_at,
+                due_at=ticket.due_at,
+                is_overdue=ticket.is_overdue,
+            ) for ticket in tickets
+        ])
+        ArchivedComment.objects.bulk_create([
+            ArchivedComment(
+                id=comment.id,
+                author_id=comment.author_id,
+                ticket_id=comment.ticket_id,
+                created_date=comment.created_date,
+                updated_date=comment.updated_date,
+                text=comment.text,
+            ) for comment in comments.iterator()
+        ])
+
+        closing_seconds = sum(
+            (ticket.updated_at - ticket.created_at).total_seconds()
+            for ticket in tickets
+        )
+        ArchiveStats.objects.get_or_create(pk=1)
+        ArchiveStats.objects.filter(pk=1).update(
+            tickets_closed=F('tickets_closed') + len(tickets),
+            total_closing_seconds=F('total_closing_seconds') + closing_seconds,
+        )
+
+        comments.delete()
+        Ticket.objects.filter(id__in=ticket_ids).delete()
+
+        return len(tickets)
@@ -0,0 +1,19 @@
+"""
+Command generating OpenAPI schema files for current code version.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.schema import get_code_version, write_schema_files
+
+
+class Command(BaseCommand):
+    """Writes schema files served by schema endpoint, run after deploy."""
+
+    help = 'Generates versioned OpenAPI schema files.'
+
+    def handle(self, *args, **options):
+        for path in write_schema_files():
+            self.stdout.write(f'Written {path}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Schema generated for code version {get_code_version()}.'))
@@ -0,0 +1,298 @@
+"""
+Command importing tickets and comments from CSV or JSONL file.
+"""
+
+import csv
+import json
+import os
+from datetime import timezone as dt_timezone
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import User, Ticket, Comment, Activity, ImportCheckpoint
+from core.signals import tickets_bulk_changed
+
+STATUSES = {value for value, _ in Ticket.STATUS_CHOICES}
+PRIORITIES = {value for value, _ in Ticket.PRIORITY_CHOICES}
+
+
+class RecordError(Exception):
+    """Raised when imported record is invalid."""
+
+
+def read_records(path, file_format):
+    """Yields records from file one by one."""
+
+    with open(path, newline='', encoding='utf-8') as source:
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+        else:
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def parse_timestamp(value, field):
+    if not value:
+        return None
+    timestamp = parse_datetime(value)
+    if timestamp is None:
+        raise RecordError(f'{field}: invalid date "{value}".')
+    if timezone.is_naive(timestamp):
+        timestamp = timezone.make_aware(timestamp, dt_timezone.utc)
+
+    return timestamp
+
+
+def parse_id(value, field):
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RecordError(f'{field}: invalid id "{value}".')
+
+
+class Command(BaseCommand):
+    """Imports tickets and comments in chunked bulk inserts.
+
+    Every record is a ticket or comment, chosen by `type` column. Tickets
+    reference users by `created_by` and `assigned_to` emails, comments
+    reference tickets by `ticket` id and authors by `author` email. Progress
+    is saved to checkpoint row in the transaction of each batch, so records
+    without id are never inserted twice when import is resumed."""
+
+    help = 'Imports tickets and comments from CSV or JSONL file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSONL file to import.')
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'],
+            help='File format, guessed from extension by default.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of records inserted in single transaction.')
+        parser.add_argument(
+            '--checkpoint',
+            help='Name of stored progress, defaults to absolute PATH.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or (
+            'csv' if path.lower().endswith('.csv') else 'jsonl')
+        checkpoint = options['checkpoint'] or os.path.abspath(path)
+        max_length = ImportCheckpoint._meta.get_field('source').max_length
+        if len(checkpoint) > max_length:
+            raise CommandError(
+                f'Checkpoint name is longer than {max_length} characters, '
+                'choose shorter one with --checkpoint.')
+        self.users = {}
+        self.imported = {'ticket': 0, 'comment': 0}
+        self.skipped = 0
+
+        done = ImportCheckpoint.objects.filter(
+            source=checkpoint).values_list('records', flat=True).first() or 0
+        records = enumerate(read_records(path, file_format), start=1)
+        records = islice(records, done, None)
+        if done:
+            self.stdout.write(f'Resuming after record {done}.')
+
+        while True:
+            batch = list(islice(records, options['batch_size']))
+            if not batch:
+                break
+            done = batch[-1][0]
+            self.import_batch(batch, checkpoint, done)
+            self.stdout.write(f'Processed {done} records...')
+
+        ImportCheckpoint.objects.filter(source=checkpoint).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {self.imported["ticket"]} tickets and '
+            f'{self.imported["comment"]} comments, skipped {self.skipped} '
+            'records.'))
+
+    def load_users(self, records):
+        """Looks up users of batch with one query, caching every email."""
+
+        emails = {
+            record.get(field)
+            for _, record in records
+            for field in ('created_by', 'assigned_to', 'author')
+            if record.get(field)
+        } - self.users.keys()
+        if not emails:
+            return
+        found = dict(User.objects.filter(
+            email__in=emails).values_list('email', 'id'))
+        for email in emails:
+            self.users[email] = found.get(email)
+
+    def get_user_id(self, record, field, required=True):
+        email = record.get(field)
+        if not email:
+            if required:
+                raise RecordError(f'{field}: field is required.')
+            return None
+        user_id = self.users.get(email)
+        if user_id is None:
+            raise RecordError(f'{field}: unknown user "{email}".')
+
+        return user_id
+
+    def build_ticket(self, record):
+        for field in ('title', 'description'):
+            if not record.get(field):
+                raise RecordError(f'{field}: field is required.')
+        status = record.get('status') or 'OPEN'
+        priority = record.get('priority') or 'LOW'
+        if status not in STATUSES:
+            raise RecordError(f'status: invalid choice "{status}".')
+        if priority not in PRIORITIES:
+            raise RecordError(f'priority: invalid choice "{priority}".')
+        created_at = parse_timestamp(
+            record.get('created_at'), 'created_at') or timezone.now()
+        updated_at = parse_timestamp(
+            record.get('updated_at'), 'updated_at') or created_at
+
+        ticket = Ticket(
+            id=parse_id(record.get('id'), 'id'),
+            created_by_id=self.get_user_id(record, 'created_by'),
+            assigned_to_id=self.get_user_id(record, 'assigned_to'),
+            status=status,
+            priority=priority,
+            title=record['title'][:255],
+            description=record['description'],
+            created_at=created_at,
+            updated_at=updated_at,
+            last_activity_at=updated_at,
+        )
+        ticket.due_at = ticket.get_due_at()
+
+        return ticket
+
+    def build_comment(self, record):
+        if not record.get('text'):
+            raise RecordError('text: field is required.')
+        ticket_id = parse_id(record.get('ticket'), 'ticket')
+        if ticket_id is None:
+            raise RecordError('ticket: field is required.')
+
+        return Comment(
+            id=parse_id(record.get('id'), 'id'),
+            ticket_id=ticket_id,
+            author_id=self.get_user_id(record, 'author', required=False),
+            text=record['text'],
+            created_date=parse_timestamp(
+                record.get('created_date'), 'created_date') or timezone.now(),
+        )
+
+    def report(self, number, error):
+        self.skipped += 1
+        self.stderr.write(f'Record {number}: {error}')
+
+    def import_batch(self, batch, checkpoint, done):
+        """Validates batch of records and inserts valid ones, saving number
+        of processed records to checkpoint in the same transaction."""
+
+        self.load_users(batch)
+        tickets, comments = [], []
+        for number, record in batch:
+            record_type = record.get('type') or 'ticket'
+            try:
+                if record_type == 'ticket':
+                    tickets.append((number, self.build_ticket(record)))
+                elif record_type == 'comment':
+                    comments.append((number, self.build_comment(record)))
+                else:
+                    raise RecordError(f'type: invalid choice "{record_type}".')
+            except RecordError as error:
+                self.report(number, error)
+
+        with transaction.atomic():
+            tickets = self.skip_existing(Ticket, tickets)
+            comments = self.skip_existing(Comment, comments)
+            new_ticket_ids = {ticket.id for _, ticket in tickets}
+            known_ticket_ids = new_ticket_ids | set(
+                Ticket.objects.filter(
+                    id__in={comment.ticket_id for _, comment in comments}
+                ).values_list('id', flat=True))
+            valid_comments = []
+            for number, comment in comments:
+                if comment.ticket_id in known_ticket_ids:
+                    valid_comments.append(comment)
+                else:
+                    self.report(
+                        number, f'ticket: unknown ticket "{comment.ticket_id}".')
+
+            # bulk_create overwrites auto_now fields, imported values are
+            # restored with single update afterwards.
+            timestamps = [(ticket.created_at, ticket.updated_at)
+                          for _, ticket in tickets]
+            created_tickets = Ticket.objects.bulk_create(
+                [ticket for _, ticket in tickets])
+            for ticket, (created_at, updated_at) in zip(
+                    created_tickets, timestamps):
+                ticket.created_at, ticket.updated_at = created_at, updated_at
+            if created_tickets:
+                Ticket.objects.bulk_update(
+                    created_tickets, ['created_at', 'updated_at'])
+            Comment.objects.bulk_create(valid_comments)
+            Activity.objects.bulk_create(
+                [Activity.created(ticket) for ticket in created_tickets]
+                + [Activity.commented(comment) for comment in valid_comments])
+
+            changed_ids = {ticket.id for ticket in created_tickets} | {
+                comment.ticket_id for comment in valid_comments}
+            self.update_activity({
+                comment.ticket_id for comment in valid_comments})
+            transaction.on_commit(lambda: tickets_bulk_changed.send(
+                sender=Ticket, ticket_ids=changed_ids))
+            ImportCheckpoint.objects.update_or_create(
+                source=checkpoint, defaults={'records': done})
+
+        self.imported['ticket'] += len(created_tickets)
+        self.imported['comment'] += len(valid_comments)
+
+    def skip_existing(self, model, objects):
+        """Drops and reports objects whose id exists already (e.g. imported
+        by interrupted run) or repeats within batch."""
+
+        name = model._meta.model_name
+        existing = set(model.objects.filter(
+            id__in=[obj.id for _, obj in objects if obj.id is not None]
+        ).values_list('id', flat=True))
+        kept = []
+        for number, obj in objects:
+            if obj.id is None:
+                kept.append((number, obj))
+            elif obj.id in existing:
+                self.report(number, f'id: {name} "{obj.id}" already exists.')
+            else:
+                existing.add(obj.id)
+                kept.append((number, obj))
+
+        return kept
+
+    def update_activity(self, ticket_ids):
+        """Recalculates denormalized comment fields of given tickets."""
+
+        if not ticket_ids:
+            return
+        comments = Comment.objects.filter(
+            ticket=OuterRef('pk')).order_by().values('ticket')
+        Ticket.objects.filter(id__in=ticket_ids).update(
+            comment_count=Coalesce(Subquery(
+                comments.annotate(total=Count('id')).values('total')), 0),
+            last_activity_at=Greatest(
+                F('last_activity_at'),
+                Coalesce(Subquery(
+                    comments.annotate(last=Max('created_date')).values('last')),
+                    F('last_activity_at')),
+            ),
+        )
@@ -0,0 +1,48 @@
+"""
+Command sending queued notifications as digest emails.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.notifications import send_digests
+
+
+class Command(BaseCommand):
+    """Drains notification queue, coalescing events of each user into one
+    email. Only one worker should run at a time."""
+
+    help = 'Sends digest emails with queued ticket notifications.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running and check the queue every interval.')
+        parser.add_argument(
+            '--interval', type=float, default=30, metavar='SECONDS',
+            help='Pause between queue checks when running in loop.')
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Maximum number of users receiving digest in single run.')
+
+    def handle(self, *args, **options):
+        while True:
+            sent = self.send_all(options['batch_size'])
+            if sent:
+                self.stdout.write(f'Sent {sent} digest emails.')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Finished.'))
+
+    def send_all(self, batch_size):
+        """Sends batches until no user has due notifications."""
+
+        sent = 0
+        while True:
+            batch_sent = send_digests(batch_size=batch_size)
+            if not batch_sent:
+                return sent
+            sent += batch_sent
@@ -0,0 +1,57 @@
+"""
+Command flagging tickets which passed their SLA deadline.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Ticket
+from core.signals import tickets_bulk_changed
+
+
+class Command(BaseCommand):
+    """Flags newly overdue tickets in batches.
+
+    Only not closed tickets past due date and not flagged yet are read, using
+    partial index of open tickets by due date, so command is meant to be run
+    periodically, e.g. from cron."""
+
+    help = 'Flags open tickets whose SLA deadline has passed as overdue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of tickets flagged in single transaction.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        flagged = 0
+
+        while True:
+            swept = self.sweep_batch(now, options['batch_size'])
+            if not swept:
+                break
+            flagged += swept
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Finished, {flagged} tickets flagged as overdue.'))
+
+    @transaction.atomic
+    def sweep_batch(self, now, batch_size):
+        """Flags single batch of tickets, returns number of flagged tickets."""
+
+        ticket_ids = list(
+            Ticket.objects.filter(due_at__lt=now, is_overdue=False)
+            .exclude(status='CLOSED')
+            .order_by('due_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ticket_ids:
+            return 0
+
+        Ticket.objects.filter(id__in=ticket_ids).update(is_overdue=True)
+        transaction.on_commit(lambda: tickets_bulk_changed.send(
+            sender=Ticket, ticket_ids=ticket_ids))
+
+        return len(ticket_ids)
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.6 on 2026-10-19 17:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_alter_comment_ticket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tickets_closed', models.PositiveBigIntegerField(default=0)),
+                ('total_closing_seconds', models.FloatField(default=0)),
+            ],
+        ),
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'ordering': ['-created_date']},
+        ),
+        migrations.CreateModel(
+            name='ArchivedTicket',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('IN_PROGRESS', 'In Progress'), ('CLOSED', 'Closed')], default='CLOSED', max_length=20)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('priority', models.CharField(choices=[('LOW', 'Low'), ('MODERATE', 'Moderate'), ('URGENT', 'Urgent')], default='LOW', max_length=255)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('assigned_to', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_date', models.DateTimeField()),
+                ('updated_date', models.DateTimeField()),
+                ('text', models.TextField()),
+                ('author', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='core.archivedticket')),
+            ],
+            options={
+                'ordering': ['-created_date'],
+            },
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.6 on 2026-10-19 17:29
+
+from django.db import migrations, models
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+import django.utils.timezone
+
+
+def backfill_activity(apps, schema_editor):
+    """Fills comment counters and last activity of existing tickets."""
+
+    for ticket_model, comment_model in (('Ticket', 'Comment'),
+                                        ('ArchivedTicket', 'ArchivedComment')):
+        Ticket = apps.get_model('core', ticket_model)
+        Comment = apps.get_model('core', comment_model)
+        comments = Comment.objects.filter(
+            ticket=OuterRef('pk')).order_by().values('ticket')
+        Ticket.objects.update(
+            comment_count=Coalesce(Subquery(
+                comments.annotate(total=Count('id')).values('total')), 0),
+            last_activity_at=Greatest(
+                F('updated_at'),
+                Coalesce(Subquery(
+                    comments.annotate(last=Max('created_date')).values('last')),
+                    F('updated_at')),
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_archivedticket_archivedcomment_archivestats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedticket',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['comment_count'], name='ticket_comment_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['last_activity_at'], name='ticket_last_activity_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.6 on 2026-10-19 17:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_ticket_comment_count_last_activity_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['name'], name='user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['surname'], name='user_surname_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.6 on 2026-10-19 18:09
+
+from itertools import islice
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def bulk_create_in_batches(model, objects, batch_size=1000):
+    objects = iter(objects)
+    while batch := list(islice(objects, batch_size)):
+        model.objects.bulk_create(batch)
+
+
+def backfill_activity(apps, schema_editor):
+    """Creates history entries for existing tickets and comments."""
+
+    Ticket = apps.get_model('core', 'Ticket')
+    Comment = apps.get_model('core', 'Comment')
+    Activity = apps.get_model('core', 'Activity')
+
+    tickets = Ticket.objects.order_by('id').values_list(
+        'id', 'status', 'assigned_to_id', 'created_at')
+    bulk_create_in_batches(Activity, (
+        Activity(ticket_id=ticket_id, kind='CREATED',
+                 data={'status': status, 'assigned_to': assigned_to_id},
+                 created_at=created_at)
+        for ticket_id, status, assigned_to_id, created_at
+        in tickets.iterator()
+    ))
+
+    comments = Comment.objects.order_by('id').values_list(
+        'id', 'ticket_id', 'author_id', 'created_date')
+    bulk_create_in_batches(Activity, (
+        Activity(ticket_id=ticket_id, kind='COMMENTED',
+                 data={'comment': comment_id, 'author': author_id},
+                 created_at=created_date)
+        for comment_id, ticket_id, author_id, created_date
+        in comments.iterator()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_notification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Activity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('CREATED', 'Created'), ('COMMENTED', 'Commented'), ('STATUS_CHANGED', 'Status changed'), ('REASSIGNED', 'Reassigned')], max_length=20)),
+                ('data', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ticket', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='activities', to='core.ticket')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ticket', 'created_at', 'id'], name='activity_ticket_idx'), models.Index(fields=['created_at', 'id'], name='activity_created_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-19 18:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='snapshot',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+    ]
@@ -0,0 +1,146 @@
+# Generated by Django 4.2.6 on 2026-10-19 18:20
+
+import core.fields
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+PRIORITY_CODES = {'LOW': 1, 'MODERATE': 2, 'URGENT': 3}
+STATUS_CODES = {'OPEN': 1, 'IN_PROGRESS': 2, 'CLOSED': 3}
+PRIORITY_CHOICES = [
+    ('LOW', 'Low'), ('MODERATE', 'Moderate'), ('URGENT', 'Urgent')]
+STATUS_CHOICES = [
+    ('OPEN', 'Open'), ('IN_PROGRESS', 'In Progress'), ('CLOSED', 'Closed')]
+MODELS = ('Ticket', 'ArchivedTicket')
+
+
+def encode(apps, schema_editor):
+    for model_name in MODELS:
+        apps.get_model('core', model_name).objects.update(**{
+            f'{field}_code': Case(*[
+                When(**{field: value}, then=Value(code))
+                for value, code in codes.items()
+            ])
+            for field, codes in (('status', STATUS_CODES),
+                                 ('priority', PRIORITY_CODES))
+        })
+
+
+def decode(apps, schema_editor):
+    for model_name in MODELS:
+        apps.get_model('core', model_name).objects.update(**{
+            field: Case(*[
+                When(**{f'{field}_code': code}, then=Value(value))
+                for value, code in codes.items()
+            ])
+            for field, codes in (('status', STATUS_CODES),
+                                 ('priority', PRIORITY_CODES))
+        })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_ticket_snapshot'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='ticket_status_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='ticket_priority_idx',
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='priority_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='priority_code',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(encode, decode),
+        migrations.RemoveField(
+            model_name='ticket',
+            name='status',
+        ),
+        migrations.RemoveField(
+            model_name='ticket',
+            name='priority',
+        ),
+        migrations.RemoveField(
+            model_name='archivedticket',
+            name='status',
+        ),
+        migrations.RemoveField(
+            model_name='archivedticket',
+            name='priority',
+        ),
+        migrations.RenameField(
+            model_name='ticket',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.RenameField(
+            model_name='ticket',
+            old_name='priority_code',
+            new_name='priority',
+        ),
+        migrations.RenameField(
+            model_name='archivedticket',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.RenameField(
+            model_name='archivedticket',
+            old_name='priority_code',
+            new_name='priority',
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='status',
+            field=core.fields.CodedChoiceField(
+                choices=STATUS_CHOICES, codes=STATUS_CODES, default='OPEN'),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='priority',
+            field=core.fields.CodedChoiceField(
+                choices=PRIORITY_CHOICES, codes=PRIORITY_CODES, default='LOW'),
+        ),
+        migrations.AlterField(
+            model_name='archivedticket',
+            name='status',
+            field=core.fields.CodedChoiceField(
+                choices=STATUS_CHOICES, codes=STATUS_CODES, default='CLOSED'),
+        ),
+        migrations.AlterField(
+            model_name='archivedticket',
+            name='priority',
+            field=core.fields.CodedChoiceField(
+                choices=PRIORITY_CHOICES, codes=PRIORITY_CODES, default='LOW'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(
+                fields=['status', 'id'], name='ticket_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(
+                fields=['priority', 'id'], name='ticket_priority_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.6 on 2026-10-19 18:22
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_due_at(apps, schema_editor):
+    Ticket = apps.get_model('core', 'Ticket')
+    tickets = []
+    for ticket in Ticket.objects.only('id', 'priority', 'created_at').iterator():
+        hours = settings.TICKET_SLA_HOURS.get(ticket.priority)
+        if hours is None:
+            continue
+        ticket.due_at = ticket.created_at + timedelta(hours=hours)
+        tickets.append(ticket)
+        if len(tickets) == 1000:
+            Ticket.objects.bulk_update(tickets, ['due_at'])
+            tickets = []
+    Ticket.objects.bulk_update(tickets, ['due_at'])
+    clear_snapshots(apps, schema_editor)
+
+
+def clear_snapshots(apps, schema_editor):
+    # Stored snapshots don't match fields of the list anymore, missing ones
+    # are rendered again when listed.
+    apps.get_model('core', 'Ticket').objects.update(snapshot='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_coded_status_priority'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedticket',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedticket',
+            name='is_overdue',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='due_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='is_overdue',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('status', 'CLOSED'), _negated=True), fields=['due_at'], name='ticket_open_due_at_idx'),
+        ),
+        migrations.RunPython(backfill_due_at, clear_snapshots),
+    ]
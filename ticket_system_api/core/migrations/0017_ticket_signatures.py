@@ -0,0 +1,35 @@
+# Generated by Django 4.2.6 on 2026-10-19 18:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_ticket_sla'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketSignature',
+            fields=[
+                ('ticket', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='core.ticket')),
+                ('signature', models.BinaryField()),
+                ('checksum', models.BigIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TicketSignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('checksum', models.BigIntegerField()),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.ticket')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='signature_band_bucket_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.6 on 2026-10-19 19:08
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def backfill_workloads(apps, schema_editor):
+    User = apps.get_model('core', 'User')
+    StaffWorkload = apps.get_model('core', 'StaffWorkload')
+    weight = Case(
+        *[When(tickets__priority=priority, then=Value(value))
+          for priority, value in settings.TICKET_AUTO_ASSIGN_WEIGHTS.items()],
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+    rows = (
+        User.objects.filter(is_staff=True, is_active=True)
+        .annotate(load=Coalesce(
+            Sum(weight, filter=~Q(tickets__status='CLOSED')), 0))
+        .values_list('id', 'load')
+    )
+    StaffWorkload.objects.bulk_create(
+        [StaffWorkload(user_id=user_id, load=load) for user_id, load in rows],
+        batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_ticket_signatures'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffWorkload',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='workload', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('load', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['load', 'user'], name='staff_workload_load_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_workloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.6 on 2026-10-19 19:13
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_staff_workload'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_surname_idx',
+        ),
+    ]
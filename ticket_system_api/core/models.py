@@ -2,11 +2,16 @@
 Database models.
 """
 
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
 from django.contrib.auth.models import BaseUserManager, AbstractBaseUser, PermissionsMixin
 
+from core.fields import CodedChoiceField
+
 
 class UserManager(BaseUserManager):
     """Manager for users."""
@@ -58,17 +63,116 @@ class Ticket(models.Model):
         ('CLOSED', 'Closed'),
     ]
 
+    # Integer codes stored in database, must never be changed or reused.
+    PRIORITY_CODES = {'LOW': 1, 'MODERATE': 2, 'URGENT': 3}
+    STATUS_CODES = {'OPEN': 1, 'IN_PROGRESS': 2, 'CLOSED': 3}
+
+    # Fields changed outside of save, written by it only when they were
+    # changed on saved instance.
+    BACKGROUND_FIELDS = {'comment_count', 'is_overdue', 'snapshot'}
+
     created_by = models.ForeignKey('User', on_delete=models.PROTECT)
     assigned_to = models.ForeignKey(
         'User', on_delete=models.PROTECT, related_name='tickets')
-    status = models.CharField(
-        max_length=20, choices=STATUS_CHOICES, default='OPEN')
+    status = CodedChoiceField(
+        choices=STATUS_CHOICES, codes=STATUS_CODES, default='OPEN')
     title = models.CharField(max_length=255)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    priority = models.CharField(
-        max_length=255, choices=PRIORITY_CHOICES, default='LOW')
+    priority = CodedChoiceField(
+        choices=PRIORITY_CHOICES, codes=PRIORITY_CODES, default='LOW')
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(
+        default=timezone.now, editable=False)
+    # SLA deadline derived from priority, flagged by sla_sweep command once
+    # it passes.
+    due_at = models.DateTimeField(null=True, blank=True, editable=False)
+    is_overdue = models.BooleanField(default=False, editable=False)
+    # Ticket rendered by TicketSerializer, kept up to date by signals.
+    snapshot = models.TextField(blank=True, default='', editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['comment_count'],
+                         name='ticket_comment_count_idx'),
+            models.Index(fields=['last_activity_at'],
+                         name='ticket_last_activity_idx'),
+            models.Index(fields=['status', 'id'], name='ticket_status_idx'),
+            models.Index(fields=['priority', 'id'],
+                         name='ticket_priority_idx'),
+            models.Index(fields=['created_at'], name='ticket_created_at_idx'),
+            models.Index(fields=['updated_at'], name='ticket_updated_at_idx'),
+            models.Index(fields=['due_at'], name='ticket_open_due_at_idx',
+                         condition=~models.Q(status='CLOSED')),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def get_changed_fields(self):
+        """Returns names of fields changed since ticket was loaded."""
+
+        loaded_values = getattr(self, '_loaded_values', None)
+        if loaded_values is None:
+            return [field.name for field in self._meta.concrete_fields]
+
+        return [
+            field.name for field in self._meta.concrete_fields
+            if field.attname in loaded_values
+            and loaded_values[field.attname] != getattr(self, field.attname)
+        ]
+
+    def get_loaded_value(self, attname):
+        """Returns value field had when ticket was loaded."""
+
+        return getattr(self, '_loaded_values', {}).get(attname)
+
+    def get_due_at(self):
+        """Gets SLA deadline counted from creation for current priority."""
+
+        hours = settings.TICKET_SLA_HOURS.get(self.priority)
+        if hours is None:
+            return None
+
+        return (self.created_at or timezone.now()) + timedelta(hours=hours)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            if self.due_at is None:
+                self.due_at = self.get_due_at()
+        else:
+            self.last_activity_at = timezone.now()
+            update_fields = kwargs.get('update_fields')
+            sla_fields = set()
+            if ('priority' in self.get_changed_fields()
+                    and (update_fields is None or 'priority' in update_fields)):
+                self.due_at = self.get_due_at()
+                self.is_overdue = False
+                sla_fields = {'due_at', 'is_overdue'}
+            if update_fields is None:
+                # comment_count is maintained by comment signals with F()
+                # expressions, is_overdue by sla_sweep command and snapshot
+                # is rendered after save, so unless they were changed on
+                # this instance, in-memory values may be stale.
+                changed_fields = set(self.get_changed_fields())
+                kwargs['update_fields'] = {
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and (
+                        field.name not in self.BACKGROUND_FIELDS
+                        or field.name in changed_fields)
+                } | sla_fields
+            else:
+                kwargs['update_fields'] = {
+                    *update_fields, 'last_activity_at', *sla_fields}
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+        }
 
     def __str__(self) -> str:
         return self.title
@@ -84,6 +188,214 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['-created_date']
+        indexes = [
+            models.Index(fields=['ticket', 'created_date'],
+                         name='comment_ticket_created_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.ticket_id}_{self.text[:20]}'
+
+
+class Notification(models.Model):
+    """Ticket event queued for sending to user in digest email."""
+
+    KIND_CHOICES = [
+        ('ASSIGNED', 'Assigned'),
+        ('COMMENTED', 'Commented'),
+    ]
+
+    user = models.ForeignKey(
+        'User', on_delete=models.CASCADE, related_name='notifications')
+    ticket = models.ForeignKey(
+        'Ticket', on_delete=models.CASCADE, related_name='+')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at'],
+                         condition=models.Q(sent_at__isnull=True),
+                         name='notification_pending_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user_id}_{self.kind}_{self.ticket_id}'
+
+
+class Activity(models.Model):
+    """Append-only entry of ticket history.
+
+    Entries aren't removed together with ticket, so history outlives
+    archiving. Comment entries keep only comment id, their text is read from
+    the comment when serialized, so edited and deleted text isn't kept."""
+
+    KIND_CHOICES = [
+        ('CREATED', 'Created'),
+        ('COMMENTED', 'Commented'),
+        ('STATUS_CHANGED', 'Status changed'),
+        ('REASSIGNED', 'Reassigned'),
+    ]
+
+    ticket = models.ForeignKey(
+        'Ticket', on_delete=models.DO_NOTHING, db_constraint=False,
+        related_name='activities')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['ticket', 'created_at', 'id'],
+                         name='activity_ticket_idx'),
+            models.Index(fields=['created_at', 'id'],
+                         name='activity_created_idx'),
+        ]
+
+    @classmethod
+    def created(cls, ticket):
+        return cls(ticket_id=ticket.id, kind='CREATED',
+                   data={'status': ticket.status,
+                         'assigned_to': ticket.assigned_to_id},
+                   created_at=ticket.created_at)
+
+    @classmethod
+    def commented(cls, comment):
+        return cls(ticket_id=comment.ticket_id, kind='COMMENTED',
+                   data={'comment': comment.id, 'author': comment.author_id},
+                   created_at=comment.created_date)
+
+    @classmethod
+    def changed(cls, ticket_id, kind, previous, current, created_at=None):
+        return cls(ticket_id=ticket_id, kind=kind,
+                   data={'from': previous, 'to': current},
+                   created_at=created_at or timezone.now())
+
+    def __str__(self) -> str:
+        return f'{self.ticket_id}_{self.kind}'
+
+
+class TicketSignature(models.Model):
+    """MinHash signature of ticket title and description."""
+
+    ticket = models.OneToOneField(
+        'Ticket', on_delete=models.CASCADE, primary_key=True,
+        related_name='signature')
+    signature = models.BinaryField()
+    checksum = models.BigIntegerField()
+
+
+class TicketSignatureBand(models.Model):
+    """Locality-sensitive hash of one band of ticket signature.
+
+    Tickets sharing bucket in any band are candidates for being similar.
+    Checksum of whole signature tells whether cached signature is current."""
+
+    ticket = models.ForeignKey(
+        'Ticket', on_delete=models.CASCADE, related_name='+')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+    checksum = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['band', 'bucket'],
+                         name='signature_band_bucket_idx'),
+        ]
+
+
+class StaffWorkload(models.Model):
+    """Weighted number of open tickets assigned to active staff member.
+
+    Updated in transactions changing tickets and locked while tickets are
+    assigned automatically, so assignments from different processes see
+    each other."""
+
+    user = models.OneToOneField(
+        'User', on_delete=models.CASCADE, primary_key=True,
+        related_name='workload')
+    load = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['load', 'user'],
+                         name='staff_workload_load_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user_id}_{self.load}'
+
+
+class ArchivedTicket(models.Model):
+    """Closed ticket moved out of primary tickets table."""
+
+    id = models.BigIntegerField(primary_key=True)
+    created_by = models.ForeignKey(
+        'User', on_delete=models.PROTECT, related_name='+')
+    assigned_to = models.ForeignKey(
+        'User', on_delete=models.PROTECT, related_name='+')
+    status = CodedChoiceField(
+        choices=Ticket.STATUS_CHOICES, codes=Ticket.STATUS_CODES,
+        default='CLOSED')
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    priority = CodedChoiceField(
+        choices=Ticket.PRIORITY_CHOICES, codes=Ticket.PRIORITY_CODES,
+        default='LOW')
+    comment_count = models.PositiveIntegerField(default=0)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+    due_at = models.DateTimeField(null=True, blank=True)
+    is_overdue = models.BooleanField(default=False)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class ArchivedComment(models.Model):
+    """Comment of archived ticket."""
+
+    id = models.BigIntegerField(primary_key=True)
+    author = models.ForeignKey(
+        'User', on_delete=models.SET_NULL, null=True, related_name='+')
+    ticket = models.ForeignKey(
+        'ArchivedTicket', related_name='comments', on_delete=models.CASCADE)
+    created_date = models.DateTimeField()
+    updated_date = models.DateTimeField()
+    text = models.TextField()
+
+    class Meta:
+        ordering = ['-created_date']
+
+    def __str__(self) -> str:
+        return f'{self.ticket_id}_{self.text[:20]}'
+
+
+class ArchiveStats(models.Model):
+    """Counters of archived tickets, kept so metrics don't scan archive."""
+
+    tickets_closed = models.PositiveBigIntegerField(default=0)
+    total_closing_seconds = models.FloatField(default=0)
+
+    @classmethod
+    def current(cls):
+        """Returns counters row, or empty counters if nothing was archived."""
+
+        return cls.objects.filter(pk=1).first() or cls(pk=1)
+
+
+class ImportCheckpoint(models.Model):
+    """Number of records of import source processed by import_tickets.
+
+    Written in the same transaction as imported batch, so resumed import
+    never inserts records of committed batch again."""
+
+    source = models.CharField(max_length=255, unique=True)
+    records = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
-        return f'{self.ticket.id}_{self.text[:20]}'
+        return f'{self.source}_{self.records}'
@@ -0,0 +1,101 @@
+"""
+Database queue of ticket notifications sent to users as digest emails.
+"""
+
+from collections import Counter
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Min
+from django.utils import timezone
+
+from core.models import Notification
+
+MESSAGES = {
+    'ASSIGNED': 'You were assigned to ticket #{id}: {title}',
+    'COMMENTED': 'New comments on ticket #{id}: {title} ({count})',
+}
+
+
+def notify_assignee(ticket):
+    """Queues notification about assignment, unless user assigned themselves."""
+
+    if ticket.assigned_to_id != ticket.created_by_id:
+        Notification.objects.create(
+            user_id=ticket.assigned_to_id, ticket=ticket, kind='ASSIGNED')
+
+
+def notify_comment(comment):
+    """Queues notification for assignee about comment written by someone else."""
+
+    assigned_to_id = comment.ticket.assigned_to_id
+    if assigned_to_id != comment.author_id:
+        Notification.objects.create(
+            user_id=assigned_to_id, ticket_id=comment.ticket_id,
+            kind='COMMENTED')
+
+
+def build_digest(user, notifications):
+    """Builds single email coalescing all pending notifications of user."""
+
+    counts = Counter(
+        (notification.ticket_id, notification.kind)
+        for notification in notifications)
+    tickets = {
+        notification.ticket_id: notification.ticket
+        for notification in notifications}
+    lines = [
+        MESSAGES[kind].format(
+            id=ticket_id, title=tickets[ticket_id].title, count=count)
+        for (ticket_id, kind), count in counts.items()
+    ]
+
+    return EmailMessage(
+        subject=f'Ticket system: {len(lines)} ticket update(s)',
+        body='\n'.join(lines),
+        to=[user.email],
+    )
+
+
+def send_digests(now=None, batch_size=None):
+    """Sends digests to users whose oldest pending notification is older
+    than digest window. Returns number of sent emails.
+
+    Notifications are marked as sent only after emails were handed over to
+    email backend, so failed run is repeated by the next one."""
+
+    now = now or timezone.now()
+    window = timedelta(seconds=settings.NOTIFICATION_DIGEST_WINDOW)
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    pending = Notification.objects.filter(sent_at__isnull=True)
+
+    user_ids = list(
+        pending.values('user_id')
+        .annotate(oldest=Min('created_at'))
+        .filter(oldest__lte=now - window)
+        .order_by('oldest')
+        .values_list('user_id', flat=True)[:batch_size]
+    )
+    if not user_ids:
+        return 0
+
+    notifications = list(
+        pending.filter(user_id__in=user_ids, created_at__lte=now)
+        .select_related('user', 'ticket')
+        .order_by('user_id', 'created_at')
+    )
+    messages = [
+        build_digest(user_notifications[0].user, user_notifications)
+        for user_notifications in (
+            list(group) for _, group in groupby(
+                notifications, key=lambda notification: notification.user_id)
+        )
+    ]
+    get_connection().send_messages(messages)
+    Notification.objects.filter(
+        id__in=[notification.id for notification in notifications]
+    ).update(sent_at=now)
+
+    return len(messages)
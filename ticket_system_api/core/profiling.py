@@ -0,0 +1,235 @@
+"""
+On-demand and sampled profiling of single requests.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import random
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from asgiref.sync import (
+    async_to_sync,
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, JsonResponse
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+PROFILE_MODES = ('cprofile', 'sql')
+
+logger = logging.getLogger('ticket_system_api.profiling')
+logger.propagate = False
+# Single thread formats and writes sampled reports, keeping their order.
+report_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix='profiling')
+
+
+def get_profile_logger():
+    """Gets logger writing reports to size rotated file in profile dir."""
+
+    path = Path(settings.PROFILING_DIR) / 'profiles.log'
+    handler = logger.handlers[0] if logger.handlers else None
+    if handler is None or handler.baseFilename != str(path.resolve()):
+        if handler is not None:
+            logger.removeHandler(handler)
+            handler.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=settings.PROFILING_MAX_BYTES,
+            backupCount=settings.PROFILING_BACKUP_COUNT,
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+    return logger
+
+
+class QueryCollector:
+    """Execute wrapper recording SQL statements with their timings."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'params': repr(params),
+                'time_ms': round((time.perf_counter() - start) * 1000, 3),
+            })
+
+    def report(self):
+        statements = Counter(query['sql'] for query in self.queries)
+        duplicates = Counter(
+            (query['sql'], query['params']) for query in self.queries)
+
+        return {
+            'count': len(self.queries),
+            'time_ms': round(sum(query['time_ms'] for query in self.queries), 3),
+            'duplicates': [
+                {'sql': sql, 'params': params, 'count': count}
+                for (sql, params), count in duplicates.items() if count > 1
+            ],
+            'similar': [
+                {'sql': sql, 'count': count}
+                for sql, count in statements.items() if count > 1
+            ],
+            'queries': self.queries,
+        }
+
+
+def format_cprofile(profiler):
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats('cumulative').print_stats(settings.PROFILING_TOP)
+
+    return output.getvalue()
+
+
+def save_report(report_id, method, path, mode, report):
+    """Writes report to size rotated file under given id."""
+
+    if isinstance(report, cProfile.Profile):
+        report = format_cprofile(report)
+    elif not isinstance(report, str):
+        report = json.dumps(report, indent=2)
+    get_profile_logger().info(
+        '=== %s %s %s %s [%s]\n%s',
+        report_id,
+        time.strftime('%Y-%m-%dT%H:%M:%S'),
+        method,
+        path,
+        mode,
+        report,
+    )
+
+
+class RequestProfilingMiddleware:
+    """Profiles request with cProfile or SQL trace.
+
+    Staff users can add `_profile=cprofile|sql` query param to get report
+    instead of response, or also `_profile_save=1` to save report to profile
+    directory under id returned in X-Profile-Id header. The param is ignored
+    for other users. Fraction of other requests set by PROFILING_SAMPLE_RATE
+    is profiled too, their reports are formatted and saved by background
+    thread.
+
+    Under ASGI profiled requests are run in worker thread, so that profiler
+    and SQL trace see views running there, other requests (including async
+    views) are passed on as they are."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            self.get_sync_response = async_to_sync(get_response)
+        else:
+            self.get_sync_response = get_response
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        mode = self.get_mode(request)
+        if mode is not None:
+            return self.profile(request, mode)
+        if random.random() < settings.PROFILING_SAMPLE_RATE:
+            return self.sample(request)
+
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        mode = None
+        if request.GET.get('_profile') in PROFILE_MODES:
+            mode = await sync_to_async(self.get_mode)(request)
+        if mode is not None:
+            return await sync_to_async(self.profile)(request, mode)
+        if random.random() < settings.PROFILING_SAMPLE_RATE:
+            return await sync_to_async(self.sample)(request)
+
+        return await self.get_response(request)
+
+    def get_mode(self, request):
+        """Gets profiling mode requested by staff user, marking request."""
+
+        mode = request.GET.get('_profile')
+        if mode not in PROFILE_MODES or not self.is_staff(request):
+            return None
+        request.profiling = mode
+
+        return mode
+
+    def is_staff(self, request):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            try:
+                credentials = TokenAuthentication().authenticate(request)
+            except AuthenticationFailed:
+                return False
+            user = credentials[0] if credentials else None
+
+        return user is not None and user.is_staff
+
+    def profile(self, request, mode):
+        if mode == 'cprofile':
+            response, profiler = self.run_cprofile(request)
+            report = format_cprofile(profiler)
+        else:
+            response, report = self.run_sql_trace(request)
+
+        if request.GET.get('_profile_save') == '1':
+            report_id = uuid.uuid4().hex
+            save_report(report_id, request.method, request.get_full_path(),
+                        mode, report)
+            response['X-Profile-Id'] = report_id
+            return response
+
+        if mode == 'cprofile':
+            return HttpResponse(report, content_type='text/plain')
+        return JsonResponse(report)
+
+    def sample(self, request):
+        response, profiler = self.run_cprofile(request)
+        report_executor.submit(
+            save_report, uuid.uuid4().hex, request.method,
+            request.get_full_path(), 'cprofile', profiler)
+
+        return response
+
+    def run_cprofile(self, request):
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = self.get_sync_response(request)
+        finally:
+            profiler.disable()
+
+        return response, profiler
+
+    def run_sql_trace(self, request):
+        collector = QueryCollector()
+        with connection.execute_wrapper(collector):
+            response = self.get_sync_response(request)
+
+        return response, collector.report()
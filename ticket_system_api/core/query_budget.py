@@ -0,0 +1,168 @@
+"""
+Per-request budget of SQL time and number of queries.
+"""
+
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import OperationalError, connection
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger('ticket_system_api.query_budget')
+
+
+class QueryBudgetExceeded(APIException):
+    """Raised when queries of request took longer than allowed."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Request took too long, try again later.'
+    default_code = 'query_budget_exceeded'
+
+    def __init__(self, detail=None, code=None, wait=None):
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+class QueryBudget:
+    """Execute wrapper cancelling queries once request spent its SQL time.
+
+    On SQLite running statement is interrupted by progress handler, other
+    databases are checked before every statement."""
+
+    def __init__(self, time_ms, max_queries):
+        self.time_ms = time_ms
+        self.max_queries = max_queries
+        self.spent = 0.0
+        self.queries = 0
+
+    def remaining(self):
+        if self.time_ms is None:
+            return None
+        return self.time_ms / 1000 - self.spent
+
+    def exceeded(self):
+        # Budget is enforced once, so that error handling may still query.
+        self.time_ms = None
+        return QueryBudgetExceeded(wait=settings.QUERY_BUDGET_RETRY_AFTER)
+
+    def __call__(self, execute, sql, params, many, context):
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise self.exceeded()
+
+        self.queries += 1
+        start = time.perf_counter()
+        raw_connection = context['connection'].connection
+        use_handler = (remaining is not None
+                       and context['connection'].vendor == 'sqlite')
+        interrupted = False
+
+        def check_deadline():
+            nonlocal interrupted
+            interrupted = time.perf_counter() - start > remaining
+            return interrupted
+
+        if use_handler:
+            raw_connection.set_progress_handler(
+                check_deadline, settings.QUERY_BUDGET_PROGRESS_STEPS)
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as error:
+            if interrupted:
+                raise self.exceeded() from error
+            raise
+        finally:
+            if use_handler:
+                raw_connection.set_progress_handler(None, 0)
+            self.spent += time.perf_counter() - start
+
+
+class QueryBudgetMiddleware:
+    """Enforces SQL budget of every request.
+
+    Budget is taken from `query_time_budget_ms` and `query_count_budget`
+    attributes of view class, falling back to QUERY_TIME_BUDGET_MS and
+    QUERY_COUNT_BUDGET settings. Exceeding time budget cancels request with
+    503 response, exceeding number of queries is only logged.
+
+    Under ASGI connections belong to worker threads running sync views, so
+    budget is applied only around sync views, which are called from
+    `process_view` in that thread. Async views are left alone."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        budget = self.start_budget(request)
+        with connection.execute_wrapper(budget):
+            response = self.get_response(request)
+        self.check_query_count(request, budget)
+
+        return response
+
+    async def __acall__(self, request):
+        budget = self.start_budget(request)
+        response = await self.get_response(request)
+        self.check_query_count(request, budget)
+
+        return response
+
+    def start_budget(self, request):
+        budget = QueryBudget(
+            settings.QUERY_TIME_BUDGET_MS, settings.QUERY_COUNT_BUDGET)
+        request.query_budget = budget
+
+        return budget
+
+    def check_query_count(self, request, budget):
+        if (budget.max_queries is not None
+                and budget.queries > budget.max_queries):
+            logger.warning(
+                'Query count budget exceeded: %s %s ran %d queries, budget %d',
+                request.method, request.path, budget.queries,
+                budget.max_queries)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Viewsets keep their class in `cls`, other views in `view_class`.
+        view_class = getattr(
+            view_func, 'cls', getattr(view_func, 'view_class', None))
+        budget = request.query_budget
+        budget.time_ms = getattr(
+            view_class, 'query_time_budget_ms', budget.time_ms)
+        budget.max_queries = getattr(
+            view_class, 'query_count_budget', budget.max_queries)
+        if not self.is_async or iscoroutinefunction(view_func):
+            return None
+
+        # Called by Django in thread which would run the view.
+        with connection.execute_wrapper(budget):
+            try:
+                return view_func(request, *view_args, **view_kwargs)
+            except QueryBudgetExceeded as exception:
+                return self.process_exception(request, exception)
+
+    def process_exception(self, request, exception):
+        """Handles budget exceeded outside of REST framework views."""
+
+        if isinstance(exception, QueryBudgetExceeded):
+            response = JsonResponse(
+                {'detail': str(exception.detail)},
+                status=exception.status_code,
+            )
+            response['Retry-After'] = str(exception.wait)
+            return response
+
+        return None
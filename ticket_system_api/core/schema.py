@@ -0,0 +1,149 @@
+"""
+OpenAPI schema generated once per deployed code version.
+"""
+
+import gzip
+import hashlib
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import django
+import drf_spectacular
+import rest_framework
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SCHEMA_KWARGS, SpectacularAPIView
+
+SCHEMA_SOURCE_DIRS = ['core', 'ticket', 'user', 'ticket_system_api']
+
+
+@lru_cache(maxsize=None)
+def get_code_version():
+    """Hashes project sources and library versions the schema is built from."""
+
+    digest = hashlib.sha1()
+    for version in (django.get_version(), rest_framework.VERSION,
+                    drf_spectacular.__version__):
+        digest.update(version.encode())
+    for directory in SCHEMA_SOURCE_DIRS:
+        for path in sorted((Path(settings.BASE_DIR) / directory).rglob('*.py')):
+            if 'tests' in path.parts:
+                continue
+            digest.update(str(path.relative_to(settings.BASE_DIR)).encode())
+            digest.update(path.read_bytes())
+
+    return digest.hexdigest()[:16]
+
+
+def get_schema_path(renderer_format):
+    return (Path(settings.SCHEMA_CACHE_DIR)
+            / f'openapi-{get_code_version()}.{renderer_format}')
+
+
+def render_schema(renderer):
+    """Generates schema and renders it with given renderer."""
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+
+    return renderer.render(schema, renderer.media_type, {})
+
+
+def write_schema_files():
+    """Writes YAML and JSON schema of current code version to cache dir."""
+
+    paths = []
+    for renderer in (OpenApiYamlRenderer(), OpenApiJsonRenderer()):
+        path = get_schema_path(renderer.format)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(render_schema(renderer))
+        paths.append(path)
+
+    return paths
+
+
+class RenderedSchema:
+    """Schema content with its compressed version and their ETags.
+
+    Encodings differ in bytes, so each of them has its own strong ETag."""
+
+    def __init__(self, content):
+        self.content = content
+        self.gzipped = gzip.compress(content)
+        digest = hashlib.sha1(content).hexdigest()
+        self.etag = f'"{digest}"'
+        self.gzipped_etag = f'"{digest}-gzip"'
+
+
+class SchemaCache:
+    """Keeps rendered schemas in memory, loading them from versioned files.
+
+    Code version is computed once per process, so schemas are generated
+    again only after deploying new code."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+
+    def get(self, renderer):
+        schema = self._schemas.get(renderer.format)
+        if schema is None:
+            with self._lock:
+                schema = self._schemas.get(renderer.format)
+                if schema is None:
+                    schema = RenderedSchema(self._load(renderer))
+                    self._schemas[renderer.format] = schema
+
+        return schema
+
+    def _load(self, renderer):
+        path = get_schema_path(renderer.format)
+        if path.exists():
+            return path.read_bytes()
+
+        return render_schema(renderer)
+
+    def clear(self):
+        with self._lock:
+            self._schemas = {}
+
+
+schema_cache = SchemaCache()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """Serves schema from memory with ETag and gzip support.
+
+    Schema isn't generated on requests when files were prepared with
+    generate_schema command, otherwise it's generated on first request."""
+
+    @extend_schema(**SCHEMA_KWARGS)
+    def get(self, request, *args, **kwargs):
+        if any(request.GET.get(param) for param in ('version', 'lang')):
+            return super().get(request, *args, **kwargs)
+
+        renderer = request.accepted_renderer
+        schema = schema_cache.get(renderer)
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            content, etag = schema.gzipped, schema.gzipped_etag
+        else:
+            content, etag = schema.content, schema.etag
+
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f'{content_type}; charset={renderer.charset}'
+            response = HttpResponse(content, content_type=content_type)
+            if content is schema.gzipped:
+                response['Content-Encoding'] = 'gzip'
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Accept', 'Accept-Encoding'])
+
+        return response
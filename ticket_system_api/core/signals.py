@@ -0,0 +1,65 @@
+"""
+Custom signals and receivers keeping denormalized ticket fields and ticket
+history up to date.
+"""
+
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from core.models import Ticket, Comment, Activity
+
+# Sent with ticket_ids argument after tickets or their comments were changed
+# by bulk operations, which don't send model signals.
+tickets_bulk_changed = Signal()
+# Sent with users argument after users were created with bulk_create.
+users_bulk_created = Signal()
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+
+    Ticket.objects.filter(pk=instance.ticket_id).update(
+        comment_count=F('comment_count') + 1,
+        last_activity_at=Greatest(
+            F('last_activity_at'), Value(instance.created_date)),
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    Ticket.objects.filter(pk=instance.ticket_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1,
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_activity(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        Activity.created(instance).save()
+        return
+
+    changed_fields = instance.get_changed_fields()
+    activities = [
+        Activity.changed(
+            instance.id, kind,
+            instance.get_loaded_value(attname), getattr(instance, attname),
+            instance.updated_at)
+        for field, attname, kind in (
+            ('status', 'status', 'STATUS_CHANGED'),
+            ('assigned_to', 'assigned_to_id', 'REASSIGNED'),
+        )
+        if field in changed_fields
+    ]
+    Activity.objects.bulk_create(activities)
+
+
+@receiver(post_save, sender=Comment)
+def comment_activity(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Activity.commented(instance).save()
@@ -2,11 +2,14 @@
 Tests for admin page.
 """
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from rest_framework import status
 from core import models
+from core.admin import EstimatedCountPaginator
 
 
 def generate_admin_listing_url(model_name):
@@ -117,3 +120,57 @@ class AdminPageTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertContains(res, comment)
+
+    def test_ticket_list_queries_not_growing(self):
+        """Tests if users of listed tickets are loaded with tickets."""
+        create_ticket(self.superuser, self.user)
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(generate_admin_listing_url('Ticket'))
+        for _ in range(5):
+            create_ticket(self.user, self.superuser)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(generate_admin_listing_url('Ticket'))
+
+        self.assertEqual(len(single), len(many))
+
+    def test_comment_list_queries_not_growing(self):
+        """Tests if listing comments doesn't load ticket of every comment."""
+        ticket = create_ticket(self.superuser, self.user)
+        create_comment(ticket, self.user)
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(generate_admin_listing_url('Comment'))
+        for _ in range(5):
+            create_comment(create_ticket(self.superuser, self.user), self.user)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(generate_admin_listing_url('Comment'))
+
+        self.assertEqual(len(single), len(many))
+
+    def test_bulk_status_change(self):
+        """Tests if selected tickets are closed with single update."""
+        tickets = [create_ticket(self.superuser, self.user) for _ in range(3)]
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(generate_admin_listing_url('Ticket'), {
+                'action': 'mark_closed',
+                '_selected_action': [tickets[0].id, tickets[1].id],
+            })
+        updates = [query for query in queries
+                   if query['sql'].startswith('UPDATE "core_ticket"')]
+
+        self.assertEqual(res.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            list(models.Ticket.objects.order_by('id').values_list(
+                'status', flat=True)),
+            ['CLOSED', 'CLOSED', 'OPEN'])
+
+    @override_settings(ADMIN_EXACT_COUNT_LIMIT=2)
+    def test_estimated_count_for_big_tables(self):
+        """Tests if unfiltered tables above limit are not counted exactly."""
+        tickets = [create_ticket(self.superuser, self.user) for _ in range(4)]
+        tickets[1].delete()
+        queryset = models.Ticket.objects.order_by('id')
+
+        self.assertEqual(EstimatedCountPaginator(queryset, 10).count, 4)
+        self.assertEqual(EstimatedCountPaginator(
+            queryset.filter(status='OPEN'), 10).count, 3)
@@ -0,0 +1,93 @@
+"""
+Tests for archiving tickets.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from core.models import (
+    Ticket,
+    Comment,
+    ArchivedTicket,
+    ArchivedComment,
+    ArchiveStats,
+)
+
+
+def create_ticket(created_by, assigned_to, days_ago=0, **extra_fields):
+    payload = {
+        'status': 'CLOSED',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    ticket = Ticket.objects.create(
+        created_by=created_by, assigned_to=assigned_to, **payload)
+    timestamp = timezone.now() - timedelta(days=days_ago)
+    Ticket.objects.filter(id=ticket.id).update(
+        created_at=timestamp - timedelta(hours=1), updated_at=timestamp)
+
+    return ticket
+
+
+def archive(older_than=30, batch_size=500):
+    call_command('archive_tickets', older_than=older_than,
+                 batch_size=batch_size, stdout=StringIO())
+
+
+class ArchiveTicketsCommandTests(TestCase):
+    """Tests for archive_tickets command."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'pass123')
+        self.user2 = get_user_model().objects.create_user(
+            'user2@example.com', 'pass123')
+
+    def test_old_closed_tickets_archived(self):
+        """Tests if only old closed tickets are moved with their comments."""
+
+        old_ticket = create_ticket(self.user, self.user2, days_ago=60)
+        comment = Comment.objects.create(
+            author=self.user, ticket=old_ticket, text='Old comment')
+        recent_ticket = create_ticket(self.user, self.user2, days_ago=1)
+        open_ticket = create_ticket(
+            self.user, self.user2, days_ago=60, status='OPEN')
+
+        archive()
+
+        self.assertEqual(
+            list(Ticket.objects.order_by('id').values_list('id', flat=True)),
+            [recent_ticket.id, open_ticket.id])
+        archived_ticket = ArchivedTicket.objects.get(id=old_ticket.id)
+        self.assertEqual(archived_ticket.title, old_ticket.title)
+        self.assertTrue(ArchivedComment.objects.filter(
+            id=comment.id, ticket=archived_ticket).exists())
+        self.assertFalse(Comment.objects.exists())
+
+    def test_archiving_in_batches_updates_counters(self):
+        """Tests if all batches are moved and archive counters updated."""
+
+        for _ in range(5):
+            create_ticket(self.user, self.user2, days_ago=60)
+
+        archive(batch_size=2)
+
+        stats = ArchiveStats.current()
+        self.assertEqual(ArchivedTicket.objects.count(), 5)
+        self.assertEqual(stats.tickets_closed, 5)
+        self.assertAlmostEqual(stats.total_closing_seconds, 5 * 3600)
+
+    def test_archiving_is_resumable(self):
+        """Tests if running command again moves only remaining tickets."""
+
+        create_ticket(self.user, self.user2, days_ago=60)
+        archive()
+        create_ticket(self.user, self.user2, days_ago=60)
+        archive()
+
+        self.assertEqual(ArchivedTicket.objects.count(), 2)
+        self.assertEqual(ArchiveStats.current().tickets_closed, 2)
@@ -0,0 +1,87 @@
+"""
+Tests for custom model fields.
+"""
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from core.models import Ticket
+
+TICKET_URL = reverse('ticket:ticket-list')
+
+
+class CodedChoiceFieldTests(TestCase):
+    """Tests for choices stored as integer codes."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'pass123')
+        self.ticket = Ticket.objects.create(
+            created_by=self.user, assigned_to=self.user, title='Test title',
+            description='Test description', status='IN_PROGRESS',
+            priority='URGENT')
+
+    def test_stored_as_codes(self):
+        """Tests if string values are stored as integers."""
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT status, priority FROM core_ticket WHERE id = %s',
+                [self.ticket.id])
+            row = cursor.fetchone()
+
+        self.assertEqual(row, (2, 3))
+
+    def test_values_loaded_as_strings(self):
+        """Tests if codes are turned back into values in queries."""
+
+        ticket = Ticket.objects.get(status='IN_PROGRESS', priority__in=['URGENT'])
+
+        self.assertEqual((ticket.status, ticket.priority), ('IN_PROGRESS', 'URGENT'))
+        self.assertEqual(
+            list(Ticket.objects.values_list('status', flat=True)), ['IN_PROGRESS'])
+
+    def test_ordered_by_codes(self):
+        """Tests if ordering by priority follows its natural order."""
+
+        Ticket.objects.create(
+            created_by=self.user, assigned_to=self.user, title='Test title',
+            description='Test description', priority='MODERATE')
+
+        self.assertEqual(
+            list(Ticket.objects.order_by('priority')
+                 .values_list('priority', flat=True)),
+            ['MODERATE', 'URGENT'])
+
+    def test_invalid_value_rejected(self):
+        """Tests if values outside of choices can't be saved."""
+
+        with self.assertRaises(ValueError):
+            Ticket.objects.filter(id=self.ticket.id).update(status='DONE')
+        with self.assertRaises(ValidationError):
+            Ticket._meta.get_field('status').to_python('DONE')
+
+    def test_api_uses_strings(self):
+        """Tests if API accepts and returns string values."""
+
+        client = APIClient()
+        token = Token.objects.create(user=self.user)
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        payload = {
+            'title': 'New ticket', 'description': 'Test description',
+            'assigned_to': self.user.id, 'status': 'CLOSED',
+            'priority': 'MODERATE',
+        }
+
+        res = client.post(TICKET_URL, payload)
+        invalid = client.post(TICKET_URL, {**payload, 'status': 'DONE'})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            (res.data['status'], res.data['priority']), ('CLOSED', 'MODERATE'))
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,199 @@
+"""
+Tests for importing tickets from files.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from core.management.commands.import_tickets import Command
+from core.models import ImportCheckpoint, Ticket, Comment
+
+
+def write_file(directory, name, content):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8') as target:
+        target.write(content)
+
+    return path
+
+
+def import_file(path, **options):
+    stdout, stderr = StringIO(), StringIO()
+    call_command('import_tickets', path, stdout=stdout, stderr=stderr,
+                 **options)
+
+    return stdout.getvalue(), stderr.getvalue()
+
+
+def ticket_record(ticket_id, **extra_fields):
+    record = {
+        'type': 'ticket',
+        'id': ticket_id,
+        'title': f'Imported ticket {ticket_id}',
+        'description': 'Imported from old tracker',
+        'status': 'CLOSED',
+        'priority': 'URGENT',
+        'created_by': 'user@example.com',
+        'assigned_to': 'user2@example.com',
+        'created_at': '2020-01-01T10:00:00Z',
+        'updated_at': '2020-01-02T10:00:00Z',
+    }
+    record.update(**extra_fields)
+
+    return record
+
+
+class ImportTicketsCommandTests(TestCase):
+    """Tests for import_tickets command."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'pass123')
+        self.user2 = get_user_model().objects.create_user(
+            'user2@example.com', 'pass123')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_jsonl(self, records):
+        content = '\n'.join(json.dumps(record) for record in records)
+        return write_file(self.directory.name, 'tickets.jsonl', content)
+
+    def test_import_jsonl(self):
+        """Tests if tickets and comments are imported with timestamps."""
+
+        path = self.write_jsonl([
+            ticket_record(100),
+            {'type': 'comment', 'ticket': 100, 'author': 'user2@example.com',
+             'text': 'Imported comment', 'created_date': '2020-01-01T12:00:00Z'},
+        ])
+
+        import_file(path, batch_size=1)
+
+        ticket = Ticket.objects.get(id=100)
+        self.assertEqual(ticket.created_by, self.user)
+        self.assertEqual(ticket.assigned_to, self.user2)
+        self.assertEqual(ticket.created_at.year, 2020)
+        self.assertEqual(ticket.updated_at.day, 2)
+        self.assertEqual(ticket.comment_count, 1)
+        self.assertEqual(Comment.objects.get().author, self.user2)
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_import_csv(self):
+        """Tests if tickets are imported from CSV file."""
+
+        path = write_file(
+            self.directory.name, 'tickets.csv',
+            'id,title,description,status,priority,created_by,assigned_to\n'
+            '5,CSV ticket,From CSV,OPEN,LOW,user@example.com,user2@example.com\n'
+        )
+
+        import_file(path)
+
+        self.assertEqual(Ticket.objects.get(id=5).title, 'CSV ticket')
+
+    def test_invalid_records_reported_and_skipped(self):
+        """Tests if invalid records are skipped with an error."""
+
+        path = self.write_jsonl([
+            ticket_record(1, assigned_to='missing@example.com'),
+            ticket_record(2, status='UNKNOWN'),
+            {'type': 'comment', 'ticket': 999, 'text': 'Orphan'},
+            ticket_record(3),
+        ])
+
+        stdout, stderr = import_file(path)
+
+        self.assertEqual(
+            list(Ticket.objects.values_list('id', flat=True)), [3])
+        self.assertIn('Record 1: assigned_to', stderr)
+        self.assertIn('Record 2: status', stderr)
+        self.assertIn('Record 3: ticket', stderr)
+        self.assertIn('skipped 3 records', stdout)
+
+    def test_resume_from_checkpoint(self):
+        """Tests if import continues after records saved in checkpoint."""
+
+        path = self.write_jsonl([ticket_record(1), ticket_record(2)])
+        ImportCheckpoint.objects.create(source=path, records=1)
+
+        import_file(path)
+
+        self.assertEqual(
+            list(Ticket.objects.values_list('id', flat=True)), [2])
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_checkpoint_saved_with_batch(self):
+        """Tests if records without id aren't imported again after
+        interrupted run."""
+
+        path = self.write_jsonl([ticket_record(None, title=f'Ticket {number}')
+                                 for number in range(3)])
+
+        import_batch = Command.import_batch
+
+        def interrupted_import_batch(command, batch, *args):
+            if batch[0][0] > 1:
+                raise KeyboardInterrupt
+            import_batch(command, batch, *args)
+
+        with mock.patch.object(Command, 'import_batch',
+                               interrupted_import_batch):
+            with self.assertRaises(KeyboardInterrupt):
+                import_file(path, batch_size=2)
+        self.assertEqual(
+            ImportCheckpoint.objects.get(source=path).records, 2)
+        import_file(path, batch_size=2)
+
+        self.assertEqual(
+            sorted(Ticket.objects.values_list('title', flat=True)),
+            ['Ticket 0', 'Ticket 1', 'Ticket 2'])
+
+    def test_already_imported_records_skipped(self):
+        """Tests if rerunning import doesn't duplicate tickets."""
+
+        path = self.write_jsonl([ticket_record(1)])
+
+        import_file(path)
+        stdout, stderr = import_file(path)
+
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.assertIn('Record 1: id: ticket "1" already exists.', stderr)
+        self.assertIn('skipped 1 records', stdout)
+
+    def test_duplicate_ids_in_batch_skipped(self):
+        """Tests if records repeating id within batch are reported."""
+
+        path = self.write_jsonl([
+            ticket_record(1), ticket_record(1, title='Duplicate'),
+            ticket_record(2),
+        ])
+
+        stdout, stderr = import_file(path)
+
+        self.assertEqual(
+            list(Ticket.objects.order_by('id').values_list('id', 'title')),
+            [(1, 'Imported ticket 1'), (2, 'Imported ticket 2')])
+        self.assertIn('Record 2: id: ticket "1" already exists.', stderr)
+        self.assertIn('skipped 1 records', stdout)
+
+    def test_users_looked_up_once(self):
+        """Tests if every email is queried only once."""
+
+        path = self.write_jsonl([ticket_record(i) for i in range(1, 6)])
+
+        with CaptureQueriesContext(connection) as queries:
+            import_file(path, batch_size=1)
+        user_queries = [query for query in queries.captured_queries
+                        if 'FROM "core_user"' in query['sql']]
+
+        self.assertEqual(len(user_queries), 1)
+        self.assertEqual(Ticket.objects.count(), 5)
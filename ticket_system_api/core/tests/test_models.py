@@ -79,3 +79,57 @@ class ModelTests(TestCase):
 
         self.assertEqual(
             str(comment), f'{comment.ticket.id}_{comment.text[:20]}')
+
+    def test_comment_updates_ticket_activity(self):
+        """Tests if comments update ticket counter and last activity."""
+
+        user = get_user_model().objects.create_user('user@example.com', 'pass123')
+        user2 = get_user_model().objects.create_user('user2@example.com', 'pass123')
+        ticket = Ticket.objects.create(created_by=user, assigned_to=user2,
+                                       title='Test title', description='Test description', status='OPEN')
+
+        comment = Comment.objects.create(
+            ticket=ticket, author=user, text='Example comment text')
+        Comment.objects.create(
+            ticket=ticket, author=user, text='Another comment text')
+        ticket.refresh_from_db()
+
+        self.assertEqual(ticket.comment_count, 2)
+        self.assertGreaterEqual(ticket.last_activity_at, comment.created_date)
+
+        comment.delete()
+        ticket.refresh_from_db()
+
+        self.assertEqual(ticket.comment_count, 1)
+
+    def test_ticket_save_keeps_comment_count(self):
+        """Tests if saving stale ticket doesn't overwrite comment counter."""
+
+        user = get_user_model().objects.create_user('user@example.com', 'pass123')
+        user2 = get_user_model().objects.create_user('user2@example.com', 'pass123')
+        ticket = Ticket.objects.create(created_by=user, assigned_to=user2,
+                                       title='Test title', description='Test description', status='OPEN')
+        Comment.objects.create(
+            ticket=ticket, author=user, text='Example comment text')
+
+        ticket.status = 'CLOSED'
+        ticket.save()
+        ticket.refresh_from_db()
+
+        self.assertEqual(ticket.comment_count, 1)
+        self.assertEqual(ticket.status, 'CLOSED')
+
+    def test_ticket_save_writes_changed_comment_count(self):
+        """Tests if counter changed on saved instance is written."""
+
+        user = get_user_model().objects.create_user('user@example.com', 'pass123')
+        ticket = Ticket.objects.create(created_by=user, assigned_to=user,
+                                       title='Test title', description='Test description', status='OPEN')
+
+        ticket.comment_count = 5
+        ticket.is_overdue = True
+        ticket.save()
+        ticket.refresh_from_db()
+
+        self.assertEqual(ticket.comment_count, 5)
+        self.assertTrue(ticket.is_overdue)
@@ -0,0 +1,171 @@
+"""
+Tests for queued notification emails.
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from rest_framework.test import APIClient
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from core.models import Ticket, Notification
+from core.notifications import send_digests
+
+TICKET_URL = reverse('ticket:ticket-list')
+COMMENT_URL = reverse('ticket:comment-list')
+
+
+def create_user(email='user@example.com', password='pass123'):
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+class NotificationQueueTests(TestCase):
+    """Tests for queueing notifications on ticket changes."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_assignee_notified_on_ticket_create(self):
+        """Tests if creating ticket queues notification for assignee."""
+
+        self.client.post(TICKET_URL, {
+            'title': 'Printer',
+            'description': 'Out of paper',
+            'assigned_to': self.user2.id,
+        })
+        notification = Notification.objects.get()
+
+        self.assertEqual(notification.user, self.user2)
+        self.assertEqual(notification.kind, 'ASSIGNED')
+        self.assertIsNone(notification.sent_at)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_self_assignment_not_notified(self):
+        """Tests if users aren't notified about their own actions."""
+
+        self.client.post(TICKET_URL, {
+            'title': 'Printer',
+            'description': 'Out of paper',
+            'assigned_to': self.user.id,
+        })
+        ticket = Ticket.objects.get()
+        self.client.post(COMMENT_URL, {'ticket': ticket.id, 'text': 'Done'})
+
+        self.assertFalse(Notification.objects.exists())
+
+    def test_assignee_notified_on_comment(self):
+        """Tests if comment of other user queues notification for assignee."""
+
+        ticket = create_ticket(self.user, self.user2)
+        self.client.post(COMMENT_URL, {'ticket': ticket.id, 'text': 'Any news?'})
+
+        self.assertEqual(
+            list(Notification.objects.values_list('user_id', 'kind')),
+            [(self.user2.id, 'COMMENTED')])
+
+    def test_new_assignee_notified_on_update(self):
+        """Tests if reassigning ticket notifies new assignee."""
+
+        ticket = create_ticket(self.user, self.user)
+        self.client.patch(
+            reverse('ticket:ticket-detail', args=[ticket.id]),
+            {'assigned_to': self.user2.id})
+
+        self.assertEqual(Notification.objects.get().user, self.user2)
+
+    @mock.patch('ticket.views.notify_assignee', side_effect=RuntimeError)
+    def test_ticket_not_created_without_notification(self, notify_assignee):
+        """Tests if ticket and its notification are saved together."""
+
+        with self.assertRaises(RuntimeError):
+            self.client.post(TICKET_URL, {
+                'title': 'Printer',
+                'description': 'Out of paper',
+                'assigned_to': self.user2.id,
+            })
+
+        self.assertFalse(Ticket.objects.exists())
+
+
+@override_settings(NOTIFICATION_DIGEST_WINDOW=60)
+class SendDigestsTests(TestCase):
+    """Tests for sending digest emails."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com')
+        self.ticket = create_ticket(self.user, self.user2, title='Printer')
+        self.ticket2 = create_ticket(self.user, self.user2, title='Laptop')
+
+    def queue(self, user, ticket, kind, minutes_ago):
+        return Notification.objects.create(
+            user=user, ticket=ticket, kind=kind,
+            created_at=timezone.now() - timedelta(minutes=minutes_ago))
+
+    def test_notifications_coalesced_into_digest(self):
+        """Tests if all events of user are sent in one email."""
+
+        self.queue(self.user2, self.ticket, 'ASSIGNED', 5)
+        self.queue(self.user2, self.ticket, 'COMMENTED', 4)
+        self.queue(self.user2, self.ticket, 'COMMENTED', 3)
+        self.queue(self.user2, self.ticket2, 'COMMENTED', 0)
+        self.queue(self.user, self.ticket, 'COMMENTED', 2)
+
+        sent = send_digests()
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(len(mail.outbox), 2)
+        digest = next(
+            message for message in mail.outbox
+            if message.to == [self.user2.email])
+        self.assertEqual(digest.body.splitlines(), [
+            f'You were assigned to ticket #{self.ticket.id}: Printer',
+            f'New comments on ticket #{self.ticket.id}: Printer (2)',
+            f'New comments on ticket #{self.ticket2.id}: Laptop (1)',
+        ])
+        self.assertFalse(Notification.objects.filter(
+            sent_at__isnull=True).exists())
+
+    def test_recent_notifications_wait_for_window(self):
+        """Tests if user's events are held until the oldest one is due."""
+
+        self.queue(self.user2, self.ticket, 'ASSIGNED', 0)
+
+        self.assertEqual(send_digests(), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_sent_notifications_not_repeated(self):
+        """Tests if every notification is emailed only once."""
+
+        self.queue(self.user2, self.ticket, 'ASSIGNED', 5)
+        send_digests()
+        send_digests()
+
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_command_sends_all_batches(self):
+        """Tests if command drains the queue in batches."""
+
+        self.queue(self.user2, self.ticket, 'ASSIGNED', 5)
+        self.queue(self.user, self.ticket, 'COMMENTED', 5)
+        call_command('send_notifications', batch_size=1, stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 2)
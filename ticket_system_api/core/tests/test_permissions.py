@@ -0,0 +1,45 @@
+"""
+Tests for custom permissions.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, RequestFactory
+from core.custom_permissions import IsOwnerOrAdminOrReadOnly
+from core.models import Ticket, Comment
+
+
+class IsOwnerOrAdminOrReadOnlyTests(TestCase):
+    """Tests for object ownership permission."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'pass123')
+        self.user2 = get_user_model().objects.create_user(
+            'user2@example.com', 'pass123')
+        ticket = Ticket.objects.create(
+            created_by=self.user, assigned_to=self.user2,
+            title='Test title', description='Test description')
+        Comment.objects.create(author=self.user, ticket=ticket, text='Hi')
+        self.ticket = Ticket.objects.get(id=ticket.id)
+        self.comment = Comment.objects.get(ticket=ticket)
+        self.permission = IsOwnerOrAdminOrReadOnly()
+
+    def has_permission(self, user, obj):
+        request = RequestFactory().patch('/')
+        request.user = user
+        return self.permission.has_object_permission(request, None, obj)
+
+    def test_owner_checked_without_queries(self):
+        """Tests if ownership is checked without loading related users."""
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.has_permission(self.user, self.ticket))
+            self.assertTrue(self.has_permission(self.user, self.comment))
+            self.assertFalse(self.has_permission(self.user2, self.ticket))
+            self.assertFalse(self.has_permission(self.user2, self.comment))
+
+    def test_comment_without_author(self):
+        """Tests if comment of deleted author can't be edited by others."""
+
+        self.comment.author = None
+
+        self.assertFalse(self.has_permission(self.user2, self.comment))
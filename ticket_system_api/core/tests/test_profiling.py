@@ -0,0 +1,130 @@
+"""
+Tests for request profiling.
+"""
+import os
+import tempfile
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from core.models import Ticket
+from core.profiling import report_executor
+
+TICKET_URL = reverse('ticket:ticket-list')
+
+
+class RequestProfilingTests(TestCase):
+    """Tests for profiling middleware."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            PROFILING_DIR=self.directory.name, PROFILING_MAX_BYTES=2000)
+        self.settings_override.enable()
+        self.client = APIClient()
+        self.staff = get_user_model().objects.create_user(
+            'staff@example.com', 'pass123', is_staff=True)
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'pass123')
+        for _ in range(2):
+            Ticket.objects.create(created_by=self.user, assigned_to=self.staff,
+                                  title='Test title', description='Test description')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.directory.cleanup()
+
+    def authenticate(self, user):
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_cprofile_report_for_staff(self):
+        """Tests if staff user receives cProfile report."""
+
+        self.authenticate(self.staff)
+        res = self.client.get(TICKET_URL, {'_profile': 'cprofile'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res['Content-Type'], 'text/plain')
+        self.assertIn('function calls', res.content.decode())
+
+    def test_sql_trace_for_staff(self):
+        """Tests if SQL trace reports queries and duplicates."""
+
+        self.authenticate(self.staff)
+        res = self.client.get(
+            reverse('ticket:ticket-detail', args=[Ticket.objects.first().id]),
+            {'_profile': 'sql'})
+        report = res.json()
+
+        self.assertGreater(report['count'], 0)
+        self.assertEqual(len(report['queries']), report['count'])
+        self.assertIn('time_ms', report['queries'][0])
+        self.assertIn('duplicates', report)
+
+    def test_profiling_ignored_for_regular_user(self):
+        """Tests if non staff users get regular response."""
+
+        self.authenticate(self.user)
+        res = self.client.get(TICKET_URL, {'_profile': 'cprofile'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('results', res.json())
+
+    def test_saving_report(self):
+        """Tests if saved report is written to profile directory."""
+
+        self.authenticate(self.staff)
+        res = self.client.get(
+            TICKET_URL, {'_profile': 'sql', '_profile_save': '1'})
+
+        self.assertIn('results', res.json())
+        self.assertNotIn('X-Profile-File', res)
+        with open(os.path.join(self.directory.name, 'profiles.log')) as report:
+            self.assertIn(f'=== {res["X-Profile-Id"]} ', report.read())
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_sampled_profiles_rotated(self):
+        """Tests if sampled requests are saved to size rotated files."""
+
+        for _ in range(3):
+            self.client.get(TICKET_URL)
+        report_executor.submit(lambda: None).result()
+
+        self.assertTrue(os.path.exists(
+            os.path.join(self.directory.name, 'profiles.log.1')))
+
+    def test_profile_param_ignored_by_response_cache(self):
+        """Tests if anonymous users can't get past cache with profile param."""
+
+        cache.clear()
+        self.client.get(TICKET_URL)
+        Ticket.objects.update(title='Changed without signals')
+
+        res = self.client.get(TICKET_URL, {'_profile': 'sql'})
+
+        self.assertEqual(res.json()['results'][0]['title'], 'Test title')
+
+    async def test_sql_trace_under_asgi(self):
+        """Tests if profiling works with async middleware chain."""
+
+        token = await Token.objects.acreate(user=self.staff)
+        res = await self.async_client.get(
+            TICKET_URL, {'_profile': 'sql'},
+            AUTHORIZATION=f'Token {token.key}')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertGreater(res.json()['count'], 0)
+
+    async def test_regular_request_under_asgi(self):
+        """Tests if requests without profiling pass through async chain."""
+
+        res = await self.async_client.get(TICKET_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('results', res.json())
@@ -0,0 +1,128 @@
+"""
+Tests for SQL budget of requests.
+"""
+import time
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from core.models import Ticket
+from core.query_budget import QueryBudget, QueryBudgetExceeded
+from ticket.views import TicketViewSet
+
+TICKET_URL = reverse('ticket:ticket-list')
+# Recursive query running for many seconds without touching any table.
+SLOW_SQL = (
+    'WITH RECURSIVE numbers(x) AS '
+    '(SELECT 1 UNION ALL SELECT x + 1 FROM numbers) '
+    'SELECT x FROM numbers LIMIT 1 OFFSET 100000000'
+)
+
+
+def run_slow_query(queryset):
+    with connection.cursor() as cursor:
+        cursor.execute(SLOW_SQL)
+    return queryset
+
+
+class QueryBudgetTests(TestCase):
+    """Tests for execute wrapper enforcing budget."""
+
+    def test_slow_query_interrupted(self):
+        """Tests if query running longer than budget is cancelled."""
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(QueryBudget(50, None)):
+            with self.assertRaises(QueryBudgetExceeded):
+                with connection.cursor() as cursor:
+                    cursor.execute(SLOW_SQL)
+
+        self.assertLess(time.perf_counter() - start, 2)
+
+    def test_queries_within_budget(self):
+        """Tests if fast queries are executed and counted."""
+
+        budget = QueryBudget(1000, None)
+        with connection.execute_wrapper(budget):
+            Ticket.objects.count()
+            Ticket.objects.exists()
+
+        self.assertEqual(budget.queries, 2)
+
+    def test_queries_after_spent_budget_rejected(self):
+        """Tests if no more queries run once the budget is spent."""
+
+        budget = QueryBudget(1000, None)
+        budget.spent = 1
+
+        with connection.execute_wrapper(budget):
+            with self.assertRaises(QueryBudgetExceeded):
+                Ticket.objects.count()
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    """Tests for enforcing budget of requests."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        user = get_user_model().objects.create_user('user@example.com', 'pass123')
+        Ticket.objects.create(created_by=user, assigned_to=user,
+                              title='Test title', description='Test description')
+
+    @override_settings(QUERY_TIME_BUDGET_MS=50)
+    def test_request_over_budget_cancelled(self):
+        """Tests if slow request gets 503 response with Retry-After."""
+
+        with mock.patch.object(TicketViewSet, 'filter_by_query_params',
+                               side_effect=run_slow_query):
+            res = self.client.get(TICKET_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(res['Retry-After'], '5')
+
+    def test_view_budget_overrides_settings(self):
+        """Tests if view can set its own budget."""
+
+        with mock.patch.object(TicketViewSet, 'query_time_budget_ms', 50,
+                               create=True), \
+                mock.patch.object(TicketViewSet, 'filter_by_query_params',
+                                  side_effect=run_slow_query):
+            res = self.client.get(TICKET_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    @override_settings(QUERY_COUNT_BUDGET=1)
+    def test_query_count_overrun_logged(self):
+        """Tests if running more queries than budget is logged."""
+
+        with self.assertLogs('ticket_system_api.query_budget', 'WARNING') as logs:
+            res = self.client.get(TICKET_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(f'GET {TICKET_URL}', logs.output[0])
+
+    @override_settings(QUERY_TIME_BUDGET_MS=50)
+    async def test_request_over_budget_cancelled_under_asgi(self):
+        """Tests if budget is enforced with async middleware chain."""
+
+        with mock.patch.object(TicketViewSet, 'filter_by_query_params',
+                               side_effect=run_slow_query):
+            res = await self.async_client.get(TICKET_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    @override_settings(QUERY_COUNT_BUDGET=1)
+    async def test_query_count_counted_under_asgi(self):
+        """Tests if queries of sync views are counted under ASGI."""
+
+        with self.assertLogs('ticket_system_api.query_budget', 'WARNING'):
+            res = await self.async_client.get(TICKET_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -0,0 +1,97 @@
+"""
+Tests for cached OpenAPI schema.
+"""
+import gzip
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from rest_framework import status
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from core import schema
+from core.schema import schema_cache, get_schema_path
+
+SCHEMA_URL = reverse('api-schema')
+
+
+class CachedSchemaTests(TestCase):
+    """Tests for schema endpoint."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            SCHEMA_CACHE_DIR=self.directory.name)
+        self.settings_override.enable()
+        schema_cache.clear()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.directory.cleanup()
+        schema_cache.clear()
+
+    def test_schema_generated_once(self):
+        """Tests if schema is generated only on first request."""
+
+        with mock.patch.object(schema, 'render_schema',
+                               wraps=schema.render_schema) as render:
+            res = self.client.get(SCHEMA_URL)
+            res_cached = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(b'openapi:', res.content)
+        self.assertEqual(res.content, res_cached.content)
+        self.assertEqual(render.call_count, 1)
+
+    def test_not_modified_for_matching_etag(self):
+        """Tests if 304 is returned for current ETag."""
+
+        res = self.client.get(SCHEMA_URL)
+        res_not_modified = self.client.get(
+            SCHEMA_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res_not_modified.status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+    def test_gzip_encoding(self):
+        """Tests if compressed schema is returned when accepted."""
+
+        res = self.client.get(SCHEMA_URL)
+        res_gzip = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(res_gzip['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(res_gzip.content), res.content)
+        self.assertNotEqual(res_gzip['ETag'], res['ETag'])
+        self.assertIn('Accept-Encoding', res['Vary'])
+
+    def test_etag_of_other_encoding_not_matched(self):
+        """Tests if ETag of plain schema doesn't validate gzipped one."""
+
+        res = self.client.get(SCHEMA_URL)
+        res_gzip = self.client.get(
+            SCHEMA_URL, HTTP_IF_NONE_MATCH=res['ETag'],
+            HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(res_gzip.status_code, status.HTTP_200_OK)
+        self.assertEqual(res_gzip['Content-Encoding'], 'gzip')
+
+    def test_json_format(self):
+        """Tests if JSON schema is served for JSON format."""
+
+        res = self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('openapi', res.json())
+
+    def test_schema_served_from_generated_file(self):
+        """Tests if files written by command are served."""
+
+        call_command('generate_schema', stdout=StringIO())
+        path = get_schema_path('yaml')
+        path.write_bytes(b'openapi: from-file\n')
+
+        res = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(res.content, b'openapi: from-file\n')
@@ -0,0 +1,98 @@
+"""
+Tests for SLA deadlines of tickets.
+"""
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from core.models import Ticket
+
+SLA_HOURS = {'LOW': 72, 'MODERATE': 24, 'URGENT': 4}
+
+
+def create_ticket(user, **extra_fields):
+    payload = {
+        'title': 'Test title',
+        'description': 'Test description',
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=user, assigned_to=user, **payload)
+
+
+@override_settings(TICKET_SLA_HOURS=SLA_HOURS)
+class DueDateTests(TestCase):
+    """Tests for computing due dates."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'user@example.com', 'pass123')
+
+    def test_due_at_from_priority(self):
+        """Tests if due date is counted from creation by priority."""
+
+        ticket = create_ticket(self.user, priority='URGENT')
+
+        self.assertAlmostEqual(ticket.due_at, ticket.created_at + timedelta(hours=4),
+                               delta=timedelta(seconds=1))
+
+    def test_due_at_changed_with_priority(self):
+        """Tests if changing priority moves due date and clears the flag."""
+
+        ticket = create_ticket(self.user, priority='URGENT')
+        Ticket.objects.filter(id=ticket.id).update(is_overdue=True)
+        ticket = Ticket.objects.get(id=ticket.id)
+
+        ticket.priority = 'LOW'
+        ticket.save()
+        ticket.refresh_from_db()
+
+        self.assertEqual(ticket.due_at, ticket.created_at + timedelta(hours=72))
+        self.assertFalse(ticket.is_overdue)
+
+    def test_save_keeps_overdue_flag(self):
+        """Tests if saving other fields doesn't clear flag set by sweep."""
+
+        ticket = create_ticket(self.user)
+        Ticket.objects.filter(id=ticket.id).update(is_overdue=True)
+
+        ticket.title = 'New title'
+        ticket.save()
+        ticket.refresh_from_db()
+
+        self.assertTrue(ticket.is_overdue)
+
+
+class SlaSweepCommandTests(TestCase):
+    """Tests for sla_sweep command."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            'user@example.com', 'pass123')
+        past = timezone.now() - timedelta(hours=1)
+        self.overdue = [create_ticket(user, due_at=past) for _ in range(3)]
+        self.closed = create_ticket(user, status='CLOSED', due_at=past)
+        self.pending = create_ticket(user)
+
+    def test_overdue_tickets_flagged(self):
+        """Tests if only open tickets past due date are flagged."""
+
+        out = StringIO()
+        call_command('sla_sweep', '--batch-size', '2', stdout=out)
+
+        self.assertEqual(
+            set(Ticket.objects.filter(is_overdue=True)
+                .values_list('id', flat=True)),
+            {ticket.id for ticket in self.overdue})
+        self.assertIn('3 tickets flagged', out.getvalue())
+
+    def test_sweep_is_incremental(self):
+        """Tests if already flagged tickets are not swept again."""
+
+        call_command('sla_sweep', stdout=StringIO())
+        out = StringIO()
+        call_command('sla_sweep', stdout=out)
+
+        self.assertIn('0 tickets flagged', out.getvalue())
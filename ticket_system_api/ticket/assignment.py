@@ -0,0 +1,129 @@
+"""
+Automatic assignment of new tickets to the least loaded staff member.
+
+Loads of active staff members are stored in StaffWorkload rows, so all
+processes share them. Rows are changed with relative updates in transactions
+changing tickets and locked while ticket is assigned, so concurrent
+assignments are serialized by the database and never see stale loads.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from core.models import StaffWorkload, User, Ticket
+
+OPEN_STATUSES = [
+    status for status, _ in Ticket.STATUS_CHOICES if status != 'CLOSED']
+
+
+def get_weight(status, priority):
+    """Gets load ticket puts on its assignee, closed tickets weigh nothing."""
+
+    if status == 'CLOSED':
+        return 0
+
+    return settings.TICKET_AUTO_ASSIGN_WEIGHTS.get(priority, 1)
+
+
+def _change(user_id, delta):
+    if not delta or user_id is None:
+        return
+
+    StaffWorkload.objects.filter(user_id=user_id).update(
+        load=F('load') + delta)
+
+
+def _lock(user_ids=None):
+    # Updating rows without changing them takes row locks on databases
+    # supporting them and write lock on SQLite, which `select_for_update`
+    # silently skips.
+    workloads = StaffWorkload.objects.all()
+    if user_ids is not None:
+        workloads = workloads.filter(user_id__in=user_ids)
+    workloads.update(load=F('load'))
+
+
+def assign_least_loaded():
+    """Gets id of the least loaded active staff member or None.
+
+    Has to be called in transaction creating the ticket. Workloads stay
+    locked until it ends and the ticket is counted by `ticket_created` in
+    the same transaction, so concurrent assignments wait and see it."""
+
+    _lock()
+
+    return (
+        StaffWorkload.objects
+        .filter(user__is_staff=True, user__is_active=True)
+        .order_by('load', 'user_id')
+        .values_list('user_id', flat=True)
+        .first()
+    )
+
+
+def ticket_created(ticket):
+    _change(ticket.assigned_to_id, get_weight(ticket.status, ticket.priority))
+
+
+def ticket_changed(ticket):
+    loaded = [
+        ticket.get_loaded_value(attname)
+        for attname in ('assigned_to_id', 'status', 'priority')
+    ]
+    if None in loaded:
+        # Previous assignee isn't known, count all loads again.
+        rebuild_loads()
+        return
+
+    previous_assignee_id, previous_status, previous_priority = loaded
+    if loaded == [ticket.assigned_to_id, ticket.status, ticket.priority]:
+        return
+    _change(previous_assignee_id,
+            -get_weight(previous_status, previous_priority))
+    _change(ticket.assigned_to_id, get_weight(ticket.status, ticket.priority))
+
+
+def ticket_deleted(ticket):
+    _change(ticket.assigned_to_id, -get_weight(ticket.status, ticket.priority))
+
+
+def rebuild_loads(user_ids=None):
+    """Counts loads of given users (all by default) from their tickets.
+
+    Users who are not active staff members anymore lose their rows."""
+
+    weight = Case(
+        *[When(tickets__priority=priority, then=Value(value))
+          for priority, value in settings.TICKET_AUTO_ASSIGN_WEIGHTS.items()],
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+    users = User.objects.all()
+    workloads = StaffWorkload.objects.all()
+    if user_ids is not None:
+        users = users.filter(id__in=user_ids)
+        workloads = workloads.filter(user_id__in=user_ids)
+
+    with transaction.atomic():
+        _lock(user_ids)
+        rows = (
+            users.filter(is_staff=True, is_active=True)
+            .annotate(load=Coalesce(
+                Sum(weight, filter=Q(tickets__status__in=OPEN_STATUSES)), 0))
+            .values_list('id', 'load')
+        )
+        workloads.exclude(
+            user__is_staff=True, user__is_active=True).delete()
+        StaffWorkload.objects.bulk_create(
+            [StaffWorkload(user_id=user_id, load=load)
+             for user_id, load in rows],
+            batch_size=1000, update_conflicts=True,
+            unique_fields=['user'], update_fields=['load'])
+
+
+def get_loads():
+    """Returns current loads by user id."""
+
+    return dict(StaffWorkload.objects.values_list('user_id', 'load'))
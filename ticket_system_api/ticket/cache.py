@@ -0,0 +1,199 @@
+"""
+Caching of full responses served to anonymous readers and of rendered
+ticket details.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+GENERATION_KEY = 'ticket:generation'
+DETAIL_EPOCH_KEY = 'ticket:detail-epoch'
+CACHED_HEADERS = ('Content-Type', 'Vary', 'Allow')
+PROFILING_PARAMS = ('_profile', '_profile_save')
+
+
+def get_generation():
+    """Gets current generation of ticket data."""
+
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+
+    return generation
+
+
+def bump_generation():
+    """Moves ticket data to new generation, orphaning cached responses."""
+
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_responses():
+    """Invalidates cached responses now and after transaction commits."""
+
+    bump_generation()
+    transaction.on_commit(bump_generation)
+
+
+def is_anonymous_read(request):
+    # Profiling param is honoured only for staff, marked by profiling
+    # middleware, so it can't be used to get past the cache.
+    return (request.method == 'GET'
+            and 'HTTP_AUTHORIZATION' not in request.META
+            and not getattr(request, 'profiling', None))
+
+
+def response_cache_key(request):
+    """Builds key from path, sorted query params and accepted media type."""
+
+    query = sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        if key not in PROFILING_PARAMS
+        for value in values
+    )
+    raw_key = '|'.join([
+        request.path,
+        repr(query),
+        request.META.get('HTTP_ACCEPT', ''),
+    ])
+    digest = hashlib.md5(raw_key.encode()).hexdigest()
+
+    return f'ticket:response:{get_generation()}:{digest}'
+
+
+class AnonymousResponseCacheMixin:
+    """Serves GET requests without credentials from cache."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_anonymous_read(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            return HttpResponse(content, headers=headers)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            if hasattr(response, 'render'):
+                response.render()
+            headers = {
+                header: response[header]
+                for header in CACHED_HEADERS if response.has_header(header)
+            }
+            cache.set(key, (response.content, headers),
+                      settings.ANONYMOUS_RESPONSE_CACHE_TIMEOUT)
+
+        return response
+
+
+def ticket_version_key(ticket_id):
+    return f'ticket:detail-version:{ticket_id}'
+
+
+def bump_version(key):
+    """Increments version counter, starting it from current time if missing."""
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def invalidate_ticket_detail(ticket_id):
+    """Invalidates cached details of ticket now and after transaction commits."""
+
+    key = ticket_version_key(ticket_id)
+    bump_version(key)
+    transaction.on_commit(lambda: bump_version(key))
+
+
+def invalidate_ticket_details():
+    """Invalidates cached details of all tickets, used when users change."""
+
+    bump_version(DETAIL_EPOCH_KEY)
+    transaction.on_commit(lambda: bump_version(DETAIL_EPOCH_KEY))
+
+
+class TicketDetailCache:
+    """Bounded LRU cache of rendered ticket details in process memory.
+
+    Entries are valid for a version made of ticket's own counter and global
+    epoch, both kept in default cache. Processes notice changes made by other
+    ones only when default cache is shared between them (e.g. Redis or
+    Memcached), with per-process LocMemCache other processes keep serving
+    stale details."""
+
+    def __init__(self, max_size):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_version(self, ticket_id):
+        keys = [ticket_version_key(ticket_id), DETAIL_EPOCH_KEY]
+        versions = cache.get_many(keys)
+        if len(versions) < len(keys):
+            for key in keys:
+                if key not in versions:
+                    cache.add(key, time.time_ns(), timeout=None)
+            versions = cache.get_many(keys)
+
+        return tuple(versions.get(key) for key in keys)
+
+    def get(self, ticket_id):
+        """Gets cached details with their version, details are None on miss."""
+
+        version = self.get_version(ticket_id)
+        with self._lock:
+            entry = self._entries.get(ticket_id)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(ticket_id)
+                self.hits += 1
+                return entry[1], version
+            self.misses += 1
+
+        return None, version
+
+    def set(self, ticket_id, version, data):
+        """Stores details rendered for version read before rendering."""
+
+        with self._lock:
+            self._entries[ticket_id] = (version, data)
+            self._entries.move_to_end(ticket_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+ticket_detail_cache = TicketDetailCache(settings.TICKET_DETAIL_CACHE_SIZE)
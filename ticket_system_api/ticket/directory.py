@@ -0,0 +1,87 @@
+"""
+In-memory directory of employees used by assignee picker.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from ticket.cache import bump_version
+
+DIRECTORY_FIELDS = ['id', 'name', 'surname', 'email']
+VERSION_KEY = 'ticket:directory-version'
+
+
+class EmployeeDirectory:
+    """Cached list of staff members with prefix index on name, surname and email.
+
+    Directory is loaded with single query on first use and kept for version
+    counter stored in default cache, which is bumped whenever any user
+    changes. Processes notice changes made by other ones only when default
+    cache is shared between them, just like with ticket details cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = None
+        self._index = None
+
+    def _load(self):
+        entries = list(
+            get_user_model().objects.filter(is_staff=True)
+            .order_by('id').values(*DIRECTORY_FIELDS)
+        )
+        index = sorted(
+            (entry[field].lower(), position)
+            for position, entry in enumerate(entries)
+            for field in ('name', 'surname', 'email')
+        )
+
+        return entries, index
+
+    def get_version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(VERSION_KEY)
+
+        return version
+
+    def _get(self):
+        # Version is read before loading, so directory loaded while user
+        # changes is kept only until the next search.
+        version = self.get_version()
+        with self._lock:
+            if self._entries is not None and self._version == version:
+                return self._entries, self._index
+
+        entries, index = self._load()
+        with self._lock:
+            self._version, self._entries, self._index = version, entries, index
+
+        return entries, index
+
+    def invalidate(self):
+        bump_version(VERSION_KEY)
+
+    def search(self, query='', exclude_id=None):
+        """Returns employees having name, surname or email starting with query."""
+
+        entries, index = self._get()
+        query = query.strip().lower()
+        if query:
+            positions = set()
+            start = bisect_left(index, (query, -1))
+            for key, position in index[start:]:
+                if not key.startswith(query):
+                    break
+                positions.add(position)
+            entries = [entries[position] for position in sorted(positions)]
+
+        return [entry for entry in entries if entry['id'] != exclude_id]
+
+
+directory = EmployeeDirectory()
@@ -0,0 +1,120 @@
+"""
+In-process publish/subscribe hub for ticket change events.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+
+@dataclass(frozen=True)
+class TicketEvent:
+    """Single change of a ticket sent to stream subscribers."""
+
+    id: int
+    type: str
+    ticket: int
+    fields: list = field(default_factory=list)
+
+    def to_sse(self) -> str:
+        """Formats event as Server-Sent Events message."""
+
+        data = json.dumps({'ticket': self.ticket, 'fields': self.fields})
+        return f'id: {self.id}\nevent: {self.type}\ndata: {data}\n\n'
+
+
+class Subscription:
+    """Queue of events delivered to a single stream client."""
+
+    def __init__(self, hub, backlog, max_pending):
+        self._hub = hub
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=max_pending + len(backlog))
+        self.overflowed = False
+        for event in backlog:
+            self._queue.put_nowait(event)
+
+    def push(self, event):
+        """Hands event over to subscriber's event loop. Thread safe."""
+
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+        except RuntimeError:
+            self.close()
+
+    def _deliver(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.close()
+
+    async def get(self, timeout=None):
+        """Waits for next event, returns None on timeout."""
+
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self._hub.unsubscribe(self)
+
+
+class TicketEventHub:
+    """Fans out ticket events to subscribers and keeps recent ones for resume.
+
+    Events only reach subscribers living in the same process, so the stream
+    has to be served by the process that handles writes."""
+
+    def __init__(self, buffer_size):
+        self._lock = threading.Lock()
+        self._buffer = deque(maxlen=buffer_size)
+        self._last_id = 0
+        self._subscribers = set()
+
+    def publish(self, event_type, ticket_id, fields=None):
+        """Stores event in ring buffer and sends it to all subscribers."""
+
+        with self._lock:
+            self._last_id += 1
+            event = TicketEvent(self._last_id, event_type,
+                                ticket_id, list(fields or []))
+            self._buffer.append(event)
+            subscribers = list(self._subscribers)
+
+        for subscriber in subscribers:
+            subscriber.push(event)
+
+        return event
+
+    def subscribe(self, last_event_id=None, max_pending=100):
+        """Creates subscription, replaying buffered events after given id.
+
+        Must be called from within running event loop."""
+
+        with self._lock:
+            if last_event_id is None or last_event_id > self._last_id:
+                backlog = []
+            else:
+                backlog = [
+                    event for event in self._buffer if event.id > last_event_id]
+            subscription = Subscription(self, backlog, max_pending)
+            self._subscribers.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscribers)
+
+
+hub = TicketEventHub(settings.TICKET_STREAM_BUFFER_SIZE)
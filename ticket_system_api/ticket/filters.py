@@ -0,0 +1,198 @@
+"""
+Declarative filters for ticket and comment lists.
+"""
+
+from datetime import datetime, time
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from core.models import Ticket
+
+
+class Filter:
+    """Single query param compiled into queryset lookup."""
+
+    def __init__(self, lookup, param=None):
+        self.lookup = lookup
+        self.param = param
+
+    def parse(self, value):
+        return value
+
+    def get_condition(self, value):
+        return Q(**{self.lookup: value})
+
+
+class CharFilter(Filter):
+    pass
+
+
+class NumberFilter(Filter):
+    """Accepts whole numbers fitting into 64-bit integer column."""
+
+    MIN_VALUE = -2 ** 63
+    MAX_VALUE = 2 ** 63 - 1
+
+    def parse(self, value):
+        try:
+            number = int(value)
+        except ValueError:
+            raise ValueError('Enter a whole number.')
+        if not self.MIN_VALUE <= number <= self.MAX_VALUE:
+            raise ValueError(
+                f'Enter a number between {self.MIN_VALUE} and {self.MAX_VALUE}.')
+
+        return number
+
+
+class DateTimeFilter(Filter):
+    """Accepts date or date with time, naive values are in current timezone."""
+
+    def parse(self, value):
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is None:
+                raise ValueError('Enter a valid date or date with time.')
+            parsed = datetime.combine(date, time.min)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+
+        return parsed
+
+
+class MultipleChoiceFilter(Filter):
+    """Accepts comma separated values, compiled into single IN lookup."""
+
+    def __init__(self, field, choices, param=None):
+        super().__init__(f'{field}__in', param)
+        self.choices = {value for value, _ in choices}
+
+    def parse(self, value):
+        values = [item.strip() for item in value.split(',') if item.strip()]
+        invalid = [item for item in values if item not in self.choices]
+        if invalid or not values:
+            raise ValueError(
+                f'Select values from: {", ".join(sorted(self.choices))}.')
+
+        return values
+
+
+class BooleanFilter(Filter):
+    def parse(self, value):
+        if value in ('1', 'true'):
+            return True
+        if value in ('0', 'false'):
+            return False
+        raise ValueError('Enter true or false.')
+
+
+class OverdueFilter(BooleanFilter):
+    """Matches not closed tickets past their SLA deadline.
+
+    Condition matches partial index of open tickets by due date."""
+
+    def __init__(self, param=None):
+        super().__init__('due_at', param)
+
+    def get_condition(self, value):
+        overdue = Q(due_at__lt=timezone.now()) & ~Q(status='CLOSED')
+        return overdue if value else ~overdue
+
+
+class FilterSet:
+    """Validates query params and applies them to queryset in one filter call.
+
+    Filters are declared as class attributes, query param name is attribute
+    name with underscores replaced by hyphens unless given explicitly."""
+
+    ordering_param = 'order-by'
+    ordering_fields = []
+    default_ordering = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.declared_filters = {}
+        for base in reversed(cls.__mro__):
+            for name, value in vars(base).items():
+                if isinstance(value, Filter):
+                    param = value.param or name.replace('_', '-')
+                    cls.declared_filters[param] = value
+
+    def __init__(self, query_params):
+        self.query_params = query_params
+
+    def get_conditions(self):
+        """Validates all filter params, raising single error for all of them."""
+
+        conditions, errors = [], {}
+        for param, declared_filter in self.declared_filters.items():
+            value = self.query_params.get(param)
+            if value in (None, ''):
+                continue
+            try:
+                conditions.append(
+                    declared_filter.get_condition(declared_filter.parse(value)))
+            except ValueError as error:
+                errors[param] = [str(error)]
+
+        if errors:
+            raise ValidationError(errors)
+
+        return conditions
+
+    def get_ordering(self):
+        """Parses `field-asc` or `field-desc` ordering from whitelist."""
+
+        value = self.query_params.get(self.ordering_param)
+        if not value:
+            return self.default_ordering
+
+        field, _, direction = value.rpartition('-')
+        if field not in self.ordering_fields or direction not in ('asc', 'desc'):
+            raise ValidationError({self.ordering_param: [
+                'Use field-asc or field-desc, where field is one of: '
+                f'{", ".join(self.ordering_fields)}.'
+            ]})
+
+        return [field if direction == 'asc' else f'-{field}']
+
+    def filter_queryset(self, queryset):
+        return queryset.filter(*self.get_conditions())
+
+
+class TicketFilterSet(FilterSet):
+    """Filters for tickets list."""
+
+    assigned = NumberFilter('assigned_to_id')
+    creator = NumberFilter('created_by_id')
+    ticket_id = NumberFilter('id')
+    ticket_title = CharFilter('title__icontains')
+    status = MultipleChoiceFilter('status', Ticket.STATUS_CHOICES)
+    priority = MultipleChoiceFilter('priority', Ticket.PRIORITY_CHOICES)
+    created_after = DateTimeFilter('created_at__gte')
+    created_before = DateTimeFilter('created_at__lt')
+    updated_after = DateTimeFilter('updated_at__gte')
+    updated_before = DateTimeFilter('updated_at__lt')
+    min_comments = NumberFilter('comment_count__gte')
+    overdue = OverdueFilter()
+
+    # Status and priority are ordered by their integer codes, documented in
+    # README together with this list.
+    ordering_fields = ['id', 'title', 'status', 'priority', 'created_at',
+                       'updated_at', 'comment_count', 'last_activity_at']
+    default_ordering = ['-id']
+
+
+class CommentFilterSet(FilterSet):
+    """Filters for comments list."""
+
+    ticket = NumberFilter('ticket_id')
+    author = NumberFilter('author_id')
+    created_after = DateTimeFilter('created_date__gte')
+    created_before = DateTimeFilter('created_date__lt')
+
+    ordering_fields = ['id', 'created_date', 'updated_date']
@@ -0,0 +1,47 @@
+"""
+Command indexing signatures of existing tickets for finding similar ones.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.models import Ticket
+from ticket.similarity import index_tickets
+
+
+class Command(BaseCommand):
+    """Computes MinHash signatures and LSH bands of tickets in batches.
+
+    Only tickets without signature are indexed unless --rebuild is given,
+    so interrupted run can be resumed by running command again."""
+
+    help = 'Indexes tickets for finding similar and duplicate tickets.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Index again also tickets which already have signature.')
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of tickets indexed in single transaction.')
+
+    def handle(self, *args, **options):
+        tickets = Ticket.objects.only('id', 'title', 'description')
+        if not options['rebuild']:
+            tickets = tickets.filter(signature__isnull=True)
+        last_id = 0
+        indexed = 0
+
+        while True:
+            batch = list(
+                tickets.filter(id__gt=last_id)
+                .order_by('id')[:options['batch_size']]
+            )
+            if not batch:
+                break
+            index_tickets(batch)
+            last_id = batch[-1].id
+            indexed += len(batch)
+            self.stdout.write(f'Indexed {indexed} tickets...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Finished, {indexed} tickets indexed.'))
@@ -0,0 +1,21 @@
+"""
+Command counting loads of staff members used for automatic assignment.
+"""
+
+from django.core.management.base import BaseCommand
+
+from ticket.assignment import rebuild_loads
+
+
+class Command(BaseCommand):
+    """Counts loads of all active staff members from their open tickets.
+
+    Has to be run after TICKET_AUTO_ASSIGN_WEIGHTS are changed, since
+    stored loads are only updated by weights of changed tickets."""
+
+    help = 'Counts loads of staff members for automatic assignment again.'
+
+    def handle(self, *args, **options):
+        rebuild_loads()
+
+        self.stdout.write(self.style.SUCCESS('Finished, workloads rebuilt.'))
@@ -0,0 +1,50 @@
+"""
+Command comparing stored ticket snapshots with live serializer output.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Ticket
+from ticket.snapshots import SNAPSHOT_BATCH_SIZE, refresh_snapshots, render_snapshot
+
+
+class Command(BaseCommand):
+    """Reports tickets whose snapshot differs from TicketSerializer output.
+
+    Missing snapshots, e.g. of tickets created before snapshots were
+    introduced, are reported as drifted too."""
+
+    help = 'Verifies stored ticket snapshots against TicketSerializer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true',
+            help='Render drifted snapshots again.')
+        parser.add_argument(
+            '--batch-size', type=int, default=SNAPSHOT_BATCH_SIZE,
+            help='Number of tickets checked at once.')
+
+    def handle(self, *args, **options):
+        drifted = []
+        checked = 0
+        for ticket in Ticket.objects.order_by('id').iterator(
+                chunk_size=options['batch_size']):
+            checked += 1
+            expected = json.loads(render_snapshot(ticket))
+            stored = json.loads(ticket.snapshot) if ticket.snapshot else None
+            if stored != expected:
+                drifted.append(ticket.id)
+                self.stdout.write(f'Ticket {ticket.id}: snapshot out of date.')
+
+        if drifted and options['fix']:
+            refresh_snapshots(drifted, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Checked {checked} tickets, fixed {len(drifted)} snapshots.'))
+        elif drifted:
+            raise CommandError(
+                f'{len(drifted)} of {checked} snapshots are out of date.')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'Checked {checked} tickets, all snapshots are up to date.'))
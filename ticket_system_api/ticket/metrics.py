@@ -0,0 +1,115 @@
+"""
+Per-assignee workload metrics computed with single aggregate query.
+"""
+
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+from core.models import ArchivedTicket, User
+
+WORKLOAD_KEY = 'ticket:workload'
+WORKLOAD_FIELDS = {'status', 'assigned_to'}
+
+
+def archived_aggregate(aggregate, default, output_field):
+    """Aggregates archived tickets of staff member in a subquery."""
+
+    return Coalesce(
+        Subquery(
+            ArchivedTicket.objects.filter(assigned_to=OuterRef('pk'))
+            .order_by().values('assigned_to')
+            .annotate(value=aggregate).values('value'),
+            output_field=output_field,
+        ),
+        Value(default, output_field=output_field),
+        output_field=output_field,
+    )
+
+
+def compute_workload():
+    """Counts tickets and averages resolution time per staff member.
+
+    Closed tickets include archived ones, which are always closed."""
+
+    resolution_time = ExpressionWrapper(
+        F('tickets__updated_at') - F('tickets__created_at'),
+        output_field=DurationField(),
+    )
+    archived_resolution_time = ExpressionWrapper(
+        F('updated_at') - F('created_at'), output_field=DurationField())
+    rows = (
+        User.objects.filter(is_staff=True)
+        .annotate(
+            tickets_open=Count(
+                'tickets', filter=Q(tickets__status='OPEN')),
+            tickets_in_progress=Count(
+                'tickets', filter=Q(tickets__status='IN_PROGRESS')),
+            tickets_closed=Count(
+                'tickets', filter=Q(tickets__status='CLOSED')),
+            resolution_time=Sum(
+                resolution_time, filter=Q(tickets__status='CLOSED'),
+                default=timedelta()),
+            archived_closed=archived_aggregate(
+                Count('id'), 0, IntegerField()),
+            archived_resolution_time=archived_aggregate(
+                Sum(archived_resolution_time), timedelta(), DurationField()),
+        )
+        .order_by('id')
+        .values('id', 'name', 'surname', 'tickets_open',
+                'tickets_in_progress', 'tickets_closed', 'resolution_time',
+                'archived_closed', 'archived_resolution_time')
+    )
+
+    workload = []
+    for row in rows:
+        row['tickets_closed'] += row.pop('archived_closed')
+        resolution_time = (
+            row.pop('resolution_time') + row.pop('archived_resolution_time'))
+        row['avg_resolution_time_mins'] = (
+            math.floor(resolution_time.total_seconds()
+                       / row['tickets_closed'] / 60)
+            if row['tickets_closed'] else None
+        )
+        workload.append(row)
+
+    return workload
+
+
+def get_workload():
+    """Gets workload metrics from cache, computing them when missing."""
+
+    workload = cache.get(WORKLOAD_KEY)
+    if workload is None:
+        workload = compute_workload()
+        cache.set(WORKLOAD_KEY, workload,
+                  settings.WORKLOAD_METRICS_CACHE_TIMEOUT)
+
+    return workload
+
+
+def delete_workload():
+    cache.delete(WORKLOAD_KEY)
+
+
+def invalidate_workload():
+    """Drops cached metrics now and after transaction commits."""
+
+    delete_workload()
+    transaction.on_commit(delete_workload)
@@ -0,0 +1,102 @@
+"""
+Pagination classes for tickets, comments and activity lists.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+from core.counting import estimate_count
+from ticket.cache import get_generation
+
+
+def count_cache_key(queryset):
+    """Builds key from SQL of queryset, which normalizes its filters.
+
+    Params are hashed separately, since SQL with params interpolated
+    doesn't quote them and different filters could share it."""
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.md5(f'{sql}\0{params!r}'.encode()).hexdigest()
+
+    return f'ticket:count:{get_generation()}:{digest}'
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator caching total count of queryset for a short time.
+
+    Counting stops after PAGINATION_EXACT_COUNT_LIMIT rows, bigger results
+    are estimated when database can do it. Cached counts are dropped
+    whenever tickets or comments change."""
+
+    count_exact = True
+
+    @cached_property
+    def count(self):
+        key = count_cache_key(self.object_list)
+        cached = cache.get(key)
+        if cached is not None:
+            count, self.count_exact = cached
+            return count
+
+        count = self.count_rows()
+        cache.set(key, (count, self.count_exact),
+                  settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+
+        return count
+
+    def count_rows(self):
+        queryset = self.object_list.order_by()
+        if queryset.query.combinator:
+            return queryset.count()
+
+        limit = settings.PAGINATION_EXACT_COUNT_LIMIT
+        count = queryset[:limit + 1].count()
+        if count <= limit:
+            return count
+
+        estimate = estimate_count(queryset)
+        if estimate is None:
+            return queryset.count()
+        self.count_exact = False
+
+        return max(estimate, count)
+
+
+class CachedCountPagination(PageNumberPagination):
+    """Page number pagination telling whether total count is exact."""
+
+    django_paginator_class = CachedCountPaginator
+
+    def get_paginated_envelope(self):
+        """Gets fields of paginated response other than results."""
+
+        return {
+            'count': self.page.paginator.count,
+            'count_exact': self.page.paginator.count_exact,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+
+    def get_paginated_response(self, data):
+        return Response({**self.get_paginated_envelope(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_exact'] = {
+            'type': 'boolean',
+            'example': True,
+        }
+
+        return response_schema
+
+
+class ActivityCursorPagination(CursorPagination):
+    """Keyset pagination of history, newest entries first."""
+
+    ordering = ('-created_at', '-id')
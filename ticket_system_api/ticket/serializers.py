@@ -2,9 +2,22 @@
 Serializers for ticket API.
 """
 
-from core.models import Ticket, Comment
+from core.models import (
+    Ticket,
+    Comment,
+    Activity,
+    ArchivedTicket,
+    ArchivedComment,
+)
+from django.conf import settings
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
-from user.serializers import UserArticleSerializer
+from ticket.similarity import find_similar_to_ticket
+from user.serializers import (
+    UserArticleField,
+    UserIdentityListSerializer,
+    UserIdentityMixin,
+)
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -18,9 +31,17 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'created_by']
 
 
-class CommentDetailedSerializer(CommentSerializer):
+class CommentWithPermissionsSerializer(CommentSerializer):
+    """Comment serializer with flag telling if user may edit comment."""
+    can_edit = serializers.BooleanField(read_only=True)
+
+
+class CommentDetailedSerializer(UserIdentityMixin, CommentSerializer):
     """Extended serializer for more details."""
-    author = UserArticleSerializer()
+    author = UserArticleField(source='author_id')
+
+    class Meta(CommentSerializer.Meta):
+        list_serializer_class = UserIdentityListSerializer
 
 
 class TicketSerializer(serializers.ModelSerializer):
@@ -28,14 +49,60 @@ class TicketSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Ticket
-        fields = '__all__'
+        # Listed explicitly, as these fields are stored in ticket snapshots,
+        # which have to be rendered again whenever the list changes.
+        fields = ['id', 'created_by', 'assigned_to', 'status',
+                  'title',
+                  'description',
+                  'created_at',
+                  'updated_at',
+                  'priority',
+                  'comment_count',
+                  'last_activity_at',
+                  'due_at',
+                  'is_overdue']
         read_only_fields = ['id', 'created_at', 'created_by']
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if settings.TICKET_AUTO_ASSIGN:
+            fields['assigned_to'].required = False
+
+        return fields
+
+
+class SimilarTicketSerializer(serializers.Serializer):
+    """Serializer for ticket similar to another one."""
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    status = serializers.ChoiceField(choices=Ticket.STATUS_CHOICES)
+    similarity = serializers.FloatField()
+
+
+class TicketCreateSerializer(TicketSerializer):
+    """Ticket serializer listing open tickets the new one may duplicate."""
+    possible_duplicates = serializers.SerializerMethodField()
+
+    class Meta(TicketSerializer.Meta):
+        fields = TicketSerializer.Meta.fields + ['possible_duplicates']
 
-class TicketDetailSerializer(serializers.ModelSerializer):
+    @extend_schema_field(SimilarTicketSerializer(many=True))
+    def get_possible_duplicates(self, ticket):
+        return find_similar_to_ticket(ticket, open_only=True)
+
+
+class TicketWithPermissionsSerializer(TicketSerializer):
+    """Ticket serializer with flag telling if user may edit ticket."""
+    can_edit = serializers.BooleanField(read_only=True)
+
+    class Meta(TicketSerializer.Meta):
+        fields = TicketSerializer.Meta.fields + ['can_edit']
+
+
+class TicketDetailSerializer(UserIdentityMixin, serializers.ModelSerializer):
     """Serializer for Ticket details endpoint."""
-    created_by = UserArticleSerializer()
-    assigned_to = UserArticleSerializer()
+    created_by = UserArticleField(source='created_by_id')
+    assigned_to = UserArticleField(source='assigned_to_id')
     comments = CommentDetailedSerializer(many=True)
 
     class Meta:
@@ -47,3 +114,137 @@ class TicketDetailSerializer(serializers.ModelSerializer):
                   'updated_at',
                   'priority',
                   'comments']
+        list_serializer_class = UserIdentityListSerializer
+
+
+def prime_comment_texts(activities):
+    """Sets current text of commented entries, None for deleted comments.
+
+    Comments of archived tickets are looked up in archive."""
+
+    activities = [activity for activity in activities
+                  if activity.kind == 'COMMENTED']
+    comment_ids = {activity.data.get('comment') for activity in activities}
+    texts = dict(Comment.objects.filter(
+        id__in=comment_ids).values_list('id', 'text'))
+    archived_ids = comment_ids.difference(texts)
+    if archived_ids:
+        texts.update(ArchivedComment.objects.filter(
+            id__in=archived_ids).values_list('id', 'text'))
+    for activity in activities:
+        activity.comment_text = texts.get(activity.data.get('comment'))
+
+
+class ActivityListSerializer(serializers.ListSerializer):
+    """List serializer reading texts of all commented entries at once."""
+
+    def to_representation(self, data):
+        items = list(data)
+        prime_comment_texts(items)
+
+        return super().to_representation(items)
+
+
+class ActivitySerializer(serializers.ModelSerializer):
+    """Serializer for entry of ticket history."""
+
+    class Meta:
+        model = Activity
+        fields = ['id', 'ticket', 'kind', 'data', 'created_at']
+        read_only_fields = fields
+        list_serializer_class = ActivityListSerializer
+
+    def to_representation(self, activity):
+        data = super().to_representation(activity)
+        if activity.kind == 'COMMENTED':
+            if not hasattr(activity, 'comment_text'):
+                prime_comment_texts([activity])
+            data['data'] = {**data['data'], 'text': activity.comment_text}
+
+        return data
+
+
+class TicketIdsField(serializers.ListField):
+    """List of unique ticket ids of at most TICKET_BATCH_MAX_SIZE items.
+
+    Duplicates are dropped and size is checked before items are parsed, as
+    max_length validator of ListField runs only after every item was
+    validated."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('child', serializers.IntegerField(min_value=1))
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            try:
+                data = list(dict.fromkeys(data))
+            except TypeError:
+                pass
+            max_size = settings.TICKET_BATCH_MAX_SIZE
+            if len(data) > max_size:
+                self.fail('max_length', max_length=max_size)
+
+        return list(dict.fromkeys(super().to_internal_value(data)))
+
+
+class TicketBatchSerializer(serializers.Serializer):
+    """Serializer for ids of tickets fetched in one request."""
+    ids = TicketIdsField(allow_empty=False)
+
+
+class ArchivedCommentSerializer(UserIdentityMixin,
+                                serializers.ModelSerializer):
+    """Serializer for comment of archived ticket."""
+    author = UserArticleField(source='author_id')
+
+    class Meta:
+        model = ArchivedComment
+        fields = ['id', 'author', 'ticket', 'created_date',
+                  'updated_date', 'text']
+        list_serializer_class = UserIdentityListSerializer
+
+
+class ArchivedTicketDetailSerializer(UserIdentityMixin,
+                                     serializers.ModelSerializer):
+    """Serializer for archived ticket details."""
+    created_by = UserArticleField(source='created_by_id')
+    assigned_to = UserArticleField(source='assigned_to_id')
+    comments = ArchivedCommentSerializer(many=True)
+
+    class Meta:
+        model = ArchivedTicket
+        fields = ['id', 'created_by', 'assigned_to', 'status',
+                  'title',
+                  'description',
+                  'created_at',
+                  'updated_at',
+                  'priority',
+                  'comments',
+                  'archived_at']
+        list_serializer_class = UserIdentityListSerializer
+
+
+class WorkloadSerializer(serializers.Serializer):
+    """Serializer for tickets workload of staff member."""
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    surname = serializers.CharField()
+    tickets_open = serializers.IntegerField()
+    tickets_in_progress = serializers.IntegerField()
+    tickets_closed = serializers.IntegerField()
+    avg_resolution_time_mins = serializers.IntegerField(allow_null=True)
+
+
+class CacheStatsSerializer(serializers.Serializer):
+    """Serializer for statistics of in-memory cache."""
+    size = serializers.IntegerField()
+    max_size = serializers.IntegerField()
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+    evictions = serializers.IntegerField()
+
+
+class CacheMetricSerializer(serializers.Serializer):
+    """Serializer for statistics of caches."""
+    ticket_detail = CacheStatsSerializer()
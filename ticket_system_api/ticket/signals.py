@@ -0,0 +1,103 @@
+"""
+Signal receivers reacting to ticket and comment changes.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.models import User, Ticket, Comment
+from core.signals import tickets_bulk_changed, users_bulk_created
+from ticket import assignment
+from ticket.cache import (
+    invalidate_responses,
+    invalidate_ticket_detail,
+    invalidate_ticket_details,
+)
+from ticket.directory import directory
+from ticket.events import hub
+from ticket.metrics import WORKLOAD_FIELDS, invalidate_workload
+from ticket.similarity import index_ticket_ids, index_tickets
+from ticket.snapshots import refresh_snapshots
+
+IGNORED_EVENT_FIELDS = {'id', 'updated_at', 'last_activity_at'}
+SIGNATURE_FIELDS = {'title', 'description'}
+
+
+def publish_on_commit(event_type, ticket_id, fields=None):
+    """Publishes ticket event once current transaction is committed."""
+
+    transaction.on_commit(
+        lambda: hub.publish(event_type, ticket_id, fields))
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, created, **kwargs):
+    refresh_snapshots([instance.id])
+    invalidate_responses()
+    invalidate_ticket_detail(instance.id)
+    fields = [name for name in instance.get_changed_fields()
+              if name not in IGNORED_EVENT_FIELDS]
+    if created or WORKLOAD_FIELDS.intersection(fields):
+        invalidate_workload()
+    if created or SIGNATURE_FIELDS.intersection(fields):
+        index_tickets([instance])
+    if created:
+        assignment.ticket_created(instance)
+        publish_on_commit('created', instance.id, fields)
+    else:
+        assignment.ticket_changed(instance)
+        if fields:
+            publish_on_commit('updated', instance.id, fields)
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    invalidate_responses()
+    invalidate_ticket_detail(instance.id)
+    invalidate_workload()
+    assignment.ticket_deleted(instance)
+    publish_on_commit('deleted', instance.id)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    # Comment count was already updated by receiver of core app.
+    if created:
+        refresh_snapshots([instance.ticket_id])
+    invalidate_responses()
+    invalidate_ticket_detail(instance.ticket_id)
+    publish_on_commit('commented', instance.ticket_id, ['comments'])
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    refresh_snapshots([instance.ticket_id])
+    invalidate_responses()
+    invalidate_ticket_detail(instance.ticket_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(users_bulk_created)
+def user_changed(sender, instance=None, users=(), **kwargs):
+    directory.invalidate()
+    transaction.on_commit(directory.invalidate)
+    invalidate_workload()
+    invalidate_responses()
+    invalidate_ticket_details()
+    user_ids = [user.id for user in users]
+    if instance is not None:
+        user_ids.append(instance.id)
+    assignment.rebuild_loads(user_ids)
+
+
+@receiver(tickets_bulk_changed)
+def tickets_bulk_changed_handler(sender, ticket_ids, **kwargs):
+    refresh_snapshots(ticket_ids)
+    # Bulk operations don't change text of existing tickets.
+    index_ticket_ids(ticket_ids, missing_only=True)
+    invalidate_responses()
+    invalidate_workload()
+    invalidate_ticket_details()
+    assignment.rebuild_loads()
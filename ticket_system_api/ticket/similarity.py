@@ -0,0 +1,238 @@
+"""
+Finding similar tickets with MinHash signatures and locality-sensitive
+hashing index.
+
+Title and description are split into shingles of SHINGLE_SIZE words, whose
+set is summarized by NUM_PERM minimal hashes. Share of equal minimal hashes
+of two signatures estimates Jaccard similarity of their shingle sets.
+Signatures are split into NUM_BANDS bands stored as buckets in database, so
+only tickets sharing a bucket with given one are compared.
+"""
+
+import hashlib
+import random
+import re
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+
+from core.models import Ticket, TicketSignature, TicketSignatureBand
+
+SHINGLE_SIZE = 2
+NUM_PERM = 64
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+# Fixed seed, stored signatures depend on these permutations.
+_generator = random.Random(20231019)
+PERMUTATIONS = [
+    (_generator.randrange(1, MERSENNE_PRIME),
+     _generator.randrange(MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+WORD_RE = re.compile(r'\w+')
+
+
+def hash64(data):
+    """Hashes bytes into signed 64-bit integer fitting BigIntegerField."""
+
+    return int.from_bytes(
+        hashlib.blake2b(data, digest_size=8).digest(), 'little', signed=True)
+
+
+def get_shingles(text):
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)}
+
+    return {
+        ' '.join(words[start:start + SHINGLE_SIZE])
+        for start in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def compute_signature(title, description):
+    """Computes MinHash signature of ticket text."""
+
+    hashes = [
+        hash64(shingle.encode()) & MERSENNE_PRIME
+        for shingle in get_shingles(f'{title}\n{description}')
+    ]
+
+    return array('Q', (
+        min((a * value + b) % MERSENNE_PRIME for value in hashes)
+        for a, b in PERMUTATIONS
+    ))
+
+
+def get_checksum(signature):
+    return hash64(signature.tobytes())
+
+
+def get_buckets(signature):
+    """Gets bucket of every band of signature."""
+
+    return [
+        hash64(struct.pack(
+            f'<H{ROWS_PER_BAND}Q', band,
+            *signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+        for band in range(NUM_BANDS)
+    ]
+
+
+def estimate_similarity(signature, other):
+    return sum(a == b for a, b in zip(signature, other)) / NUM_PERM
+
+
+class SignatureCache:
+    """Bounded LRU cache of ticket signatures in process memory.
+
+    Entries are checked against checksum read together with candidates, so
+    signatures changed by other processes are never used."""
+
+    def __init__(self, max_size):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_size = max_size
+
+    def get_many(self, checksums):
+        """Gets signatures of tickets with given checksums by ticket id."""
+
+        found = {}
+        with self._lock:
+            for ticket_id, checksum in checksums.items():
+                entry = self._entries.get(ticket_id)
+                if entry is not None and entry[0] == checksum:
+                    self._entries.move_to_end(ticket_id)
+                    found[ticket_id] = entry[1]
+
+        return found
+
+    def set(self, ticket_id, checksum, signature):
+        with self._lock:
+            self._entries[ticket_id] = (checksum, signature)
+            self._entries.move_to_end(ticket_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+signature_cache = SignatureCache(settings.TICKET_SIGNATURE_CACHE_SIZE)
+
+
+def index_tickets(tickets):
+    """Stores signatures and bands of given tickets, replacing old ones."""
+
+    signatures, bands = [], []
+    for ticket in tickets:
+        signature = compute_signature(ticket.title, ticket.description)
+        checksum = get_checksum(signature)
+        signatures.append(TicketSignature(
+            ticket_id=ticket.id, signature=signature.tobytes(),
+            checksum=checksum))
+        bands.extend(
+            TicketSignatureBand(
+                ticket_id=ticket.id, band=band, bucket=bucket,
+                checksum=checksum)
+            for band, bucket in enumerate(get_buckets(signature)))
+        signature_cache.set(ticket.id, checksum, signature)
+
+    ticket_ids = [signature.ticket_id for signature in signatures]
+    with transaction.atomic():
+        TicketSignatureBand.objects.filter(ticket_id__in=ticket_ids).delete()
+        TicketSignature.objects.filter(ticket_id__in=ticket_ids).delete()
+        TicketSignature.objects.bulk_create(signatures)
+        TicketSignatureBand.objects.bulk_create(bands)
+
+
+def index_ticket_ids(ticket_ids, missing_only=False, batch_size=500):
+    """Indexes tickets with given ids, optionally only not indexed ones."""
+
+    ticket_ids = list(ticket_ids)
+    for start in range(0, len(ticket_ids), batch_size):
+        tickets = Ticket.objects.filter(
+            id__in=ticket_ids[start:start + batch_size]
+        ).only('id', 'title', 'description')
+        if missing_only:
+            tickets = tickets.filter(signature__isnull=True)
+        index_tickets(tickets)
+
+
+def get_signatures(checksums):
+    """Gets signatures from cache, loading missing ones with one query."""
+
+    signatures = signature_cache.get_many(checksums)
+    missing = [ticket_id for ticket_id in checksums if ticket_id not in signatures]
+    if missing:
+        rows = TicketSignature.objects.filter(
+            ticket_id__in=missing).values_list('ticket_id', 'signature', 'checksum')
+        for ticket_id, data, checksum in rows:
+            signature = array('Q', bytes(data))
+            signature_cache.set(ticket_id, checksum, signature)
+            signatures[ticket_id] = signature
+
+    return signatures
+
+
+def find_similar(signature, exclude_id=None, open_only=False):
+    """Finds tickets similar to signature, the most similar first.
+
+    Returns dicts with id, title, status and estimated similarity of at most
+    TICKET_SIMILAR_LIMIT tickets at least TICKET_SIMILARITY_THRESHOLD
+    similar."""
+
+    condition = Q()
+    for band, bucket in enumerate(get_buckets(signature)):
+        condition |= Q(band=band, bucket=bucket)
+    candidates = TicketSignatureBand.objects.filter(condition)
+    if exclude_id is not None:
+        candidates = candidates.exclude(ticket_id=exclude_id)
+    if open_only:
+        candidates = candidates.exclude(ticket__status='CLOSED')
+    candidates = (
+        candidates.values('ticket_id', 'checksum')
+        .annotate(shared_bands=Count('id'))
+        .order_by('-shared_bands', '-ticket_id')
+        [:settings.TICKET_SIMILARITY_MAX_CANDIDATES]
+    )
+    checksums = {row['ticket_id']: row['checksum'] for row in candidates}
+    if not checksums:
+        return []
+
+    scores = sorted(
+        (
+            (estimate_similarity(signature, other), ticket_id)
+            for ticket_id, other in get_signatures(checksums).items()
+        ),
+        reverse=True,
+    )
+    scores = [
+        (similarity, ticket_id) for similarity, ticket_id in scores
+        if similarity >= settings.TICKET_SIMILARITY_THRESHOLD
+    ][:settings.TICKET_SIMILAR_LIMIT]
+    tickets = Ticket.objects.only('id', 'title', 'status').in_bulk(
+        [ticket_id for _, ticket_id in scores])
+
+    return [
+        {
+            'id': ticket_id,
+            'title': tickets[ticket_id].title,
+            'status': tickets[ticket_id].status,
+            'similarity': round(similarity, 2),
+        }
+        for similarity, ticket_id in scores if ticket_id in tickets
+    ]
+
+
+def find_similar_to_ticket(ticket, open_only=False):
+    signature = compute_signature(ticket.title, ticket.description)
+
+    return find_similar(signature, exclude_id=ticket.id, open_only=open_only)
@@ -0,0 +1,93 @@
+"""
+Tickets pre-rendered by TicketSerializer and responses splicing them.
+"""
+
+import json
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from core.models import Ticket
+from ticket.serializers import TicketSerializer
+
+SNAPSHOT_BATCH_SIZE = 500
+
+
+def render_snapshot(ticket):
+    """Renders ticket the same way as list endpoint would."""
+
+    return JSONRenderer().render(TicketSerializer(ticket).data).decode()
+
+
+def refresh_snapshots(ticket_ids, batch_size=SNAPSHOT_BATCH_SIZE):
+    """Renders snapshots of given tickets again from database rows."""
+
+    ticket_ids = list(ticket_ids)
+    for start in range(0, len(ticket_ids), batch_size):
+        tickets = list(Ticket.objects.filter(
+            id__in=ticket_ids[start:start + batch_size]).defer('snapshot'))
+        for ticket in tickets:
+            ticket.snapshot = render_snapshot(ticket)
+        Ticket.objects.bulk_update(tickets, ['snapshot'])
+
+
+def get_snapshots(rows):
+    """Gets snapshots from (id, snapshot) rows, rendering missing ones.
+
+    Rendered snapshots are saved, so each ticket is rendered only once.
+    Only still empty ones are written, snapshot refreshed by concurrent
+    change of the ticket is never replaced with the one rendered here."""
+
+    missing = [ticket_id for ticket_id, snapshot in rows if not snapshot]
+    rendered = {}
+    if missing:
+        tickets = list(
+            Ticket.objects.filter(id__in=missing).defer('snapshot'))
+        for ticket in tickets:
+            ticket.snapshot = rendered[ticket.id] = render_snapshot(ticket)
+        Ticket.objects.filter(snapshot='').bulk_update(
+            tickets, ['snapshot'], batch_size=SNAPSHOT_BATCH_SIZE)
+
+    return [snapshot or rendered[ticket_id] for ticket_id, snapshot in rows]
+
+
+class SnapshotResponse(Response):
+    """Response with results spliced from stored JSON snapshots.
+
+    JSON renderer writes snapshots into body as they are, `data` is decoded
+    only when it's accessed, e.g. by browsable API or tests."""
+
+    def __init__(self, snapshots, envelope=None, **kwargs):
+        super().__init__(None, **kwargs)
+        self.snapshots = snapshots
+        self.envelope = envelope
+
+    @property
+    def data(self):
+        if self._data is None and self.snapshots is not None:
+            results = [json.loads(snapshot) for snapshot in self.snapshots]
+            if self.envelope is None:
+                self._data = results
+            else:
+                self._data = {**self.envelope, 'results': results}
+
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        renderer = getattr(self, 'accepted_renderer', None)
+        if type(renderer) is not JSONRenderer or self._data is not None:
+            return super().rendered_content
+
+        self['Content-Type'] = self.content_type or renderer.media_type
+        results = '[' + ','.join(self.snapshots) + ']'
+        if self.envelope is None:
+            return results.encode()
+
+        envelope = renderer.render(self.envelope)
+
+        return envelope[:-1] + f',"results":{results}}}'.encode()
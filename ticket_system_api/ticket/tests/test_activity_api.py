@@ -0,0 +1,158 @@
+"""
+Tests for ticket activity feed.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Ticket, Comment, Activity
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from ticket.pagination import ActivityCursorPagination
+
+ACTIVITY_URL = reverse('ticket:activity')
+
+
+def ticket_activity_url(ticket_id):
+    return reverse('ticket:ticket-activity', args=[ticket_id])
+
+
+def create_user(email='user@example.com', password='pass123'):
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+class ActivityRecordingTests(TestCase):
+    """Tests for writing ticket history."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com')
+        self.ticket = create_ticket(self.user, self.user2)
+
+    def test_history_of_changes(self):
+        """Tests if creation, comments, status changes and reassignments
+        are recorded."""
+
+        Comment.objects.create(author=self.user, ticket=self.ticket, text='Hi')
+        self.ticket.status = 'IN_PROGRESS'
+        self.ticket.assigned_to = self.user
+        self.ticket.save()
+        self.ticket.title = 'Only title changed'
+        self.ticket.save()
+        activities = Activity.objects.filter(
+            ticket=self.ticket).order_by('id')
+
+        self.assertEqual(
+            [(activity.kind, activity.data) for activity in activities], [
+                ('CREATED', {'status': 'OPEN', 'assigned_to': self.user2.id}),
+                ('COMMENTED', {'comment': Comment.objects.get().id,
+                               'author': self.user.id}),
+                ('STATUS_CHANGED', {'from': 'OPEN', 'to': 'IN_PROGRESS'}),
+                ('REASSIGNED', {'from': self.user2.id, 'to': self.user.id}),
+            ])
+
+    def test_history_kept_after_ticket_deleted(self):
+        """Tests if history is append-only."""
+
+        ticket_id = self.ticket.id
+        self.ticket.delete()
+
+        self.assertTrue(Activity.objects.filter(ticket_id=ticket_id).exists())
+
+
+class ActivityApiTests(TestCase):
+    """Tests for activity endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        self.ticket = create_ticket(self.user, self.user)
+        self.other_ticket = create_ticket(self.user, self.user)
+        for minutes in range(3):
+            Comment.objects.create(
+                author=self.user, ticket=self.ticket, text=f'{minutes}',
+                created_date=timezone.now() + timedelta(minutes=minutes))
+
+    def test_ticket_activity(self):
+        """Tests if ticket history is returned newest first."""
+
+        res = self.client.get(ticket_activity_url(self.ticket.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item['kind'], item['data'].get('text'))
+             for item in res.data['results']],
+            [('COMMENTED', '2'), ('COMMENTED', '1'), ('COMMENTED', '0'),
+             ('CREATED', None)])
+
+    def test_comment_text_not_kept(self):
+        """Tests if entries show current text of edited and deleted
+        comments."""
+
+        comments = list(Comment.objects.filter(
+            ticket=self.ticket).order_by('id'))
+        comments[0].delete()
+        comment = comments[1]
+        comment.text = 'Edited'
+        comment.save()
+
+        res = self.client.get(ticket_activity_url(self.ticket.id))
+
+        self.assertEqual(
+            [item['data'].get('text') for item in res.data['results']],
+            ['2', 'Edited', None, None])
+
+    def test_ticket_activity_for_unknown_ticket(self):
+        """Tests if history of not existing ticket is not found."""
+
+        res = self.client.get(ticket_activity_url(999))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_ticket_activity_for_invalid_id(self):
+        """Tests if history of ticket with non-numeric id is not found."""
+
+        res = self.client.get(ticket_activity_url('abc'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_global_activity(self):
+        """Tests if global feed contains history of all tickets."""
+
+        res = self.client.get(ACTIVITY_URL)
+
+        self.assertEqual(
+            {item['ticket'] for item in res.data['results']},
+            {self.ticket.id, self.other_ticket.id})
+
+    @mock.patch.object(ActivityCursorPagination, 'page_size', 2)
+    def test_cursor_pagination(self):
+        """Tests if feed is paginated with cursor through all entries."""
+
+        ids = []
+        url = ACTIVITY_URL
+        while url:
+            res = self.client.get(url)
+            self.assertLessEqual(len(res.data['results']), 2)
+            ids.extend(item['id'] for item in res.data['results'])
+            url = res.data['next']
+
+        self.assertEqual(ids, list(Activity.objects.order_by(
+            '-created_at', '-id').values_list('id', flat=True)))
@@ -0,0 +1,171 @@
+"""
+Tests for automatic assignment of tickets.
+"""
+from io import StringIO
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import User, Ticket
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from ticket.assignment import assign_least_loaded, get_loads
+
+TICKET_URL = reverse('ticket:ticket-list')
+WEIGHTS = {'LOW': 1, 'MODERATE': 2, 'URGENT': 5}
+
+
+def create_user(email='user@example.com', password='pass123', **extra_fields):
+    return get_user_model().objects.create_user(email, password, **extra_fields)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+@override_settings(TICKET_AUTO_ASSIGN_WEIGHTS=WEIGHTS)
+class WorkloadTests(TestCase):
+    """Tests for stored staff workloads."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.staff1 = create_user('staff1@example.com', is_staff=True)
+        self.staff2 = create_user('staff2@example.com', is_staff=True)
+        create_user('inactive@example.com', is_staff=True, is_active=False)
+        create_ticket(self.user, self.staff1, priority='URGENT')
+        create_ticket(self.user, self.staff2, priority='MODERATE')
+        create_ticket(self.user, self.staff2, status='CLOSED', priority='URGENT')
+
+    def test_loads_weighted_by_priority(self):
+        """Tests if open tickets of active staff are weighted by priority."""
+
+        self.assertEqual(get_loads(), {self.staff1.id: 5, self.staff2.id: 2})
+
+    def test_assign_least_loaded(self):
+        """Tests if assignments go to the least loaded staff member."""
+
+        assigned = []
+        for _ in range(3):
+            with transaction.atomic():
+                assignee_id = assign_least_loaded()
+                create_ticket(self.user, User.objects.get(id=assignee_id),
+                              priority='MODERATE')
+            assigned.append(assignee_id)
+
+        self.assertEqual(assigned, [self.staff2.id, self.staff2.id, self.staff1.id])
+        self.assertEqual(get_loads(), {self.staff1.id: 7, self.staff2.id: 6})
+
+    def test_loads_follow_ticket_changes(self):
+        """Tests if creating, closing, reassigning and deleting tickets
+        updates loads."""
+
+        ticket = create_ticket(self.user, self.staff2, priority='URGENT')
+        self.assertEqual(get_loads()[self.staff2.id], 7)
+
+        ticket = Ticket.objects.get(id=ticket.id)
+        ticket.assigned_to = self.staff1
+        ticket.save()
+        self.assertEqual(get_loads(), {self.staff1.id: 10, self.staff2.id: 2})
+
+        ticket.status = 'CLOSED'
+        ticket.save()
+        self.assertEqual(get_loads()[self.staff1.id], 5)
+
+        Ticket.objects.get(priority='MODERATE').delete()
+        self.assertEqual(get_loads()[self.staff2.id], 0)
+
+    def test_rolled_back_ticket_not_counted(self):
+        """Tests if load of ticket from failed transaction is given back."""
+
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                assignee_id = assign_least_loaded()
+                create_ticket(self.user, User.objects.get(id=assignee_id))
+                raise IntegrityError
+
+        self.assertEqual(get_loads(), {self.staff1.id: 5, self.staff2.id: 2})
+
+    def test_loads_follow_user_changes(self):
+        """Tests if staff members leaving or joining change stored loads."""
+
+        self.staff1.is_active = False
+        self.staff1.save()
+        self.user.is_staff = True
+        self.user.save()
+
+        self.assertEqual(get_loads(), {self.user.id: 0, self.staff2.id: 2})
+
+    def test_rebuild_command(self):
+        """Tests if command counts loads with changed weights."""
+
+        with override_settings(TICKET_AUTO_ASSIGN_WEIGHTS={'URGENT': 3}):
+            call_command('rebuild_workloads', stdout=StringIO())
+
+        self.assertEqual(get_loads(), {self.staff1.id: 3, self.staff2.id: 1})
+
+
+@override_settings(TICKET_AUTO_ASSIGN=True)
+class AutoAssignApiTests(TestCase):
+    """Tests for creating tickets without assignee."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        self.staff1 = create_user('staff1@example.com', is_staff=True)
+        self.staff2 = create_user('staff2@example.com', is_staff=True)
+        create_ticket(self.user, self.staff1)
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.payload = {
+            'title': 'Test title',
+            'description': 'Test description',
+        }
+
+    def test_ticket_assigned_automatically(self):
+        """Tests if ticket without assignee goes to the least loaded staff."""
+
+        res = self.client.post(TICKET_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['assigned_to'], self.staff2.id)
+        self.assertEqual(get_loads(), {self.staff1.id: 1, self.staff2.id: 1})
+
+    def test_explicit_assignee_kept(self):
+        """Tests if given assignee is not replaced."""
+
+        res = self.client.post(
+            TICKET_URL, {**self.payload, 'assigned_to': self.staff1.id})
+
+        self.assertEqual(res.data['assigned_to'], self.staff1.id)
+
+    def test_no_staff_available(self):
+        """Tests if ticket can't be assigned when there is no staff."""
+
+        get_user_model().objects.filter(is_staff=True).update(is_staff=False)
+
+        res = self.client.post(TICKET_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('assigned_to', res.data)
+
+    @override_settings(TICKET_AUTO_ASSIGN=False)
+    def test_assignee_required_when_disabled(self):
+        """Tests if assignee is required without auto assignment."""
+
+        res = self.client.post(TICKET_URL, self.payload)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('assigned_to', res.data)
@@ -155,3 +155,15 @@ class PrivateCommmentApiTests(TestCase):
         res = self.client.delete(detail_url(comment.id))
 
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_listing_comments_with_can_edit(self):
+        """Tests if listed comments are flagged as editable by author."""
+
+        own_comment = create_comment(self.user, self.ticket)
+        other_comment = create_comment(self.user2, self.ticket)
+        res = self.client.get(COMMENT_URL, {'can-edit': '1'})
+        flags = {comment['id']: comment['can_edit']
+                 for comment in res.data.get('results')}
+
+        self.assertEqual(
+            flags, {own_comment.id: True, other_comment.id: False})
@@ -0,0 +1,159 @@
+"""
+Tests for cache of rendered ticket details.
+"""
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Ticket, Comment
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from ticket.cache import TicketDetailCache, ticket_detail_cache
+from ticket.serializers import TicketDetailSerializer
+
+CACHE_METRICS_URL = reverse('ticket:metrics-cache')
+
+
+def ticket_details(ticket_id):
+    return reverse('ticket:ticket-detail', args=[ticket_id])
+
+
+def create_user(email='user@example.com', password='pass123', is_superuser=False):
+    payload = {
+        'name': 'User',
+        'surname': 'Testowsky'
+    }
+    if is_superuser:
+        return get_user_model().objects.create_superuser(email, password, **payload)
+
+    return get_user_model().objects.create_user(email, password, **payload)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+class TicketDetailCacheTests(TestCase):
+    """Tests for LRU cache of ticket details."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_least_recently_used_entry_evicted(self):
+        """Tests if cache keeps at most max_size recently used entries."""
+
+        detail_cache = TicketDetailCache(max_size=2)
+        for ticket_id in (1, 2):
+            _, version = detail_cache.get(ticket_id)
+            detail_cache.set(ticket_id, version, {'id': ticket_id})
+        detail_cache.get(1)
+        _, version = detail_cache.get(3)
+        detail_cache.set(3, version, {'id': 3})
+
+        self.assertEqual(detail_cache.get(1)[0], {'id': 1})
+        self.assertIsNone(detail_cache.get(2)[0])
+        self.assertEqual(detail_cache.stats()['evictions'], 1)
+
+    def test_entry_stored_for_old_version_not_served(self):
+        """Tests if details rendered before ticket changed are ignored."""
+
+        detail_cache = TicketDetailCache(max_size=10)
+        _, version = detail_cache.get(1)
+        cache.incr('ticket:detail-version:1')
+        detail_cache.set(1, version, {'id': 1})
+
+        self.assertIsNone(detail_cache.get(1)[0])
+
+
+class TicketDetailCacheApiTests(TestCase):
+    """Tests for serving ticket details from cache."""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        ticket_detail_cache.clear()
+        self.user = create_user()
+        self.user2 = create_user(email='user2@example.com')
+        self.ticket = create_ticket(self.user, self.user2)
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_cached_details_served_without_ticket_queries(self):
+        """Tests if repeated retrieve only authenticates user in database."""
+
+        self.client.get(ticket_details(self.ticket.id))
+
+        with self.assertNumQueries(1):
+            res = self.client.get(ticket_details(self.ticket.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, TicketDetailSerializer(self.ticket).data)
+        self.assertEqual(ticket_detail_cache.stats()['hits'], 1)
+
+    def test_ticket_change_invalidates_details(self):
+        """Tests if saving ticket bumps its cached version."""
+
+        self.client.get(ticket_details(self.ticket.id))
+        self.ticket.title = 'Changed'
+        self.ticket.save()
+        res = self.client.get(ticket_details(self.ticket.id))
+
+        self.assertEqual(res.data['title'], 'Changed')
+
+    def test_comment_invalidates_details(self):
+        """Tests if adding and deleting comment bumps ticket version."""
+
+        self.client.get(ticket_details(self.ticket.id))
+        comment = Comment.objects.create(
+            author=self.user, ticket=self.ticket, text='Hi')
+        res = self.client.get(ticket_details(self.ticket.id))
+
+        self.assertEqual(len(res.data['comments']), 1)
+
+        comment.delete()
+        res = self.client.get(ticket_details(self.ticket.id))
+
+        self.assertEqual(res.data['comments'], [])
+
+    def test_user_change_invalidates_details(self):
+        """Tests if nested user data is refreshed when user changes."""
+
+        self.client.get(ticket_details(self.ticket.id))
+        self.user2.name = 'Renamed'
+        self.user2.save()
+        res = self.client.get(ticket_details(self.ticket.id))
+
+        self.assertEqual(res.data['assigned_to']['name'], 'Renamed')
+
+    def test_deleted_ticket_not_served(self):
+        """Tests if cached details of deleted ticket are not returned."""
+
+        self.client.get(ticket_details(self.ticket.id))
+        self.ticket.delete()
+        res = self.client.get(ticket_details(self.ticket.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cache_metrics_for_admin_only(self):
+        """Tests if cache counters are available to admins only."""
+
+        res = self.client.get(CACHE_METRICS_URL)
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.get(ticket_details(self.ticket.id))
+        self.client.force_authenticate(
+            create_user('admin@example.com', 'testpass123', True))
+        res = self.client.get(CACHE_METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['ticket_detail']['misses'], 1)
+        self.assertEqual(res.data['ticket_detail']['size'], 1)
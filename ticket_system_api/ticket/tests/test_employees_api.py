@@ -6,6 +6,9 @@ from rest_framework.test import APIClient
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from ticket.directory import EmployeeDirectory
 
 EMPLOYEES_URL = reverse('ticket:employees')
 
@@ -53,4 +56,73 @@ class PrivateUserApiTests(TestCase):
             is_staff=True).exclude(id=self.user.id)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), len(all_users))
+        self.assertEqual(len(res.data['results']), len(all_users))
+
+    def test_employees_paginated(self):
+        """Tests if list of employees is paginated."""
+
+        for i in range(12):
+            create_user(email=f'user{i}@example.com')
+        res = self.client.get(EMPLOYEES_URL)
+        res_next = self.client.get(EMPLOYEES_URL, {'page': 2})
+
+        self.assertEqual(res.data['count'], 12)
+        self.assertEqual(len(res.data['results']), 10)
+        self.assertEqual(len(res_next.data['results']), 2)
+
+    def test_search_employees_by_prefix(self):
+        """Tests if employees are searched by name, surname and email prefix."""
+
+        anna = create_user(email='anna@example.com')
+        anna.name = 'Anna'
+        anna.surname = 'Kowalska'
+        anna.save()
+        create_user(email='john@example.com')
+
+        for query in ('an', 'KOW', 'anna@'):
+            res = self.client.get(EMPLOYEES_URL, {'q': query})
+            ids = [employee['id'] for employee in res.data['results']]
+            self.assertEqual(ids, [anna.id])
+
+    def test_non_staff_users_excluded(self):
+        """Tests if only staff members are listed."""
+
+        user = create_user(email='user2@example.com')
+        user.is_staff = False
+        user.save()
+        res = self.client.get(EMPLOYEES_URL)
+
+        self.assertEqual(res.data['count'], 0)
+
+    def test_warm_directory_served_without_queries(self):
+        """Tests if repeated searches don't touch database."""
+
+        create_user(email='user2@example.com')
+        self.client.get(EMPLOYEES_URL, {'q': 'us'})
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(EMPLOYEES_URL, {'q': 'user2'})
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(res.data['count'], 1)
+
+    def test_directory_invalidated_on_user_change(self):
+        """Tests if changed user is visible in directory."""
+
+        user = create_user(email='user2@example.com')
+        self.client.get(EMPLOYEES_URL)
+        user.surname = 'Changed'
+        user.save()
+        res = self.client.get(EMPLOYEES_URL, {'q': 'changed'})
+
+        self.assertEqual(res.data['count'], 1)
+
+    def test_directory_of_other_process_invalidated(self):
+        """Tests if directory loaded elsewhere notices changed user."""
+
+        other_directory = EmployeeDirectory()
+        user = create_user(email='user2@example.com')
+        other_directory.search()
+        user.surname = 'Changed'
+        user.save()
+
+        self.assertEqual(len(other_directory.search('changed')), 1)
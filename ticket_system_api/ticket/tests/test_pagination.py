@@ -0,0 +1,107 @@
+"""
+Tests for pagination with cached counts.
+"""
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Ticket
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from ticket.pagination import count_cache_key
+
+TICKET_URL = reverse('ticket:ticket-list')
+
+
+def create_user(email='user@example.com', password='pass123'):
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+def count_queries(queries):
+    return [query for query in queries if 'COUNT(' in query['sql']]
+
+
+class CachedCountPaginationTests(TestCase):
+    """Tests for caching and estimating total counts."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        for _ in range(3):
+            create_ticket(self.user, self.user)
+        create_ticket(self.user, self.user, status='CLOSED')
+
+    def test_exact_count(self):
+        """Tests if small results are counted exactly."""
+
+        res = self.client.get(TICKET_URL, {'status': 'OPEN'})
+
+        self.assertEqual(res.data['count'], 3)
+        self.assertTrue(res.data['count_exact'])
+
+    def test_count_cached_per_filter_set(self):
+        """Tests if the same filters in other order reuse cached count."""
+
+        self.client.get(TICKET_URL, {'status': 'OPEN', 'priority': 'LOW'})
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                TICKET_URL, {'priority': 'LOW', 'status': 'OPEN', 'page': 1})
+
+        self.assertEqual(count_queries(queries), [])
+        self.assertEqual(res.data['count'], 3)
+
+    def test_count_cache_key_distinguishes_params(self):
+        """Tests if filters rendering to the same unquoted SQL get own keys."""
+
+        one_title = Ticket.objects.filter(title__in=['a, b'])
+        two_titles = Ticket.objects.filter(title__in=['a', 'b'])
+
+        self.assertEqual(str(one_title.query), str(two_titles.query))
+        self.assertNotEqual(count_cache_key(one_title),
+                            count_cache_key(two_titles))
+
+    def test_count_refreshed_after_change(self):
+        """Tests if cached count is dropped when tickets change."""
+
+        self.client.get(TICKET_URL)
+        create_ticket(self.user, self.user)
+        res = self.client.get(TICKET_URL)
+
+        self.assertEqual(res.data['count'], 5)
+
+    @override_settings(PAGINATION_EXACT_COUNT_LIMIT=2)
+    def test_estimated_count_above_limit(self):
+        """Tests if big unfiltered results get estimated count."""
+
+        Ticket.objects.filter(id=Ticket.objects.order_by('id')[1].id).delete()
+        res = self.client.get(TICKET_URL)
+
+        self.assertFalse(res.data['count_exact'])
+        self.assertEqual(res.data['count'], 4)
+        self.assertEqual(len(res.data['results']), 3)
+
+    @override_settings(PAGINATION_EXACT_COUNT_LIMIT=2)
+    def test_exact_count_when_estimate_unavailable(self):
+        """Tests if filtered results are counted when they can't be estimated."""
+
+        res = self.client.get(TICKET_URL, {'status': 'OPEN'})
+
+        self.assertEqual(res.data['count'], 3)
+        self.assertTrue(res.data['count_exact'])
@@ -0,0 +1,113 @@
+"""Tests for caching responses of anonymous requests."""
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Ticket, Comment
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+TICKET_URL = reverse('ticket:ticket-list')
+STATS_URL = reverse('ticket:metrics')
+
+
+def create_user(email='user@example.com', password='pass123'):
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+class AnonymousResponseCacheTests(TestCase):
+    """Tests for anonymous response cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com')
+        self.ticket = create_ticket(self.user, self.user2)
+
+    def test_repeated_request_served_without_queries(self):
+        """Tests if identical anonymous request doesn't touch database."""
+
+        res = self.client.get(TICKET_URL)
+        with CaptureQueriesContext(connection) as queries:
+            res_cached = self.client.get(TICKET_URL)
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(res_cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(res_cached.content, res.content)
+        self.assertEqual(res_cached['Content-Type'], res['Content-Type'])
+
+    def test_query_params_order_normalized(self):
+        """Tests if order of query params doesn't change cache key."""
+
+        self.client.get(TICKET_URL, {'assigned': self.user2.id, 'page': 1})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(
+                f'{TICKET_URL}?page=1&assigned={self.user2.id}')
+
+        self.assertEqual(len(queries), 0)
+
+    def test_ticket_write_invalidates_cache(self):
+        """Tests if saving a ticket makes cached responses stale."""
+
+        self.client.get(TICKET_URL)
+        create_ticket(self.user, self.user2, title='New ticket')
+        res = self.client.get(TICKET_URL)
+
+        self.assertEqual(res.data['count'], 2)
+
+    def test_comment_write_invalidates_cache(self):
+        """Tests if adding a comment makes cached responses stale."""
+
+        url = reverse('ticket:ticket-detail', args=[self.ticket.id])
+        self.client.get(url)
+        Comment.objects.create(
+            author=self.user, ticket=self.ticket, text='New comment')
+        res = self.client.get(url)
+
+        self.assertEqual(len(res.data['comments']), 1)
+
+    def test_user_change_invalidates_cache(self):
+        """Tests if renamed user is shown in cached ticket details."""
+
+        url = reverse('ticket:ticket-detail', args=[self.ticket.id])
+        self.client.get(url)
+        self.user2.surname = 'Renamed'
+        self.user2.save()
+        res = self.client.get(url)
+
+        self.assertIn('Renamed', res.content.decode())
+
+    def test_metrics_cached(self):
+        """Tests if metrics for anonymous users are cached."""
+
+        self.client.get(STATS_URL)
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(STATS_URL)
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_authenticated_requests_not_cached(self):
+        """Tests if requests with credentials always reach the view."""
+
+        self.client.get(TICKET_URL)
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+        res = self.client.get(TICKET_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,186 @@
+"""
+Tests for finding similar tickets.
+"""
+from io import StringIO
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Ticket, TicketSignature, TicketSignatureBand
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from ticket.similarity import (
+    compute_signature,
+    estimate_similarity,
+    find_similar,
+    signature_cache,
+)
+
+TICKET_URL = reverse('ticket:ticket-list')
+OUTAGE = ('VPN connection drops every few minutes',
+          'Since this morning the VPN connection drops every few minutes '
+          'and I have to log in again to reach internal services.')
+OUTAGE_DUPLICATE = ('VPN connection drops every few minutes',
+                    'Since this morning the VPN connection drops every few '
+                    'minutes and I have to log in again to reach services.')
+UNRELATED = ('Printer on second floor is out of toner',
+             'Please order new toner cartridges for the printer.')
+
+
+def similar_url(ticket_id):
+    return reverse('ticket:ticket-similar', args=[ticket_id])
+
+
+def create_user(email='user@example.com', password='pass123'):
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_ticket(created_by, assigned_to, text, **extra_fields):
+    title, description = text
+    return Ticket.objects.create(
+        created_by=created_by, assigned_to=assigned_to, title=title,
+        description=description, **extra_fields)
+
+
+class SignatureTests(TestCase):
+    """Tests for MinHash signatures."""
+
+    def test_similarity_estimate(self):
+        """Tests if near duplicates are estimated as similar."""
+
+        outage = compute_signature(*OUTAGE)
+
+        self.assertEqual(estimate_similarity(outage, compute_signature(*OUTAGE)), 1)
+        self.assertGreater(
+            estimate_similarity(outage, compute_signature(*OUTAGE_DUPLICATE)), 0.7)
+        self.assertLess(
+            estimate_similarity(outage, compute_signature(*UNRELATED)), 0.2)
+
+    def test_ticket_indexed_on_save(self):
+        """Tests if signature and bands follow changes of ticket text."""
+
+        user = create_user()
+        ticket = create_ticket(user, user, OUTAGE)
+        checksum = TicketSignature.objects.get(ticket=ticket).checksum
+
+        ticket.description = UNRELATED[1]
+        ticket.save()
+
+        self.assertNotEqual(
+            TicketSignature.objects.get(ticket=ticket).checksum, checksum)
+        self.assertEqual(
+            TicketSignatureBand.objects.filter(ticket=ticket).count(), 16)
+
+
+class FindSimilarTests(TestCase):
+    """Tests for looking up similar tickets."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.outage = create_ticket(self.user, self.user, OUTAGE)
+        self.closed = create_ticket(
+            self.user, self.user, OUTAGE_DUPLICATE, status='CLOSED')
+        self.unrelated = create_ticket(self.user, self.user, UNRELATED)
+
+    def test_find_similar(self):
+        """Tests if only similar tickets are found, the most similar first."""
+
+        results = find_similar(compute_signature(*OUTAGE))
+
+        self.assertEqual([result['id'] for result in results],
+                         [self.outage.id, self.closed.id])
+        self.assertEqual(results[0]['similarity'], 1)
+
+    def test_open_only(self):
+        """Tests if closed tickets can be left out."""
+
+        results = find_similar(compute_signature(*OUTAGE_DUPLICATE),
+                               open_only=True)
+
+        self.assertEqual([result['id'] for result in results], [self.outage.id])
+
+    def test_lookup_uses_cached_signatures(self):
+        """Tests if cached signatures are not read from database again."""
+
+        signature = compute_signature(*OUTAGE)
+        signature_cache.clear()
+        find_similar(signature)
+
+        with self.assertNumQueries(2):
+            find_similar(signature)
+
+
+class SimilarApiTests(TestCase):
+    """Tests for similar tickets endpoints."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.outage = create_ticket(self.user, self.user, OUTAGE)
+        self.unrelated = create_ticket(self.user, self.user, UNRELATED)
+
+    def test_possible_duplicates_of_created_ticket(self):
+        """Tests if response of created ticket lists possible duplicates."""
+
+        title, description = OUTAGE_DUPLICATE
+        res = self.client.post(TICKET_URL, {
+            'title': title, 'description': description,
+            'assigned_to': self.user.id,
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [item['id'] for item in res.data['possible_duplicates']],
+            [self.outage.id])
+
+    def test_similar_tickets(self):
+        """Tests if similar tickets of given ticket are listed."""
+
+        duplicate = create_ticket(self.user, self.user, OUTAGE_DUPLICATE)
+
+        res = self.client.get(similar_url(self.outage.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data], [duplicate.id])
+        self.assertEqual(set(res.data[0]),
+                         {'id', 'title', 'status', 'similarity'})
+
+    def test_similar_of_unknown_ticket(self):
+        """Tests if similar tickets of not existing ticket are not found."""
+
+        res = self.client.get(similar_url(999))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_similar_of_invalid_id(self):
+        """Tests if similar tickets of non-numeric id are not found."""
+
+        res = self.client.get(similar_url('abc'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BuildSimilarityIndexCommandTests(TestCase):
+    """Tests for build_similarity_index command."""
+
+    def test_missing_signatures_indexed(self):
+        """Tests if tickets without signature are indexed."""
+
+        user = create_user()
+        tickets = [create_ticket(user, user, OUTAGE) for _ in range(3)]
+        TicketSignature.objects.filter(ticket=tickets[0]).delete()
+        TicketSignatureBand.objects.filter(ticket=tickets[0]).delete()
+
+        out = StringIO()
+        call_command('build_similarity_index', '--batch-size', '2', stdout=out)
+
+        self.assertTrue(TicketSignature.objects.filter(ticket=tickets[0]).exists())
+        self.assertIn('1 tickets indexed', out.getvalue())
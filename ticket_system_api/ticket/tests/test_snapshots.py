@@ -0,0 +1,158 @@
+"""
+Tests for stored ticket snapshots.
+"""
+import json
+from io import StringIO
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Ticket, Comment
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from ticket.serializers import TicketSerializer
+
+TICKET_URL = reverse('ticket:ticket-list')
+
+
+def create_user(email='user@example.com', password='pass123'):
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+def live_data(ticket_id):
+    return json.loads(json.dumps(
+        TicketSerializer(Ticket.objects.get(id=ticket_id)).data))
+
+
+def stored_data(ticket_id):
+    return json.loads(Ticket.objects.get(id=ticket_id).snapshot)
+
+
+class SnapshotTests(TestCase):
+    """Tests for keeping snapshots up to date."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.ticket = create_ticket(self.user, self.user)
+
+    def test_snapshot_rendered_on_save(self):
+        """Tests if snapshot is rendered for new and updated tickets."""
+
+        self.assertEqual(stored_data(self.ticket.id), live_data(self.ticket.id))
+
+        self.ticket.title = 'New title'
+        self.ticket.save()
+
+        self.assertEqual(stored_data(self.ticket.id)['title'], 'New title')
+        self.assertEqual(stored_data(self.ticket.id), live_data(self.ticket.id))
+
+    def test_snapshot_follows_comment_count(self):
+        """Tests if adding and removing comments renders snapshot again."""
+
+        comment = Comment.objects.create(
+            author=self.user, ticket=self.ticket, text='Hi')
+        self.assertEqual(stored_data(self.ticket.id)['comment_count'], 1)
+
+        comment.delete()
+        self.assertEqual(stored_data(self.ticket.id)['comment_count'], 0)
+
+    def test_snapshot_not_serialized(self):
+        """Tests if snapshot itself is not part of serialized ticket."""
+
+        self.assertNotIn('snapshot', stored_data(self.ticket.id))
+
+
+class SnapshotListApiTests(TestCase):
+    """Tests for listing tickets from snapshots."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        self.tickets = [create_ticket(self.user, self.user) for _ in range(3)]
+
+    def test_list_spliced_from_snapshots(self):
+        """Tests if listed tickets equal live serializer output."""
+
+        res = self.client.get(TICKET_URL)
+        body = json.loads(res.content)
+
+        self.assertEqual(body['count'], 3)
+        self.assertEqual(
+            body['results'],
+            [live_data(ticket.id) for ticket in reversed(self.tickets)])
+        self.assertEqual(res.data, body)
+
+    def test_missing_snapshot_rendered(self):
+        """Tests if tickets without snapshot are rendered when listed."""
+
+        Ticket.objects.filter(id=self.tickets[0].id).update(snapshot='')
+
+        res = self.client.get(TICKET_URL)
+
+        self.assertEqual(json.loads(res.content)['results'][-1],
+                         live_data(self.tickets[0].id))
+        self.assertEqual(
+            json.loads(Ticket.objects.get(id=self.tickets[0].id).snapshot),
+            live_data(self.tickets[0].id))
+
+    def test_can_edit_list_serialized(self):
+        """Tests if lists with can_edit flags are still serialized."""
+
+        res = self.client.get(TICKET_URL, {'can-edit': 'true'})
+
+        self.assertTrue(all(item['can_edit'] for item in res.data['results']))
+
+
+class VerifySnapshotsCommandTests(TestCase):
+    """Tests for verify_snapshots command."""
+
+    def setUp(self):
+        user = create_user()
+        self.ticket = create_ticket(user, user)
+        self.other_ticket = create_ticket(user, user)
+
+    def test_up_to_date_snapshots(self):
+        """Tests if command passes when snapshots match serializer."""
+
+        out = StringIO()
+        call_command('verify_snapshots', stdout=out)
+
+        self.assertIn('all snapshots are up to date', out.getvalue())
+
+    def test_drift_reported(self):
+        """Tests if drifted snapshots make command fail."""
+
+        Ticket.objects.filter(id=self.ticket.id).update(title='Changed')
+
+        with self.assertRaises(CommandError):
+            call_command('verify_snapshots', stdout=StringIO())
+
+    def test_drift_fixed(self):
+        """Tests if drifted and missing snapshots are rendered again."""
+
+        Ticket.objects.filter(id=self.ticket.id).update(title='Changed')
+        Ticket.objects.filter(id=self.other_ticket.id).update(snapshot='')
+
+        call_command('verify_snapshots', '--fix', stdout=StringIO())
+
+        self.assertEqual(stored_data(self.ticket.id)['title'], 'Changed')
+        self.assertEqual(
+            stored_data(self.other_ticket.id), live_data(self.other_ticket.id))
@@ -1,15 +1,40 @@
 """
 Tests for stats API.
 """
+from datetime import timedelta
+
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
+from core.models import ArchivedTicket, ArchiveStats, Ticket
 from ticket.serializers import TicketSerializer, TicketDetailSerializer
 
 STATS_URL = reverse('ticket:metrics')
+WORKLOAD_URL = reverse('ticket:metrics-workload')
+
+
+def create_user(email='user@example.com', password='pass123', **extra_fields):
+    payload = {
+        'name': 'User',
+        'surname': 'Testowsky',
+        'is_staff': True
+    }
+    payload.update(**extra_fields)
+    return get_user_model().objects.create_user(email, password, **payload)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
 
 
 class PublicStatsApiTests(TestCase):
@@ -17,6 +42,7 @@ class PublicStatsApiTests(TestCase):
 
     def setUp(self):
         self.client = APIClient()
+        cache.clear()
 
     def test_retrieving_stats(self):
         """Tests if retrieving stats is successful."""
@@ -24,3 +50,126 @@ class PublicStatsApiTests(TestCase):
         res = self.client.get(STATS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_stats_include_archived_tickets(self):
+        """Tests if archived tickets are counted in totals."""
+
+        ArchiveStats.objects.create(
+            pk=1, tickets_closed=2, total_closing_seconds=2 * 3600)
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.data['total_tickets'], 2)
+        self.assertEqual(res.data['tickets_closed'], 2)
+        self.assertEqual(res.data['avg_closing_time_mins'], 60)
+
+
+class WorkloadApiTests(TestCase):
+    """Tests for per-assignee workload metrics."""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com', name='Second')
+        self.client.force_authenticate(self.user)
+
+    def get_workload(self, user):
+        res = self.client.get(WORKLOAD_URL)
+        return next(row for row in res.data if row['id'] == user.id)
+
+    def test_workload_requires_authentication(self):
+        """Tests if anonymous users can't retrieve workload."""
+
+        res = APIClient().get(WORKLOAD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_retrieving_workload(self):
+        """Tests if tickets are counted per assignee in single query."""
+
+        create_ticket(self.user, self.user2)
+        create_ticket(self.user, self.user2, status='IN_PROGRESS')
+        closed = create_ticket(self.user, self.user2, status='CLOSED')
+        Ticket.objects.filter(id=closed.id).update(
+            updated_at=closed.created_at + timedelta(minutes=90))
+        create_user('client@example.com', is_staff=False)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(WORKLOAD_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(res.data[1], {
+            'id': self.user2.id,
+            'name': 'Second',
+            'surname': 'Testowsky',
+            'tickets_open': 1,
+            'tickets_in_progress': 1,
+            'tickets_closed': 1,
+            'avg_resolution_time_mins': 90,
+        })
+        self.assertIsNone(res.data[0]['avg_resolution_time_mins'])
+
+    def test_workload_cached(self):
+        """Tests if workload is served from cache on next requests."""
+
+        self.client.get(WORKLOAD_URL)
+
+        with self.assertNumQueries(0):
+            self.client.get(WORKLOAD_URL)
+
+    def test_workload_invalidated_on_status_change(self):
+        """Tests if changing ticket status refreshes workload."""
+
+        ticket = create_ticket(self.user, self.user2)
+        self.assertEqual(self.get_workload(self.user2)['tickets_open'], 1)
+
+        ticket.status = 'IN_PROGRESS'
+        ticket.save()
+        row = self.get_workload(self.user2)
+
+        self.assertEqual(row['tickets_open'], 0)
+        self.assertEqual(row['tickets_in_progress'], 1)
+
+    def test_workload_invalidated_on_reassignment(self):
+        """Tests if assigning ticket to other user refreshes workload."""
+
+        ticket = create_ticket(self.user, self.user2)
+        self.get_workload(self.user2)
+
+        ticket.assigned_to = self.user
+        ticket.save()
+
+        self.assertEqual(self.get_workload(self.user2)['tickets_open'], 0)
+        self.assertEqual(self.get_workload(self.user)['tickets_open'], 1)
+
+    def test_workload_kept_on_other_changes(self):
+        """Tests if editing ticket title doesn't drop cached workload."""
+
+        ticket = create_ticket(self.user, self.user2)
+        self.client.get(WORKLOAD_URL)
+
+        ticket.title = 'New title'
+        ticket.save()
+
+        with self.assertNumQueries(0):
+            self.client.get(WORKLOAD_URL)
+
+    def test_archived_tickets_counted(self):
+        """Tests if archived tickets are counted as closed and resolved."""
+
+        closed = create_ticket(self.user, self.user2, status='CLOSED')
+        Ticket.objects.filter(id=closed.id).update(
+            updated_at=closed.created_at + timedelta(minutes=30))
+        ArchivedTicket.objects.create(
+            id=closed.id + 1, created_by=self.user, assigned_to=self.user2,
+            title='Archived', description='Archived ticket',
+            created_at=closed.created_at,
+            updated_at=closed.created_at + timedelta(minutes=90))
+
+        with self.assertNumQueries(1):
+            row = self.get_workload(self.user2)
+
+        self.assertEqual(row['tickets_closed'], 2)
+        self.assertEqual(row['avg_resolution_time_mins'], 60)
+        self.assertEqual(self.get_workload(self.user)['tickets_closed'], 0)
@@ -0,0 +1,137 @@
+"""Tests for ticket events stream."""
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.test import TestCase, AsyncClient
+
+from core.models import Ticket, Comment
+from ticket.events import TicketEventHub, hub
+
+STREAM_URL = reverse('ticket:ticket-stream')
+
+
+def create_user(email='user@example.com', password='pass123'):
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+class TicketEventHubTests(TestCase):
+    """Tests for publish/subscribe hub."""
+
+    async def test_subscriber_receives_published_event(self):
+        """Tests if published event is delivered to subscriber."""
+
+        event_hub = TicketEventHub(buffer_size=10)
+        subscription = event_hub.subscribe()
+        event_hub.publish('created', 1, ['title'])
+        event = await subscription.get(timeout=1)
+
+        self.assertEqual(event.type, 'created')
+        self.assertEqual(event.ticket, 1)
+        self.assertEqual(event.fields, ['title'])
+
+    async def test_resume_from_last_event_id(self):
+        """Tests if events after Last-Event-ID are replayed from buffer."""
+
+        event_hub = TicketEventHub(buffer_size=10)
+        first = event_hub.publish('created', 1)
+        second = event_hub.publish('updated', 1, ['status'])
+        subscription = event_hub.subscribe(last_event_id=first.id)
+        event = await subscription.get(timeout=1)
+
+        self.assertEqual(event, second)
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+    async def test_ring_buffer_is_bounded(self):
+        """Tests if only the newest events are kept for resuming."""
+
+        event_hub = TicketEventHub(buffer_size=2)
+        for ticket_id in range(5):
+            event_hub.publish('created', ticket_id)
+        subscription = event_hub.subscribe(last_event_id=0)
+
+        self.assertEqual((await subscription.get(timeout=1)).ticket, 3)
+        self.assertEqual((await subscription.get(timeout=1)).ticket, 4)
+
+    def test_format_as_server_sent_event(self):
+        """Tests if event is formatted according to SSE protocol."""
+
+        event = TicketEventHub(buffer_size=1).publish(
+            'updated', 7, ['status'])
+
+        self.assertEqual(
+            event.to_sse(),
+            f'id: {event.id}\nevent: updated\n'
+            'data: {"ticket": 7, "fields": ["status"]}\n\n'
+        )
+
+
+class TicketEventSignalsTests(TestCase):
+    """Tests for publishing events on model changes."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com')
+
+    def test_ticket_created_and_updated_events(self):
+        """Tests if saving a ticket publishes created and updated events."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = create_ticket(self.user, self.user2)
+        created = hub._buffer[-1]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.status = 'CLOSED'
+            ticket.save()
+        updated = hub._buffer[-1]
+
+        self.assertEqual((created.type, created.ticket),
+                         ('created', ticket.id))
+        self.assertEqual((updated.type, updated.ticket, updated.fields),
+                         ('updated', ticket.id, ['status']))
+
+    def test_comment_event(self):
+        """Tests if adding a comment publishes commented event."""
+
+        ticket = create_ticket(self.user, self.user2)
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(author=self.user, ticket=ticket, text='Hi')
+        event = hub._buffer[-1]
+
+        self.assertEqual((event.type, event.ticket),
+                         ('commented', ticket.id))
+
+    def test_event_not_published_before_commit(self):
+        """Tests if uncommitted changes are not streamed."""
+
+        last_event = hub._buffer[-1] if hub._buffer else None
+        create_ticket(self.user, self.user2)
+        current_event = hub._buffer[-1] if hub._buffer else None
+
+        self.assertEqual(last_event, current_event)
+
+
+class TicketStreamApiTests(TestCase):
+    """Tests for stream endpoint."""
+
+    async def test_stream_replays_events_after_last_event_id(self):
+        """Tests if stream resumes from Last-Event-ID header."""
+
+        first = hub.publish('created', 1)
+        second = hub.publish('updated', 1, ['priority'])
+        res = await AsyncClient().get(
+            STREAM_URL, headers={'Last-Event-ID': str(first.id)})
+        chunk = await anext(res.streaming_content)
+        await res.streaming_content.aclose()
+
+        self.assertEqual(res['Content-Type'], 'text/event-stream')
+        self.assertEqual(chunk.decode(), second.to_sse())
@@ -2,18 +2,23 @@
 Tests for tickets api.
 """
 from datetime import datetime
+from unittest import mock
 
 from rest_framework import status
+from rest_framework.fields import IntegerField
 from rest_framework.test import APIClient
 
-from core.models import Ticket
+from core.models import Ticket, Comment, ArchivedTicket
 
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
 from ticket.serializers import TicketSerializer, TicketDetailSerializer
 
 TICKET_URL = reverse('ticket:ticket-list')
+BATCH_GET_URL = reverse('ticket:ticket-batch-get')
 
 
 def ticket_details(ticket_url):
@@ -46,6 +51,7 @@ class PublicTicketApiTests(TestCase):
 
     def setUp(self):
         self.client = APIClient()
+        cache.clear()
 
     def test_retrieving_ticket_list(self):
         """Tests if retrieving list of all tickets is successful."""
@@ -194,6 +200,40 @@ class PublicTicketApiTests(TestCase):
 
         self.assertEqual(res.data.get('results'), serializer.data)
 
+    def test_order_by_comment_count_desc(self):
+        """Tests if tickets are ordered by number of comments descending."""
+
+        user = create_user()
+        user2 = create_user(email='user2@example.com')
+
+        ticket1 = create_ticket(user, user2)
+        ticket2 = create_ticket(user, user2)
+        ticket3 = create_ticket(user, user2)
+        for ticket, comments in ((ticket1, 1), (ticket2, 3), (ticket3, 2)):
+            for _ in range(comments):
+                Comment.objects.create(author=user, ticket=ticket, text='Hi')
+
+        res = self.client.get(f'{TICKET_URL}?order-by=comment_count-desc')
+        ids = [ticket['id'] for ticket in res.data.get('results')]
+
+        self.assertEqual(ids, [ticket2.id, ticket3.id, ticket1.id])
+        self.assertEqual(res.data.get('results')[0]['comment_count'], 3)
+
+    def test_order_by_last_activity_at_desc(self):
+        """Tests if tickets are ordered by last activity descending."""
+
+        user = create_user()
+        user2 = create_user(email='user2@example.com')
+
+        ticket1 = create_ticket(user, user2)
+        ticket2 = create_ticket(user, user2)
+        Comment.objects.create(author=user, ticket=ticket1, text='Hi')
+
+        res = self.client.get(f'{TICKET_URL}?order-by=last_activity_at-desc')
+        ids = [ticket['id'] for ticket in res.data.get('results')]
+
+        self.assertEqual(ids, [ticket1.id, ticket2.id])
+
 
 class PrivateTicketApiTests(TestCase):
     """Tests for requests from authorized users."""
@@ -354,3 +394,205 @@ class PrivateTicketApiTests(TestCase):
 
         for k, v in payload.items():
             self.assertEqual(res.data.get(k), v)
+
+
+class ArchivedTicketApiTests(TestCase):
+    """Tests for reading archived tickets."""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        self.user = create_user()
+        self.user2 = create_user(email='user2@example.com')
+        self.live_ticket = create_ticket(self.user, self.user2)
+        self.archived_ticket = ArchivedTicket.objects.create(
+            id=self.live_ticket.id + 1000,
+            created_by=self.user,
+            assigned_to=self.user2,
+            status='CLOSED',
+            title='Archived ticket',
+            description='Closed long time ago',
+            created_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+
+    def test_archived_tickets_hidden_by_default(self):
+        """Tests if list contains only live tickets by default."""
+
+        res = self.client.get(TICKET_URL)
+        ids = [ticket['id'] for ticket in res.data.get('results')]
+
+        self.assertEqual(ids, [self.live_ticket.id])
+
+    def test_listing_with_archived_tickets(self):
+        """Tests if archived tickets are listed when requested."""
+
+        res = self.client.get(TICKET_URL, {'include-archived': '1'})
+        ids = [ticket['id'] for ticket in res.data.get('results')]
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data.get('count'), 2)
+        self.assertEqual(ids, [self.archived_ticket.id, self.live_ticket.id])
+
+    def test_filtering_with_archived_tickets(self):
+        """Tests if query params filter archived tickets too."""
+
+        res = self.client.get(
+            TICKET_URL, {'include-archived': '1', 'ticket-title': 'archived'})
+        ids = [ticket['id'] for ticket in res.data.get('results')]
+
+        self.assertEqual(ids, [self.archived_ticket.id])
+
+    def test_retrieving_archived_ticket(self):
+        """Tests if archived ticket details are returned only when requested."""
+
+        url = ticket_details(self.archived_ticket.id)
+        res = self.client.get(url)
+        res_archived = self.client.get(url, {'include-archived': '1'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(res_archived.status_code, status.HTTP_200_OK)
+        self.assertEqual(res_archived.data['title'], 'Archived ticket')
+
+    def test_retrieving_archived_ticket_with_invalid_id(self):
+        """Tests if ticket with non-numeric id is not found in archive."""
+
+        res = self.client.get(ticket_details('abc'), {'include-archived': '1'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_archived_tickets_not_editable(self):
+        """Tests if archived tickets are flagged as not editable."""
+
+        self.client.force_authenticate(self.user)
+        res = self.client.get(
+            TICKET_URL, {'include-archived': '1', 'can-edit': '1'})
+        flags = {ticket['id']: ticket['can_edit']
+                 for ticket in res.data.get('results')}
+
+        self.assertEqual(flags, {
+            self.live_ticket.id: True, self.archived_ticket.id: False})
+
+
+class TicketCanEditApiTests(TestCase):
+    """Tests for can_edit flags in ticket list."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user()
+        self.user2 = create_user(email='user2@example.com')
+        self.own_ticket = create_ticket(self.user, self.user2)
+        self.other_ticket = create_ticket(self.user2, self.user)
+
+    def get_flags(self):
+        res = self.client.get(TICKET_URL, {'can-edit': '1'})
+        return {ticket['id']: ticket['can_edit']
+                for ticket in res.data.get('results')}
+
+    def test_can_edit_flags_for_owner(self):
+        """Tests if only own tickets are editable for regular user."""
+
+        self.client.force_authenticate(self.user)
+
+        self.assertEqual(self.get_flags(), {
+            self.own_ticket.id: True, self.other_ticket.id: False})
+
+    def test_can_edit_flags_for_superuser(self):
+        """Tests if all tickets are editable for superuser."""
+
+        self.client.force_authenticate(
+            create_user('admin@example.com', 'testpass123', True))
+
+        self.assertEqual(set(self.get_flags().values()), {True})
+
+    def test_can_edit_flags_for_anonymous_user(self):
+        """Tests if no tickets are editable for anonymous user."""
+
+        self.assertEqual(set(self.get_flags().values()), {False})
+
+    def test_can_edit_not_returned_by_default(self):
+        """Tests if flag is added only when requested."""
+
+        res = self.client.get(TICKET_URL)
+
+        self.assertNotIn('can_edit', res.data.get('results')[0])
+
+
+class TicketBatchGetApiTests(TestCase):
+    """Tests for fetching many tickets in one request."""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        self.user = create_user()
+        self.user2 = create_user(email='user2@example.com')
+        self.tickets = [create_ticket(self.user, self.user2) for _ in range(3)]
+        for ticket in self.tickets:
+            Comment.objects.create(author=self.user, ticket=ticket, text='Hi')
+
+    def test_batch_get_with_query_param(self):
+        """Tests if tickets are returned in requested order with details."""
+
+        ticket1, ticket2, ticket3 = self.tickets
+        ids = f'{ticket3.id},{ticket1.id},{ticket3.id}'
+
+        with self.assertNumQueries(2):
+            res = self.client.get(BATCH_GET_URL, {'ids': ids})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], TicketDetailSerializer(
+            [ticket3, ticket1], many=True).data)
+        self.assertEqual(res.data['missing'], [])
+
+    def test_batch_get_with_body(self):
+        """Tests if ids can be sent in POST body, missing ids are reported."""
+
+        self.client.force_authenticate(self.user)
+        res = self.client.post(
+            BATCH_GET_URL, {'ids': [self.tickets[0].id, 999]}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data['results']],
+                         [self.tickets[0].id])
+        self.assertEqual(res.data['missing'], [999])
+
+    @override_settings(TICKET_BATCH_MAX_SIZE=2)
+    def test_batch_size_limited(self):
+        """Tests if requesting too many tickets is rejected."""
+
+        ids = ','.join(str(ticket.id) for ticket in self.tickets)
+        res = self.client.get(BATCH_GET_URL, {'ids': ids})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TICKET_BATCH_MAX_SIZE=2)
+    def test_batch_size_counts_unique_ids(self):
+        """Tests if repeated ids don't count towards the limit."""
+
+        ticket_id = self.tickets[0].id
+        res = self.client.get(
+            BATCH_GET_URL, {'ids': f'{ticket_id},{ticket_id},{ticket_id}'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data['results']],
+                         [ticket_id])
+
+    @override_settings(TICKET_BATCH_MAX_SIZE=2)
+    @mock.patch.object(IntegerField, 'run_validation')
+    def test_oversized_batch_rejected_before_parsing(self, run_validation):
+        """Tests if ids of too large batch aren't validated one by one."""
+
+        res = self.client.post(
+            BATCH_GET_URL, {'ids': list(range(1, 1000))}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        run_validation.assert_not_called()
+
+    def test_invalid_ids_rejected(self):
+        """Tests if missing or malformed ids are rejected."""
+
+        for ids in ('', '1,a'):
+            res = self.client.get(BATCH_GET_URL, {'ids': ids})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,178 @@
+"""
+Tests for filtering tickets and comments lists.
+"""
+from datetime import datetime, timedelta
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Ticket, Comment
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+TICKET_URL = reverse('ticket:ticket-list')
+COMMENT_URL = reverse('ticket:comment-list')
+
+
+def create_user(email='user@example.com', password='pass123'):
+    return get_user_model().objects.create_user(email, password)
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+def result_ids(res):
+    return [item['id'] for item in res.data['results']]
+
+
+class TicketFilterTests(TestCase):
+    """Tests for tickets list filters."""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com')
+        self.ticket1 = create_ticket(
+            self.user, self.user2, status='OPEN', priority='LOW')
+        self.ticket2 = create_ticket(
+            self.user2, self.user, status='IN_PROGRESS', priority='URGENT')
+        self.ticket3 = create_ticket(
+            self.user, self.user, status='CLOSED', priority='LOW')
+
+    def test_filter_by_multiple_statuses(self):
+        """Tests if comma separated statuses are matched with any of them."""
+
+        res = self.client.get(TICKET_URL, {'status': 'OPEN,IN_PROGRESS'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(result_ids(res), [self.ticket2.id, self.ticket1.id])
+
+    def test_filter_by_priority_and_creator(self):
+        """Tests if filters are combined."""
+
+        res = self.client.get(
+            TICKET_URL, {'priority': 'LOW', 'creator': self.user.id})
+
+        self.assertEqual(result_ids(res), [self.ticket3.id, self.ticket1.id])
+
+    def test_filter_by_created_at_range(self):
+        """Tests if tickets are filtered by creation date range."""
+
+        created_at = timezone.make_aware(datetime(2023, 5, 10, 12, 0))
+        Ticket.objects.filter(id=self.ticket1.id).update(created_at=created_at)
+        res = self.client.get(TICKET_URL, {
+            'created-after': '2023-05-10',
+            'created-before': '2023-05-11T00:00:00',
+        })
+
+        self.assertEqual(result_ids(res), [self.ticket1.id])
+
+    def test_filter_by_min_comments(self):
+        """Tests if tickets are filtered by number of comments."""
+
+        Comment.objects.create(author=self.user, ticket=self.ticket2, text='Hi')
+        res = self.client.get(TICKET_URL, {'min-comments': 1})
+
+        self.assertEqual(result_ids(res), [self.ticket2.id])
+
+    def test_filter_overdue(self):
+        """Tests if not closed tickets past due date are overdue."""
+
+        past = timezone.now() - timedelta(hours=1)
+        Ticket.objects.filter(
+            id__in=[self.ticket2.id, self.ticket3.id]).update(due_at=past)
+
+        overdue = self.client.get(TICKET_URL, {'overdue': '1'})
+        not_overdue = self.client.get(TICKET_URL, {'overdue': 'false'})
+        invalid = self.client.get(TICKET_URL, {'overdue': 'maybe'})
+
+        self.assertEqual(result_ids(overdue), [self.ticket2.id])
+        self.assertEqual(result_ids(not_overdue),
+                         [self.ticket3.id, self.ticket1.id])
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_filters_rejected(self):
+        """Tests if all invalid filter values are reported at once."""
+
+        res = self.client.get(TICKET_URL, {
+            'status': 'OPEN,DONE',
+            'assigned': 'me',
+            'created-after': 'yesterday',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(res.data),
+                         {'status', 'assigned', 'created-after'})
+
+    def test_out_of_range_number_rejected(self):
+        """Tests if numbers not fitting into database column are rejected."""
+
+        res = self.client.get(TICKET_URL, {
+            'ticket-id': str(2 ** 63),
+            'min-comments': str(-2 ** 63 - 1),
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(res.data), {'ticket-id', 'min-comments'})
+
+    def test_invalid_ordering_rejected(self):
+        """Tests if ordering by field outside whitelist is rejected."""
+
+        for order_by in ('description-asc', 'priority', 'priority-up'):
+            res = self.client.get(TICKET_URL, {'order-by': order_by})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering_by_field_with_underscore(self):
+        """Tests if field names containing underscores are ordered by."""
+
+        res = self.client.get(TICKET_URL, {'order-by': 'created_at-asc'})
+
+        self.assertEqual(result_ids(res), [
+            self.ticket1.id, self.ticket2.id, self.ticket3.id])
+
+
+class CommentFilterTests(TestCase):
+    """Tests for comments list filters."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com')
+        self.ticket = create_ticket(self.user, self.user2)
+        self.ticket2 = create_ticket(self.user, self.user2)
+        self.comment1 = Comment.objects.create(
+            author=self.user, ticket=self.ticket, text='First')
+        self.comment2 = Comment.objects.create(
+            author=self.user2, ticket=self.ticket, text='Second')
+        self.comment3 = Comment.objects.create(
+            author=self.user, ticket=self.ticket2, text='Third')
+
+    def test_filter_by_ticket_and_author(self):
+        """Tests if comments are filtered by ticket and author."""
+
+        res = self.client.get(
+            COMMENT_URL, {'ticket': self.ticket.id, 'author': self.user.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(result_ids(res), [self.comment1.id])
+
+    def test_order_comments(self):
+        """Tests if comments are ordered by given field."""
+
+        res = self.client.get(COMMENT_URL, {'order-by': 'id-asc'})
+
+        self.assertEqual(result_ids(res), [
+            self.comment1.id, self.comment2.id, self.comment3.id])
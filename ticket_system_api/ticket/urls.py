@@ -12,8 +12,15 @@ router.register('comments', views.CommentViewSet)
 app_name = 'ticket'
 
 urlpatterns = [
+    path('tickets/stream/', views.TicketStreamView.as_view(),
+         name='ticket-stream'),
     path('', include(router.urls)),
+    path('activity/', views.ActivityView.as_view(), name='activity'),
     path('metrics/', views.MetricView.as_view(), name='metrics'),
+    path('metrics/workload/', views.WorkloadMetricView.as_view(),
+         name='metrics-workload'),
+    path('metrics/cache/', views.CacheMetricView.as_view(),
+         name='metrics-cache'),
     path('employees/', views.EmployeesView.as_view(), name='employees')
 
 ]
@@ -3,79 +3,277 @@ Views for Ticket API.
 """
 
 from ticket import serializers
+from ticket.assignment import assign_least_loaded
+from ticket.cache import AnonymousResponseCacheMixin, ticket_detail_cache
+from ticket.directory import directory
+from ticket.events import hub
+from ticket.filters import TicketFilterSet, CommentFilterSet
+from ticket.metrics import get_workload
+from ticket.pagination import ActivityCursorPagination, CachedCountPagination
+from ticket.similarity import find_similar_to_ticket
+from ticket.snapshots import SnapshotResponse, get_snapshots
 
 import math
 
 from user.serializers import UserArticleSerializer
 
-from core.models import User, Ticket, Comment
-from core.custom_permissions import IsOwnerOrAdminOrReadOnly
-from django.contrib.auth import get_user_model
+from core.models import (
+    User,
+    Ticket,
+    Comment,
+    Activity,
+    ArchivedTicket,
+    ArchiveStats,
+)
+from core.notifications import notify_assignee, notify_comment
+from core.custom_permissions import IsOwnerOrAdminOrReadOnly, IsAdminOrForbidden
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.db import transaction
+from django.db.models import Prefetch, Value
+from django.views import View
+from drf_spectacular.utils import extend_schema
 
 from rest_framework import viewsets, status, generics
 from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
 
 
-class TicketViewSet(viewsets.ModelViewSet):
+def include_can_edit(request):
+    """Checks if can_edit flags were requested for listed objects."""
+
+    return request.query_params.get('can-edit') in ('1', 'true')
+
+
+class TicketViewSet(AnonymousResponseCacheMixin, viewsets.ModelViewSet):
     """View for managing ticket API."""
 
     serializer_class = serializers.TicketSerializer
     queryset = Ticket.objects.all().order_by('-id')
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrAdminOrReadOnly]
     authentication_classes = [TokenAuthentication]
-    pagination_class = PageNumberPagination
+    pagination_class = CachedCountPagination
 
     def perform_create(self, serializer):
-        """Creates a new ticket."""
-
-        serializer.save(created_by=self.request.user)
+        """Creates a new ticket and queues notification for assignee in one
+        transaction.
+
+        Tickets without assignee are assigned to the least loaded staff
+        member, which is allowed when TICKET_AUTO_ASSIGN is enabled."""
+
+        with transaction.atomic():
+            if 'assigned_to' in serializer.validated_data:
+                ticket = serializer.save(created_by=self.request.user)
+            else:
+                ticket = self.create_auto_assigned(serializer)
+            notify_assignee(ticket)
+
+    def create_auto_assigned(self, serializer):
+        # Called in transaction, which keeps workloads locked until ticket
+        # is counted in its assignee's load.
+        assignee_id = assign_least_loaded()
+        if assignee_id is None:
+            raise ValidationError({'assigned_to': [
+                'No staff member is available for automatic assignment.']})
+
+        return serializer.save(
+            created_by=self.request.user, assigned_to_id=assignee_id)
+
+    def perform_update(self, serializer):
+        """Updates ticket, notifying new assignee when it was reassigned."""
+
+        previous_assignee_id = serializer.instance.assigned_to_id
+        with transaction.atomic():
+            ticket = serializer.save()
+            if ticket.assigned_to_id != previous_assignee_id:
+                notify_assignee(ticket)
 
     def get_serializer_class(self):
+        if self.action == 'create':
+            return serializers.TicketCreateSerializer
         if self.action == 'retrieve':
             return serializers.TicketDetailSerializer
         if self.action == 'list':
+            if include_can_edit(self.request):
+                return serializers.TicketWithPermissionsSerializer
             return serializers.TicketSerializer
         return super().get_serializer_class()
 
     def get_queryset(self):
         """Gets queryset basing on query params if provided."""
 
-        queryset = self.queryset
-        assigned_user_id = self.request.query_params.get('assigned')
-        createor_id = self.request.query_params.get('creator')
-        order_by = self.request.query_params.get(
-            'order-by')
-        ticket_id = self.request.query_params.get('ticket-id')
-        ticket_title = self.request.query_params.get('ticket-title')
-
-        if assigned_user_id:
-            queryset = queryset.filter(
-                assigned_to__id__exact=assigned_user_id).order_by('-id')
-        if createor_id:
-            queryset = queryset.filter(
-                created_by__id__exact=createor_id
-            ).order_by('-id')
-        if ticket_id:
-            queryset = queryset.filter(
-                id__exact=ticket_id
-            )
-        if ticket_title:
-            queryset = queryset.filter(
-                title__icontains=ticket_title
-            )
-
-        if order_by:
-            order_by, direction = order_by.split('-')
-            if direction == 'asc':
-                queryset = queryset.order_by(order_by)
-            elif direction == 'desc':
-                queryset = queryset.order_by(f'-{order_by}')
+        queryset = self.filter_by_query_params(self.queryset)
+        if self.action == 'list' and include_can_edit(self.request):
+            queryset = queryset.annotate(
+                can_edit=IsOwnerOrAdminOrReadOnly.get_can_edit_expression(
+                    self.request.user, 'created_by'))
 
-        return queryset
+        return queryset.order_by(*self.get_ordering())
+
+    def filter_by_query_params(self, queryset):
+        """Applies filters from query params to tickets queryset."""
+
+        return self.get_filterset().filter_queryset(queryset)
+
+    def get_ordering(self):
+        """Gets ordering basing on order-by query param."""
+
+        return self.get_filterset().get_ordering()
+
+    def get_filterset(self):
+        return TicketFilterSet(self.request.query_params)
+
+    def include_archived(self):
+        """Checks if archived tickets were requested."""
+
+        return self.request.query_params.get(
+            'include-archived') in ('1', 'true')
+
+    def get_archive_union(self):
+        """Gets rows of live and archived tickets matching query params."""
+
+        fields = [
+            field.attname for field in ArchivedTicket._meta.concrete_fields
+            if field.name != 'archived_at'
+        ]
+        live = self.filter_by_query_params(
+            Ticket.objects.values(*fields)).order_by()
+        archived = self.filter_by_query_params(
+            ArchivedTicket.objects.values(*fields)).order_by()
+        if include_can_edit(self.request):
+            live = live.annotate(
+                can_edit=IsOwnerOrAdminOrReadOnly.get_can_edit_expression(
+                    self.request.user, 'created_by'))
+            archived = archived.annotate(can_edit=Value(False))
+
+        return live.union(archived, all=True).order_by(*self.get_ordering())
+
+    def list(self, request, *args, **kwargs):
+        if not self.include_archived():
+            if include_can_edit(request):
+                return super().list(request, *args, **kwargs)
+            return self.list_snapshots()
+
+        queryset = self.get_archive_union()
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+        tickets = []
+        for row in rows:
+            can_edit = row.pop('can_edit', None)
+            ticket = Ticket(**row)
+            ticket.can_edit = can_edit
+            tickets.append(ticket)
+        serializer = self.get_serializer(tickets, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+
+        return Response(serializer.data)
+
+    def list_snapshots(self):
+        """Lists tickets by splicing their stored snapshots into response."""
+
+        queryset = self.get_queryset().values_list('id', 'snapshot')
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return SnapshotResponse(get_snapshots(queryset))
+
+        return SnapshotResponse(
+            get_snapshots(page),
+            envelope=self.paginator.get_paginated_envelope())
+
+    def retrieve(self, request, *args, **kwargs):
+        """Serves ticket details from cache when no query params are given."""
+
+        if request.query_params or not kwargs['pk'].isdigit():
+            return self.retrieve_uncached(request, *args, **kwargs)
+
+        ticket_id = int(kwargs['pk'])
+        data, version = ticket_detail_cache.get(ticket_id)
+        if data is not None:
+            return Response(data)
+
+        response = self.retrieve_uncached(request, *args, **kwargs)
+        ticket_detail_cache.set(ticket_id, version, dict(response.data))
+
+        return response
+
+    def retrieve_uncached(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            if not self.include_archived():
+                raise
+
+        archived_ticket = generics.get_object_or_404(
+            ArchivedTicket.objects.prefetch_related('comments'),
+            pk=kwargs['pk'])
+        serializer = serializers.ArchivedTicketDetailSerializer(
+            archived_ticket)
+
+        return Response(serializer.data)
+
+    @action(methods=['GET', 'POST'], detail=False, url_path='batch-get',
+            permission_classes=[AllowAny],
+            serializer_class=serializers.TicketBatchSerializer)
+    def batch_get(self, request):
+        """Get details of many tickets by ids from query param or body."""
+
+        if request.method == 'GET':
+            ids = request.query_params.get('ids', '')
+            data = {'ids': [item for item in ids.split(',') if item.strip()]}
+        else:
+            data = request.data
+        serializer = self.get_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        tickets = Ticket.objects.select_related(
+            'created_by', 'assigned_to'
+        ).prefetch_related(
+            Prefetch('comments',
+                     queryset=Comment.objects.select_related('author'))
+        ).in_bulk(ids)
+        found = [tickets[ticket_id] for ticket_id in ids if ticket_id in tickets]
+
+        return Response({
+            'results': serializers.TicketDetailSerializer(
+                found, many=True).data,
+            'missing': [ticket_id for ticket_id in ids
+                        if ticket_id not in tickets],
+        })
+
+    @action(methods=['GET'], detail=True, url_path='activity',
+            serializer_class=serializers.ActivitySerializer,
+            pagination_class=ActivityCursorPagination)
+    def activity(self, request, pk=None):
+        """Get history of ticket, including archived one."""
+
+        if not pk.isdigit() or not (
+                Ticket.objects.filter(pk=pk).exists()
+                or ArchivedTicket.objects.filter(pk=pk).exists()):
+            raise Http404
+
+        queryset = Activity.objects.filter(ticket_id=pk)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=['GET'], detail=True, url_path='similar',
+            serializer_class=serializers.SimilarTicketSerializer,
+            pagination_class=None)
+    def similar(self, request, pk=None):
+        """Get tickets most similar to ticket by title and description."""
+
+        ticket = generics.get_object_or_404(
+            Ticket.objects.only('id', 'title', 'description'), pk=pk)
+        serializer = self.get_serializer(
+            find_similar_to_ticket(ticket), many=True)
+
+        return Response(serializer.data)
 
     @action(methods=['GET'], detail=False, url_path='assigned-to-me')
     def get_tickets_assigned_to_me(self, request):
@@ -117,13 +315,42 @@ class CommentViewSet(viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrAdminOrReadOnly]
+    pagination_class = CachedCountPagination
+
+    def get_serializer_class(self):
+        if self.action == 'list' and include_can_edit(self.request):
+            return serializers.CommentWithPermissionsSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        filterset = CommentFilterSet(self.request.query_params)
+        queryset = filterset.filter_queryset(super().get_queryset())
+        ordering = filterset.get_ordering()
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        if self.action == 'list' and include_can_edit(self.request):
+            queryset = queryset.annotate(
+                can_edit=IsOwnerOrAdminOrReadOnly.get_can_edit_expression(
+                    self.request.user, 'author'))
+
+        return queryset
 
     def perform_create(self, serializer):
         """Created a new comment."""
-        serializer.save(author=self.request.user)
+        with transaction.atomic():
+            comment = serializer.save(author=self.request.user)
+            notify_comment(comment)
+
+
+class ActivityView(AnonymousResponseCacheMixin, generics.ListAPIView):
+    """View for returning history of all tickets."""
 
+    serializer_class = serializers.ActivitySerializer
+    queryset = Activity.objects.all()
+    pagination_class = ActivityCursorPagination
 
-class MetricView(generics.GenericAPIView):
+
+class MetricView(AnonymousResponseCacheMixin, generics.GenericAPIView):
     """View for returning metrics."""
 
     def get(self, request, *args, **kwargs):
@@ -131,35 +358,98 @@ class MetricView(generics.GenericAPIView):
         tickets_open = Ticket.objects.filter(status='OPEN')
         tickets_closed = Ticket.objects.filter(status='CLOSED')
         tickets_in_progress = Ticket.objects.filter(status='IN_PROGRESS')
-        total_closing_time = 0
+        archive = ArchiveStats.current()
+        total_closing_time = archive.total_closing_seconds
         for ticket in tickets_closed:
             total_closing_time += (ticket.updated_at -
                                    ticket.created_at).total_seconds()
+        closed_count = len(tickets_closed) + archive.tickets_closed
         try:
-            avg_ticket_closing_time = total_closing_time/len(tickets_closed)
+            avg_ticket_closing_time = total_closing_time/closed_count
         except ZeroDivisionError:
             avg_ticket_closing_time = 0
 
         data = {
-            'total_tickets': len(total_tickets),
+            'total_tickets': len(total_tickets) + archive.tickets_closed,
             'tickets_open': len(tickets_open),
             'tickets_in_progress': len(tickets_in_progress),
-            'tickets_closed': len(tickets_closed),
+            'tickets_closed': closed_count,
             'avg_closing_time_mins': math.floor(avg_ticket_closing_time/60)
 
         }
         return Response(data)
 
 
+class CacheMetricView(generics.GenericAPIView):
+    """View for returning statistics of ticket details cache."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAdminOrForbidden, IsAuthenticated]
+    serializer_class = serializers.CacheMetricSerializer
+
+    def get(self, request, *args, **kwargs):
+        return Response({'ticket_detail': ticket_detail_cache.stats()})
+
+
+class WorkloadMetricView(generics.GenericAPIView):
+    """View for returning tickets workload of each employee."""
+
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    serializer_class = serializers.WorkloadSerializer
+    pagination_class = None
+
+    @extend_schema(responses=serializers.WorkloadSerializer(many=True))
+    def get(self, request, *args, **kwargs):
+        return Response(get_workload())
+
+
 class EmployeesView(generics.GenericAPIView):
     """View for returning employees from system."""
 
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    serializer_class = UserArticleSerializer
 
     def get(self, request, *args, **kwargs):
-        queryset = get_user_model().objects.filter(
-            is_staff=True).exclude(id=request.user.id)
-        serializer = UserArticleSerializer(queryset, many=True)
+        employees = directory.search(
+            request.query_params.get('q', ''), exclude_id=request.user.id)
+        page = self.paginate_queryset(employees)
+        if page is not None:
+            return self.get_paginated_response(page)
 
-        return Response(serializer.data)
+        return Response(employees)
+
+
+class TicketStreamView(View):
+    """View streaming ticket changes as Server-Sent Events."""
+
+    async def get(self, request, *args, **kwargs):
+        last_event_id = request.headers.get(
+            'Last-Event-ID', request.GET.get('last-event-id'))
+        try:
+            last_event_id = int(last_event_id)
+        except (TypeError, ValueError):
+            last_event_id = None
+
+        subscription = hub.subscribe(last_event_id)
+        response = StreamingHttpResponse(
+            self.stream(subscription), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+
+        return response
+
+    async def stream(self, subscription):
+        """Yields events, sending keep-alive comments while idle."""
+
+        heartbeat = settings.TICKET_STREAM_HEARTBEAT_SECONDS
+        try:
+            while not subscription.overflowed:
+                event = await subscription.get(timeout=heartbeat)
+                if event is None:
+                    yield ': keep-alive\n\n'
+                else:
+                    yield event.to_sse()
+        finally:
+            subscription.close()
@@ -57,6 +57,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.profiling.RequestProfilingMiddleware',
+    'core.query_budget.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'ticket_system_api.urls'
@@ -96,6 +98,24 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# LocMemCache is kept per process, so with more than one worker process
+# a shared backend (e.g. Redis or Memcached) is required, otherwise cached
+# responses and ticket details aren't invalidated by changes made in other
+# processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+ANONYMOUS_RESPONSE_CACHE_TIMEOUT = 300
+WORKLOAD_METRICS_CACHE_TIMEOUT = 60
+TICKET_DETAIL_CACHE_SIZE = 1000
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -115,6 +135,14 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Bulk user creation, hashing uses all CPUs when workers are not set. Requests
+# hash in shared thread pool, bulk_create_users command in worker processes.
+
+USER_BULK_CREATE_MAX_SIZE = 5000
+PASSWORD_HASHING_WORKERS = None
+PASSWORD_HASHING_PARALLEL_THRESHOLD = 50
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -145,3 +173,89 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10
 }
+
+# Tickets and comments lists cache their total counts, results bigger than
+# the limit get estimated count where database supports it.
+
+PAGINATION_COUNT_CACHE_TIMEOUT = 30
+PAGINATION_EXACT_COUNT_LIMIT = 10000
+
+
+# Directory with OpenAPI schema files written by generate_schema command.
+
+SCHEMA_CACHE_DIR = BASE_DIR / 'schema'
+
+
+# Admin changelists of bigger tables show estimated number of rows.
+
+ADMIN_EXACT_COUNT_LIMIT = 10000
+
+
+# Maximum number of tickets fetched with one batch-get request.
+
+TICKET_BATCH_MAX_SIZE = 100
+
+
+# Notification emails, events of each user are coalesced into one digest
+# sent when the oldest of them is NOTIFICATION_DIGEST_WINDOW seconds old.
+
+NOTIFICATION_DIGEST_WINDOW = 300
+NOTIFICATION_BATCH_SIZE = 100
+
+
+# Server-Sent Events stream of ticket changes
+
+TICKET_STREAM_BUFFER_SIZE = 1000
+TICKET_STREAM_HEARTBEAT_SECONDS = 15
+
+
+# Request profiling, staff users can add ?_profile=cprofile|sql to requests.
+# Reports are saved to size rotated files in PROFILING_DIR.
+
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_TOP = 50
+PROFILING_MAX_BYTES = 10 * 1024 * 1024
+PROFILING_BACKUP_COUNT = 5
+
+
+# SQL budget of single request, views can override it with
+# query_time_budget_ms and query_count_budget attributes. Requests exceeding
+# time budget get 503 response, exceeding number of queries is logged.
+
+QUERY_TIME_BUDGET_MS = 5000
+QUERY_COUNT_BUDGET = 100
+QUERY_BUDGET_RETRY_AFTER = 5
+QUERY_BUDGET_PROGRESS_STEPS = 1000
+
+
+# SLA deadline of tickets in hours from creation, by priority. Tickets past
+# their deadline are flagged by sla_sweep command.
+
+TICKET_SLA_HOURS = {
+    'LOW': 72,
+    'MODERATE': 24,
+    'URGENT': 4,
+}
+
+
+# Tickets created without assignee are assigned to active staff member with
+# the lowest load, where every open ticket weighs its priority's weight.
+# Loads are stored in database, run rebuild_workloads after changing weights.
+
+TICKET_AUTO_ASSIGN = False
+TICKET_AUTO_ASSIGN_WEIGHTS = {
+    'LOW': 1,
+    'MODERATE': 1,
+    'URGENT': 1,
+}
+
+
+# Similar tickets are found through MinHash signatures of title and
+# description. At most TICKET_SIMILARITY_MAX_CANDIDATES tickets sharing LSH
+# bucket are compared, signatures of them are cached in process memory.
+
+TICKET_SIMILARITY_THRESHOLD = 0.5
+TICKET_SIMILAR_LIMIT = 5
+TICKET_SIMILARITY_MAX_CANDIDATES = 100
+TICKET_SIGNATURE_CACHE_SIZE = 10000
@@ -0,0 +1,41 @@
+"""
+Command creating many users from CSV or JSON file.
+"""
+
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from user.provisioning import bulk_create_users, get_hashing_workers
+
+
+class Command(BaseCommand):
+    """Creates users from file in single transaction.
+
+    Passwords are hashed by pool of processes living only for the command."""
+
+    help = 'Creates users listed in CSV or JSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='CSV file with header or JSON file with list of users.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        with open(path, newline='', encoding='utf-8') as source:
+            if path.lower().endswith('.csv'):
+                rows = list(csv.DictReader(source))
+            else:
+                rows = json.load(source)
+
+        with ProcessPoolExecutor(max_workers=get_hashing_workers()) as executor:
+            users, errors = bulk_create_users(rows, executor)
+        if errors:
+            for error in errors:
+                self.stderr.write(f'Row {error["index"]}: {error["errors"]}')
+            raise CommandError(
+                f'{len(errors)} invalid rows, no users were created.')
+
+        self.stdout.write(self.style.SUCCESS(f'Created {len(users)} users.'))
@@ -0,0 +1,99 @@
+"""
+Bulk creation of users with passwords hashed in parallel.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from core.signals import users_bulk_created
+from user.serializers import BulkUserSerializer
+
+
+def get_hashing_workers():
+    return settings.PASSWORD_HASHING_WORKERS or os.cpu_count() or 1
+
+
+# Shared by requests, PBKDF2 releases GIL so threads hash in parallel
+# without forking processes from web workers.
+hashing_executor = ThreadPoolExecutor(
+    max_workers=get_hashing_workers(), thread_name_prefix='password-hashing')
+
+
+def hash_passwords(passwords, executor=None):
+    """Hashes passwords, using pool of workers for bigger batches.
+
+    Shared thread pool is used unless other executor is given, e.g. pool
+    of processes created by management command."""
+
+    workers = get_hashing_workers()
+    if workers == 1 or len(passwords) < settings.PASSWORD_HASHING_PARALLEL_THRESHOLD:
+        return [make_password(password) for password in passwords]
+
+    executor = executor or hashing_executor
+    chunksize = max(1, len(passwords) // (workers * 4))
+
+    return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def validate_users(rows):
+    """Validates batch of users, returns valid data and per row errors."""
+
+    validated, errors = [], []
+    for index, row in enumerate(rows):
+        serializer = BulkUserSerializer(data=row)
+        if serializer.is_valid():
+            validated.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+
+    emails = [data['email'] for _, data in validated]
+    existing = set(get_user_model().objects.filter(
+        email__in=emails).values_list('email', flat=True))
+    seen = set()
+    for index, data in validated:
+        email = data['email']
+        if email in existing or email in seen:
+            errors.append({
+                'index': index,
+                'errors': {'email': ['User with this email already exists.']}
+            })
+        seen.add(email)
+
+    errors.sort(key=lambda error: error['index'])
+
+    return [data for _, data in validated], errors
+
+
+def bulk_create_users(rows, executor=None):
+    """Creates all users from rows in one transaction.
+
+    Returns created users and list of errors, nothing is created when any
+    row is invalid. Passwords are hashed by given executor, if any."""
+
+    validated, errors = validate_users(rows)
+    if errors:
+        return [], errors
+
+    hashes = hash_passwords(
+        [data['password'] for data in validated], executor)
+    User = get_user_model()
+    users = [
+        User(
+            email=data['email'],
+            name=data['name'],
+            surname=data['surname'],
+            is_staff=data['is_staff'],
+            password=password_hash,
+        ) for data, password_hash in zip(validated, hashes)
+    ]
+    with transaction.atomic():
+        users = User.objects.bulk_create(users)
+        transaction.on_commit(
+            lambda: users_bulk_created.send(sender=User, users=users))
+
+    return users, []
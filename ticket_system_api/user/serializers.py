@@ -3,8 +3,10 @@ Serializers for user API View.
 """
 
 from django.contrib.auth import get_user_model, authenticate
+from django.db import models
 
 from django.utils.translation import gettext as _
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 
@@ -16,6 +18,113 @@ class UserArticleSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'surname', 'email']
 
 
+class UserIdentityMap:
+    """Request scoped map of serialized users, loading every user at most
+    once and serializing it once no matter how many times it's nested."""
+
+    def __init__(self):
+        self._data = {}
+
+    @classmethod
+    def for_context(cls, context):
+        """Gets map kept on request, or in context when there is no request."""
+
+        request = context.get('request')
+        if request is None:
+            return context.setdefault('user_identity_map', cls())
+
+        identity_map = getattr(request, '_user_identity_map', None)
+        if identity_map is None:
+            identity_map = request._user_identity_map = cls()
+
+        return identity_map
+
+    def add(self, user):
+        if user.id not in self._data:
+            self._data[user.id] = dict(UserArticleSerializer(user).data)
+
+    def prime(self, user_ids):
+        """Loads all users not yet in map with single query."""
+
+        missing = {
+            user_id for user_id in user_ids
+            if user_id is not None and user_id not in self._data
+        }
+        if missing:
+            users = get_user_model().objects.filter(id__in=missing).only(
+                *UserArticleSerializer.Meta.fields)
+            for user in users:
+                self.add(user)
+
+    def get(self, user_id):
+        if user_id not in self._data:
+            self.prime([user_id])
+
+        return self._data.get(user_id)
+
+
+@extend_schema_field(UserArticleSerializer)
+class UserArticleField(serializers.Field):
+    """Read only user serialized with UserArticleSerializer, taken from
+    identity map. Source should point to foreign key id, so the related user
+    isn't loaded separately for every object."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return UserIdentityMap.for_context(self.context).get(value)
+
+
+def prime_users(serializer, instances):
+    """Puts users of all UserArticleFields of serializer into identity map.
+
+    Users already loaded with select_related are reused, others are loaded
+    with one query."""
+
+    fields = [
+        field for field in serializer.fields.values()
+        if isinstance(field, UserArticleField)
+    ]
+    if not fields:
+        return
+
+    identity_map = UserIdentityMap.for_context(serializer.context)
+    user_ids = []
+    for instance in instances:
+        for field in fields:
+            relation = instance._meta.get_field(field.source.removesuffix('_id'))
+            if relation.is_cached(instance):
+                user = getattr(instance, relation.name)
+                if user is not None:
+                    identity_map.add(user)
+            else:
+                user_ids.append(getattr(instance, field.source))
+    identity_map.prime(user_ids)
+
+
+class UserIdentityListSerializer(serializers.ListSerializer):
+    """List serializer priming users of all items at once."""
+
+    def to_representation(self, data):
+        if isinstance(data, models.manager.BaseManager):
+            data = data.all()
+        items = list(data)
+        prime_users(self.child, items)
+
+        return super().to_representation(items)
+
+
+class UserIdentityMixin:
+    """Primes identity map with users of serialized object. Serializers
+    using it should set UserIdentityListSerializer as list serializer."""
+
+    def to_representation(self, instance):
+        prime_users(self, [instance])
+        return super().to_representation(instance)
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for the user object."""
 
@@ -66,3 +175,21 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs['user'] = user
         return attrs
+
+
+class BulkUserSerializer(serializers.Serializer):
+    """Serializer for single user in bulk creation.
+
+    Uniqueness of emails is checked for whole batch at once."""
+
+    id = serializers.IntegerField(read_only=True)
+    email = serializers.EmailField(max_length=255)
+    password = serializers.CharField(
+        write_only=True, min_length=5, trim_whitespace=False)
+    name = serializers.CharField(max_length=255, required=False, default='')
+    surname = serializers.CharField(
+        max_length=255, required=False, default='')
+    is_staff = serializers.BooleanField(required=False, default=False)
+
+    def validate_email(self, value):
+        return get_user_model().objects.normalize_email(value)
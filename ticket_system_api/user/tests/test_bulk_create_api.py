@@ -0,0 +1,160 @@
+"""
+Tests for bulk user creation.
+"""
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from unittest import mock
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.test import TestCase, override_settings
+from user.provisioning import hash_passwords, hashing_executor
+
+BULK_CREATE_URL = reverse('user:bulk-create')
+
+
+def create_user(email='user@example.com', password='pass123', is_superuser=False):
+    payload = {
+        'name': 'User',
+        'surname': 'Testowsky'
+    }
+    if is_superuser:
+        return get_user_model().objects.create_superuser(email, password, **payload)
+
+    return get_user_model().objects.create_user(email, password, **payload)
+
+
+def user_rows(count):
+    return [{
+        'email': f'employee{i}@example.com',
+        'password': f'secret{i}',
+        'name': 'Employee',
+        'surname': f'Number{i}',
+        'is_staff': True,
+    } for i in range(count)]
+
+
+class BulkCreateUserApiTests(TestCase):
+    """Tests for bulk user creation endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(is_superuser=True)
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create_users(self):
+        """Tests if all users are created with hashed passwords."""
+
+        res = self.client.post(BULK_CREATE_URL, user_rows(3), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 3)
+        user = get_user_model().objects.get(email='employee1@example.com')
+        self.assertTrue(user.check_password('secret1'))
+        self.assertTrue(user.is_staff)
+        self.assertNotIn('password', res.data[0])
+
+    def test_invalid_rows_reported(self):
+        """Tests if errors are reported per row and nothing is created."""
+
+        rows = user_rows(4)
+        rows[1]['email'] = 'user@example.com'
+        rows[2]['password'] = 'abc'
+        rows[3]['email'] = rows[0]['email']
+
+        res = self.client.post(BULK_CREATE_URL, rows, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [error['index'] for error in res.data['errors']], [1, 2, 3])
+        self.assertIn('password', res.data['errors'][1]['errors'])
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    def test_bulk_create_by_normal_user_forbidden(self):
+        """Tests if regular users can't create users."""
+
+        regular_user = create_user(email='regular_user@example.com')
+        self.client.force_authenticate(regular_user)
+        res = self.client.post(BULK_CREATE_URL, user_rows(1), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(USER_BULK_CREATE_MAX_SIZE=2)
+    def test_batch_size_limited(self):
+        """Tests if too big batches are rejected."""
+
+        res = self.client.post(BULK_CREATE_URL, user_rows(3), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(get_user_model().objects.count(), 1)
+
+    @override_settings(PASSWORD_HASHING_WORKERS=2,
+                       PASSWORD_HASHING_PARALLEL_THRESHOLD=1)
+    def test_passwords_hashed_in_thread_pool(self):
+        """Tests if passwords hashed by shared threads are valid."""
+
+        with mock.patch('user.provisioning.hashing_executor.map',
+                        wraps=hashing_executor.map) as executor_map:
+            hashes = hash_passwords(['secret1', 'secret2'])
+        user = get_user_model()(email='hashed@example.com', password=hashes[1])
+
+        executor_map.assert_called_once()
+        self.assertTrue(user.check_password('secret2'))
+
+    @override_settings(PASSWORD_HASHING_WORKERS=2,
+                       PASSWORD_HASHING_PARALLEL_THRESHOLD=1)
+    def test_passwords_hashed_in_process_pool(self):
+        """Tests if passwords hashed by given worker processes are valid."""
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            hashes = hash_passwords(['secret1', 'secret2'], executor)
+        user = get_user_model()(email='hashed@example.com', password=hashes[1])
+
+        self.assertTrue(user.check_password('secret2'))
+
+
+class BulkCreateUsersCommandTests(TestCase):
+    """Tests for bulk_create_users command."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as target:
+            target.write(content)
+
+        return path
+
+    def test_create_users_from_json(self):
+        """Tests if users from JSON file are created."""
+
+        path = self.write_file('users.json', json.dumps(user_rows(2)))
+        call_command('bulk_create_users', path, stdout=StringIO())
+
+        self.assertEqual(get_user_model().objects.count(), 2)
+
+    def test_invalid_file_creates_nothing(self):
+        """Tests if command fails without creating users on invalid rows."""
+
+        path = self.write_file(
+            'users.csv',
+            'email,password,name,surname\n'
+            'first@example.com,secret1,First,User\n'
+            'invalid-email,secret2,Second,User\n'
+        )
+
+        with self.assertRaises(CommandError):
+            call_command('bulk_create_users', path,
+                         stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(get_user_model().objects.count(), 0)
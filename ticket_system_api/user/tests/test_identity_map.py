@@ -0,0 +1,104 @@
+"""
+Tests for identity map of nested users.
+"""
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import Ticket, Comment
+from ticket.serializers import TicketDetailSerializer
+from user.serializers import UserArticleSerializer, UserIdentityMap
+
+
+def create_user(email='user@example.com', password='pass123'):
+    return get_user_model().objects.create_user(
+        email, password, name='User', surname='Testowsky')
+
+
+def create_ticket(created_by, assigned_to, **extra_fields):
+    payload = {
+        'status': 'OPEN',
+        'title': 'Test case',
+        'description': 'Everything should work as expected'
+    }
+    payload.update(**extra_fields)
+    return Ticket.objects.create(created_by=created_by, assigned_to=assigned_to, **payload)
+
+
+class UserIdentityMapTests(TestCase):
+    """Tests for loading and serializing users once."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com')
+
+    def test_users_loaded_once_in_bulk(self):
+        """Tests if users are loaded with one query and then reused."""
+
+        identity_map = UserIdentityMap()
+
+        with self.assertNumQueries(1):
+            identity_map.prime([self.user.id, self.user2.id, self.user.id])
+            data = identity_map.get(self.user.id)
+            identity_map.get(self.user2.id)
+            identity_map.prime([self.user.id])
+
+        self.assertEqual(data, UserArticleSerializer(self.user).data)
+
+    def test_map_shared_by_request(self):
+        """Tests if serializers of the same request share identity map."""
+
+        request = SimpleNamespace()
+        first = UserIdentityMap.for_context({'request': request})
+        second = UserIdentityMap.for_context({'request': request})
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, UserIdentityMap.for_context({}))
+
+
+class NestedUsersSerializationTests(TestCase):
+    """Tests for serializers nesting users."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user()
+        self.user2 = create_user('user2@example.com')
+        self.ticket = create_ticket(self.user, self.user2)
+
+    def test_comment_authors_loaded_once(self):
+        """Tests if number of queries doesn't grow with comments."""
+
+        for index in range(10):
+            author = self.user if index % 2 else self.user2
+            Comment.objects.create(
+                author=author, ticket=self.ticket, text=f'Comment {index}')
+        ticket = Ticket.objects.get(id=self.ticket.id)
+
+        # users and comments
+        with self.assertNumQueries(2):
+            data = TicketDetailSerializer(ticket).data
+
+        self.assertEqual(data['created_by'],
+                         UserArticleSerializer(self.user).data)
+        self.assertEqual(
+            {comment['author']['id'] for comment in data['comments']},
+            {self.user.id, self.user2.id})
+
+    def test_ticket_details_endpoint(self):
+        """Tests if details endpoint loads users of ticket and comments once."""
+
+        for _ in range(5):
+            Comment.objects.create(
+                author=self.user, ticket=self.ticket, text='Hi')
+
+        # ticket, users and comments
+        with self.assertNumQueries(3):
+            res = APIClient().get(
+                reverse('ticket:ticket-detail', args=[self.ticket.id]),
+                {'ticket-id': self.ticket.id})
+
+        self.assertEqual(len(res.data['comments']), 5)
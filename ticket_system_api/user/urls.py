@@ -7,6 +7,8 @@ app_name = 'user'
 
 urlpatterns = [
     path('create/', views.CreateUserView.as_view(), name='create'),
+    path('bulk-create/', views.BulkCreateUserView.as_view(),
+         name='bulk-create'),
     path('token/', views.CreateTokenView.as_view(), name='token'),
     path('me/', views.ManageUserView.as_view(), name='me')
 ]
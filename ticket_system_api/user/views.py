@@ -1,9 +1,16 @@
 """Views for the user API."""
 
-from rest_framework import generics, authentication, permissions
+from django.conf import settings
+from rest_framework import generics, authentication, permissions, status
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
-from user.serializers import UserSerializer, AuthTokenSerializer
+from user.provisioning import bulk_create_users
+from user.serializers import (
+    UserSerializer,
+    AuthTokenSerializer,
+    BulkUserSerializer,
+)
 from core.custom_permissions import IsAdminOrForbidden
 
 
@@ -15,6 +22,33 @@ class CreateUserView(generics.CreateAPIView):
     authentication_classes = [authentication.TokenAuthentication]
 
 
+class BulkCreateUserView(generics.GenericAPIView):
+    """Create many users in the system at once."""
+
+    serializer_class = BulkUserSerializer
+    permission_classes = [IsAdminOrForbidden, permissions.IsAuthenticated]
+    authentication_classes = [authentication.TokenAuthentication]
+
+    def post(self, request, *args, **kwargs):
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response({'detail': 'Expected a list of users.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.USER_BULK_CREATE_MAX_SIZE:
+            return Response(
+                {'detail': 'Too many users, maximum is '
+                           f'{settings.USER_BULK_CREATE_MAX_SIZE}.'},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        users, errors = bulk_create_users(rows)
+        if errors:
+            return Response({'errors': errors},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = self.get_serializer(users, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 class CreateTokenView(ObtainAuthToken):
     """Create a new auth token for user."""
 